@@ -0,0 +1,479 @@
+"""An asyncio request engine for streams with many small, latency-bound requests."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextlib
+import threading
+import typing as t
+from functools import cached_property, partial
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from singer_sdk.exceptions import ConfigValidationError
+
+if t.TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    import httpx
+    from singer_sdk.helpers.types import Context
+
+HTTP_ENGINES = ("requests", "asyncio")
+DEFAULT_MAX_IN_FLIGHT = 1000
+
+#: Requests sent at once per HTTP/2 connection, the usual server limit.
+HTTP2_STREAMS_PER_CONNECTION = 100
+
+#: Connections per ``httpx`` client, whose scheduling cost grows with the square.
+CONNECTIONS_PER_CLIENT = 4
+
+# Connection-specific headers, which HTTP/2 forbids.
+_HOP_BY_HOP_HEADERS = frozenset(
+    ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"),
+)
+
+_T = t.TypeVar("_T")
+
+
+def to_requests_response(
+    response: httpx.Response,
+    request: requests.PreparedRequest,
+) -> requests.Response:
+    """Convert a read ``httpx`` response for the stream's response handlers.
+
+    Args:
+        response: The response, with its body read.
+        request: The request it answers.
+
+    Returns:
+        An equivalent ``requests`` response, with its body already consumed.
+    """
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.url = str(response.url)
+    converted.encoding = response.charset_encoding
+    converted.elapsed = response.elapsed
+    converted.request = request
+    converted._content = response.content  # noqa: SLF001
+    converted._content_consumed = True  # noqa: SLF001
+    return converted
+
+
+class AsyncEngine:
+    """An event loop thread sending requests through ``httpx`` clients.
+
+    Coroutines are submitted from any thread and their results collected as
+    ordinary futures. Requests are multiplexed over HTTP/2 where the server
+    negotiates it, else sent over at most ``max_connections`` HTTP/1.1
+    connections per host.
+
+    A client's pool scans its connections for every queued request on every
+    event, so the connections are split between clients of at most
+    `CONNECTIONS_PER_CLIENT`, and requests beyond what the connections can
+    carry wait for a slot in `connection` rather than in a pool. There is one
+    slot per connection until a response comes over HTTP/2, then
+    `HTTP2_STREAMS_PER_CONNECTION`.
+    """
+
+    def __init__(
+        self,
+        *,
+        http2: bool,
+        max_connections: int,
+        max_in_flight: int,
+    ) -> None:
+        """Start the event loop and create the client.
+
+        Args:
+            http2: Whether to offer HTTP/2 to servers.
+            max_connections: The maximum number of connections per host.
+            max_in_flight: The maximum number of coroutines running at once.
+
+        Raises:
+            ConfigValidationError: If ``httpx`` is not installed.
+        """
+        try:
+            import httpx  # noqa: PLC0415
+        except ImportError as ex:
+            msg = "http_engine 'asyncio' requires tap-paylocity[async]"
+            raise ConfigValidationError(msg) from ex
+        if http2:
+            try:
+                import h2  # noqa: F401, PLC0415
+            except ImportError as ex:
+                msg = "http2 requires tap-paylocity[async]"
+                raise ConfigValidationError(msg) from ex
+
+        self._clients = [
+            httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=connections,
+                    max_keepalive_connections=connections,
+                ),
+            )
+            for connections in (
+                min(CONNECTIONS_PER_CLIENT, max_connections - start)
+                for start in range(0, max_connections, CONNECTIONS_PER_CLIENT)
+            )
+        ]
+        self._active = [0] * len(self._clients)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="http-engine",
+            daemon=True,
+        )
+        self._thread.start()
+        self._in_flight = self.run(self._create_semaphore(max_in_flight))
+        self._request_slots = self.run(self._create_semaphore(max_connections))
+        self._max_connections = max_connections
+        self._multiplexed = False
+
+    @staticmethod
+    async def _create_semaphore(value: int) -> asyncio.Semaphore:
+        # Created on the loop, as Python 3.9 binds it to the current loop.
+        return asyncio.Semaphore(value)
+
+    @contextlib.asynccontextmanager
+    async def connection(self) -> t.AsyncIterator[httpx.AsyncClient]:
+        """Wait until a request can be sent, then pick the least busy client.
+
+        Yields:
+            The client to send the request with.
+        """
+        async with self._request_slots:
+            index = min(range(len(self._clients)), key=self._active.__getitem__)
+            self._active[index] += 1
+            try:
+                yield self._clients[index]
+            finally:
+                self._active[index] -= 1
+
+    def negotiated(self, response: httpx.Response) -> None:
+        """Send more requests at once after the first HTTP/2 response.
+
+        Args:
+            response: A response received by one of the clients.
+        """
+        if response.http_version != "HTTP/2" or self._multiplexed:
+            return
+        self._multiplexed = True
+        for _ in range(self._max_connections * (HTTP2_STREAMS_PER_CONNECTION - 1)):
+            self._request_slots.release()
+
+    def submit(self, coroutine: t.Coroutine[t.Any, t.Any, _T]) -> Future[_T]:
+        """Run a coroutine on the loop, once fewer than ``max_in_flight`` run.
+
+        Args:
+            coroutine: The coroutine.
+
+        Returns:
+            A future of the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(self._bounded(coroutine), self._loop)
+
+    def run(self, coroutine: t.Coroutine[t.Any, t.Any, _T]) -> _T:
+        """Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coroutine: The coroutine.
+
+        Returns:
+            The coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _bounded(self, coroutine: t.Coroutine[t.Any, t.Any, _T]) -> _T:
+        async with self._in_flight:
+            return await coroutine
+
+    def close(self) -> None:
+        """Close the clients' connections and stop the loop."""
+        for client in self._clients:
+            self.run(client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_ENGINES: dict[tuple, AsyncEngine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(*, http2: bool, max_connections: int, max_in_flight: int) -> AsyncEngine:
+    """Return the process-wide engine of a configuration, starting it on first use.
+
+    Args:
+        http2: Whether to offer HTTP/2 to servers.
+        max_connections: The maximum number of connections per host.
+        max_in_flight: The maximum number of coroutines running at once.
+
+    Returns:
+        The engine shared by every stream with the same configuration.
+    """
+    key = (http2, max_connections, max_in_flight)
+    with _ENGINES_LOCK:
+        if key not in _ENGINES:
+            _ENGINES[key] = AsyncEngine(
+                http2=http2,
+                max_connections=max_connections,
+                max_in_flight=max_in_flight,
+            )
+        return _ENGINES[key]
+
+
+@atexit.register
+def close_engines() -> None:
+    """Close every engine started by this process, at exit.
+
+    An engine used after this is started again.
+    """
+    with _ENGINES_LOCK:
+        engines = list(_ENGINES.values())
+        _ENGINES.clear()
+    for engine in engines:
+        engine.close()
+
+
+class AsyncRequestsMixin:
+    """Prefetch a child stream's contexts on an asyncio engine.
+
+    With the ``http_engine`` setting set to ``asyncio``, the child contexts a
+    parent stream prefetches, see `ConcurrentFanOutMixin`, are requested by
+    coroutines on a shared event loop instead of the parent's worker threads.
+    Up to ``async_max_in_flight`` contexts are in flight at once, multiplexed on
+    ``http_pool_size`` connections. Responses go through the same rate limiter,
+    retries and response handlers as synchronous requests, and the records are
+    handed back to the Singer writer in order.
+
+    The loop only sends requests and waits for responses: requests are
+    prepared, and responses parsed and post-processed, on worker threads with
+    `run_in_worker`, as these may block or take CPU time.
+    """
+
+    @cached_property
+    def http_engine(self) -> AsyncEngine | None:
+        """Return the asyncio engine, or ``None`` to use worker threads.
+
+        Raises:
+            ConfigValidationError: If the ``http_engine`` setting is unknown.
+        """
+        engine = self.config.get("http_engine") or "requests"
+        if engine not in HTTP_ENGINES:
+            engines = ", ".join(HTTP_ENGINES)
+            msg = f"http_engine must be one of {engines}, not {engine!r}"
+            raise ConfigValidationError(msg)
+        if engine == "requests":
+            return None
+        return get_engine(
+            http2=self.config.get("http2", True),
+            max_connections=self.http_pool_size,
+            max_in_flight=self.async_max_in_flight,
+        )
+
+    @property
+    def async_max_in_flight(self) -> int:
+        """Return the number of contexts requested at once by the engine."""
+        max_in_flight = self.config.get("async_max_in_flight") or DEFAULT_MAX_IN_FLIGHT
+        return max(int(max_in_flight), 1)
+
+    @property
+    def prefetch_limit(self) -> int:
+        """Return how many contexts of this stream a parent may prefetch ahead.
+
+        Returns:
+            Enough contexts to keep the engine busy, if it is used.
+        """
+        if self.http_engine is None:
+            return super().prefetch_limit
+        return self.async_max_in_flight
+
+    def submit_fetch(self, context: Context, executor: ThreadPoolExecutor) -> Future:
+        """Start requesting the records of a context on the engine.
+
+        Args:
+            context: The child context provided by the parent stream.
+            executor: The worker pool of the parent stream, used without engine.
+
+        Returns:
+            A future of the post-processed records of the context.
+        """
+        if self.http_engine is None:
+            return super().submit_fetch(context, executor)
+        return self.http_engine.submit(self.fetch_records_async(context))
+
+    async def fetch_records_async(self, context: Context | None) -> list[dict]:
+        """Request and post-process all records for a context.
+
+        This runs on the engine's loop; it must not write messages or state.
+
+        Args:
+            context: The stream context.
+
+        Returns:
+            The post-processed records of the context.
+        """
+        rows = await self.request_records_async(context)
+        return await self.run_in_worker(self.post_process_rows, rows, context)
+
+    def post_process_rows(
+        self,
+        rows: t.Iterable[dict],
+        context: Context | None,
+    ) -> list[dict]:
+        """Post-process the records of a context, as ``get_records`` does.
+
+        Args:
+            rows: The parsed records.
+            context: The stream context.
+
+        Returns:
+            The post-processed records that were not filtered out.
+        """
+        records = []
+        for row in rows:
+            record = self.post_process(row, context)
+            if record is not None:
+                records.append(record)
+        self.observe_post_process()
+        return records
+
+    async def request_records_async(self, context: Context | None) -> list[dict]:
+        """Request the records of a context with a single request.
+
+        Streams with several requests per context override this.
+
+        Args:
+            context: The stream context.
+
+        Returns:
+            The records parsed from the response.
+        """
+        prepared_request = await self.prepare_request_async(
+            context,
+            next_page_token=None,
+        )
+        decorated_request = self.request_decorator(self._request_async)
+        response = await decorated_request(prepared_request, context)
+        self.update_sync_costs(prepared_request, response, context)
+        # The records are only parsed as the worker consumes them.
+        return await self.run_in_worker(list, self.parse_response(response))
+
+    async def prepare_request_async(
+        self,
+        context: Context | None,
+        next_page_token: t.Any | None,  # noqa: ANN401
+    ) -> requests.PreparedRequest:
+        """Prepare a request on a worker thread.
+
+        Preparing a request authenticates it, which may wait for the token lock
+        and request a new token, so that the loop keeps serving other requests
+        meanwhile.
+
+        Args:
+            context: The stream context.
+            next_page_token: The next page index or value.
+
+        Returns:
+            The authenticated request.
+        """
+        return await self.run_in_worker(
+            self.prepare_request,
+            context,
+            next_page_token=next_page_token,
+        )
+
+    @staticmethod
+    async def run_in_worker(
+        function: t.Callable[..., _T],
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> _T:
+        """Call a function on a worker thread of the loop.
+
+        Args:
+            function: The function, which may block or use the CPU.
+            args: The positional arguments of the function.
+            kwargs: The keyword arguments of the function.
+
+        Returns:
+            The function's result.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            partial(function, *args, **kwargs),
+        )
+
+    async def _request_async(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,  # noqa: ARG002
+    ) -> requests.Response:
+        """Send a request on the engine once the host's bucket allows it.
+
+        Transport errors are raised as their ``requests`` equivalents, so that
+        `request_decorator` retries them as it does synchronous ones.
+
+        Args:
+            prepared_request: The request to send.
+            context: The stream context.
+
+        Returns:
+            The validated HTTP response.
+
+        Raises:
+            requests.exceptions.ConnectTimeout: If no connection could be made in time.
+            requests.exceptions.ReadTimeout: If the response did not arrive in time.
+            requests.exceptions.ConnectionError: On other transport errors.
+        """
+        import httpx  # noqa: PLC0415
+
+        engine = self.http_engine
+        connect_timeout, read_timeout = self.timeout
+        headers = {
+            name: value
+            for name, value in prepared_request.headers.items()
+            if name.lower() not in _HOP_BY_HOP_HEADERS
+        }
+        async with engine.connection() as client:
+            waited = await self.rate_limiter.acquire_async()
+            if waited:
+                self.throttle_waited(waited)
+            try:
+                response = await client.request(
+                    prepared_request.method,
+                    prepared_request.url,
+                    headers=headers,
+                    content=prepared_request.body,
+                    # The engine only sends requests a connection can take.
+                    timeout=httpx.Timeout(
+                        read_timeout,
+                        connect=connect_timeout,
+                        pool=None,
+                    ),
+                    follow_redirects=self.allow_redirects,
+                )
+            except httpx.ConnectTimeout as ex:
+                raise requests.exceptions.ConnectTimeout(
+                    ex,
+                    request=prepared_request,
+                ) from ex
+            except httpx.TimeoutException as ex:
+                raise requests.exceptions.ReadTimeout(
+                    ex,
+                    request=prepared_request,
+                ) from ex
+            except httpx.TransportError as ex:
+                raise requests.exceptions.ConnectionError(
+                    ex,
+                    request=prepared_request,
+                ) from ex
+        engine.negotiated(response)
+
+        converted = to_requests_response(response, prepared_request)
+        self.validate_response(converted)
+        return converted
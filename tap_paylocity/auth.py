@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+from urllib.parse import urljoin
+
 from singer_sdk.authenticators import OAuthAuthenticator, SingletonMeta
 
+from tap_paylocity.tokencache import CachedTokenMixin
+
 
 # The SingletonMeta metaclass makes your streams reuse the same authenticator instance.
 # If this behaviour interferes with your use-case, you can remove the metaclass.
-class PaylocityAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
+class PaylocityAuthenticator(
+    CachedTokenMixin,
+    OAuthAuthenticator,
+    metaclass=SingletonMeta,
+):
     """Authenticator class for Paylocity WebLinkAPI."""
 
     @property
@@ -34,12 +42,16 @@ class PaylocityAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
         """
         return cls(
             stream=stream,
-            auth_endpoint="https://api.paylocity.com/IdentityServer/connect/token",
+            auth_endpoint=urljoin(stream.url_base, "/IdentityServer/connect/token"),
             oauth_scopes="WebLinkAPI",  # Define the required scope here.
         )
 
 
-class PaylocityNextGenAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
+class PaylocityNextGenAuthenticator(
+    CachedTokenMixin,
+    OAuthAuthenticator,
+    metaclass=SingletonMeta,
+):
     """Authenticator class for Paylocity NextGenAPI."""
 
     @property
@@ -68,7 +80,7 @@ class PaylocityNextGenAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta)
         """
         return cls(
             stream=stream,
-            auth_endpoint="https://dc1prodgwext.paylocity.com/public/security/v1/token",
+            auth_endpoint=urljoin(stream.url_base, "/public/security/v1/token"),
             oauth_scopes="",  # Define the required scope here.
         )
 
@@ -0,0 +1,228 @@
+"""BATCH message output, with batch files rolled over by size."""
+
+from __future__ import annotations
+
+import gzip
+import typing as t
+from functools import cached_property
+from importlib.util import find_spec
+from uuid import uuid4
+
+import fs
+from singer_sdk._singerlib.json import serialize_json
+from singer_sdk.exceptions import ConfigValidationError
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
+    from singer_sdk.helpers.types import Context
+
+DEFAULT_BATCH_MAX_BYTES = 100_000_000
+
+#: The gzip level of JSONL files; level 9 is several times slower for ~5% less.
+GZIP_COMPRESSLEVEL = 6
+
+
+class BatchWriter:
+    """Write records to a sequence of batch files.
+
+    A file is complete once it holds the ``batch_size`` records of the batch
+    config or, for JSONL files, ``max_bytes`` bytes of uncompressed records.
+    JSONL records are written as they come, while Parquet files are buffered and
+    written whole, with the optional ``pyarrow`` package.
+    """
+
+    formats: t.ClassVar[tuple[str, ...]] = ("jsonl", "parquet")
+
+    def __init__(
+        self,
+        batch_config: BatchConfig,
+        name: str,
+        max_bytes: int | None = DEFAULT_BATCH_MAX_BYTES,
+    ) -> None:
+        """Create a writer.
+
+        Args:
+            batch_config: The encoding, storage and size of the batches.
+            name: The common name of the batch files.
+            max_bytes: The uncompressed size of complete JSONL files.
+
+        Raises:
+            ConfigValidationError: If the format is unknown, or if the Parquet
+                format is chosen and ``pyarrow`` is not installed.
+        """
+        self.batch_config = batch_config
+        self.encoding: BaseBatchFileEncoding = batch_config.encoding
+        if self.encoding.format not in self.formats:
+            msg = f"Unsupported batch format {self.encoding.format!r}"
+            raise ConfigValidationError(msg)
+        if self.encoding.format == "parquet" and find_spec("pyarrow") is None:
+            msg = "Parquet batches require tap-paylocity[parquet]"
+            raise ConfigValidationError(msg)
+
+        self.name = name
+        self.max_bytes = max_bytes
+        self.compressed = self.encoding.compression != "none"
+        self._files = 0
+        self._count = 0
+        self._bytes = 0
+        self._rows: list[dict] = []
+        self._fs: fs.base.FS | None = None
+        self._file: t.BinaryIO | None = None
+        self._stream: t.BinaryIO | None = None
+        self._filename = ""
+
+    def write(self, record: dict) -> list[str] | None:
+        """Write a record.
+
+        Args:
+            record: A conformed record.
+
+        Returns:
+            The manifest of the file the record completed, if any.
+        """
+        if self.encoding.format == "parquet":
+            self._rows.append(record)
+        else:
+            if self._stream is None:
+                self._open(".json.gz" if self.compressed else ".json")
+            line = (serialize_json(record) + "\n").encode()
+            self._stream.write(line)
+            self._bytes += len(line)
+        self._count += 1
+
+        if self._count >= self.batch_config.batch_size or (
+            self.max_bytes and self._bytes >= self.max_bytes
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> list[str] | None:
+        """Complete the current file.
+
+        Returns:
+            The manifest of the file, or ``None`` if no record was written.
+        """
+        if not self._count:
+            return None
+        if self.encoding.format == "parquet":
+            self._write_parquet()
+        url = self._close()
+        self._count = 0
+        self._bytes = 0
+        return [url]
+
+    def _open(self, extension: str) -> None:
+        self._files += 1
+        prefix = self.batch_config.storage.prefix or ""
+        self._filename = f"{prefix}{self.name}-{self._files}{extension}"
+        self._fs = fs.open_fs(self.batch_config.storage.fs_url.geturl(), create=True)
+        self._file = self._fs.open(self._filename, "wb")
+        self._stream = (
+            gzip.GzipFile(
+                fileobj=self._file,
+                mode="wb",
+                compresslevel=GZIP_COMPRESSLEVEL,
+            )
+            if self.compressed and self.encoding.format == "jsonl"
+            else self._file
+        )
+
+    def _write_parquet(self) -> None:
+        import pyarrow as pa  # noqa: PLC0415
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        self._open(".parquet")
+        table = pa.Table.from_pylist(self._rows)
+        self._rows = []
+        if self.compressed:
+            pq.write_table(table, self._file, compression="GZIP")
+        else:
+            pq.write_table(table, self._file, compression="NONE")
+
+    def _close(self) -> str:
+        """Close the current file and return its URL."""
+        if self._stream is not self._file:
+            self._stream.close()
+        self._file.close()
+        url = self._fs.geturl(self._filename)
+        self._fs.close()
+        self._fs = self._file = self._stream = None
+        return url
+
+
+class BatchMixin:
+    """Write the records of chosen streams to batch files, with BATCH messages.
+
+    The SDK's ``batch_config`` applies to the streams listed in the
+    ``batch_streams`` setting, or to all streams if it is not set. Unlike the
+    SDK's batchers, a stream keeps its current file open across the syncs of
+    its contexts, so that a child stream such as ``punch_details`` writes a few
+    large files rather than one per employee.
+
+    Every open file is completed, and its BATCH message written, before a
+    STATE message: a target must never receive a state covering records it
+    cannot load yet. Child streams write one per context unless
+    ``checkpoint_interval`` is set, so files only span contexts with it.
+    """
+
+    def get_batch_config(self, config: t.Mapping) -> BatchConfig | None:
+        """Return the batch config of this stream.
+
+        Args:
+            config: Tap configuration dictionary.
+
+        Returns:
+            The batch config, or ``None`` to write RECORD messages.
+        """
+        batch_streams = config.get("batch_streams")
+        if batch_streams is not None and self.name not in batch_streams:
+            return None
+        return super().get_batch_config(config)
+
+    @cached_property
+    def batch_writer(self) -> BatchWriter:
+        """Return the writer of this stream's batch files."""
+        return BatchWriter(
+            self.get_batch_config(self.config),
+            name=f"{self.tap_name}--{self.name}-{uuid4()}",
+            max_bytes=self.config.get("batch_max_bytes", DEFAULT_BATCH_MAX_BYTES),
+        )
+
+    def get_batches(
+        self,
+        batch_config: BatchConfig,  # noqa: ARG002
+        context: Context | None = None,
+    ) -> t.Iterable[tuple[BaseBatchFileEncoding, list[str]]]:
+        """Write the records of a context to the current batch file.
+
+        Args:
+            batch_config: Batch config for this stream.
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The encoding and manifest of each completed file.
+        """
+        writer = self.batch_writer
+        for record in self._sync_records(context, write_messages=False):
+            manifest = writer.write(self.conform_record(record))
+            if manifest:
+                yield writer.encoding, manifest
+        if self.parent_stream_type is None:
+            # Child stream files are completed by their parent's STATE messages.
+            manifest = writer.flush()
+            if manifest:
+                yield writer.encoding, manifest
+
+    def flush_batch(self) -> None:
+        """Complete this stream's current batch file and write its BATCH message."""
+        writer = self.__dict__.get("batch_writer")
+        manifest = writer and writer.flush()
+        if manifest:
+            self._write_batch_message(encoding=writer.encoding, manifest=manifest)
+
+    def _write_state_message(self) -> None:
+        """Complete the batch files of all streams, then write a STATE message."""
+        for stream in self._tap.streams.values():
+            if isinstance(stream, BatchMixin):
+                stream.flush_batch()
+        super()._write_state_message()
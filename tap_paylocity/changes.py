@@ -0,0 +1,240 @@
+"""Change-data emission: skip the records that did not change since the last run."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import typing as t
+from datetime import datetime, timezone
+from functools import cached_property
+
+from tap_paylocity.storage import SQLiteStore, get_store
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+
+#: The record property set on tombstones, as in Singer targets' soft deletes.
+DELETED_AT_PROPERTY = "_sdc_deleted_at"
+
+#: Number of new fingerprints buffered before they are saved.
+FINGERPRINT_BATCH_SIZE = 500
+
+
+def fingerprint(record: dict) -> str:
+    """Return a compact digest of a record's values.
+
+    Args:
+        record: A post-processed record.
+
+    Returns:
+        A hexadecimal digest, equal for records with equal values.
+    """
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class RecordFingerprints(SQLiteStore):
+    """A SQLite file of the fingerprint of the last record emitted per key."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            stream TEXT NOT NULL,
+            record_key TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            PRIMARY KEY (stream, record_key)
+        );
+    """
+
+    def load(self, stream: str) -> dict[str, str]:
+        """Return the fingerprints of a stream.
+
+        Args:
+            stream: The stream name.
+
+        Returns:
+            The fingerprint of each record key.
+        """
+        return dict(
+            self.execute(
+                "SELECT record_key, fingerprint FROM fingerprints WHERE stream = ?",
+                (stream,),
+            ),
+        )
+
+    def save(self, stream: str, fingerprints: t.Mapping[str, str | None]) -> None:
+        """Save the fingerprints of a stream.
+
+        Args:
+            stream: The stream name.
+            fingerprints: The new fingerprint of each record key, or ``None`` for
+                the records that were deleted.
+        """
+        self.executemany(
+            "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+            [(stream, key, value) for key, value in fingerprints.items() if value],
+        )
+        self.executemany(
+            "DELETE FROM fingerprints WHERE stream = ? AND record_key = ?",
+            [(stream, key) for key, value in fingerprints.items() if not value],
+        )
+
+
+def get_record_fingerprints(config: t.Mapping[str, t.Any]) -> RecordFingerprints | None:
+    """Return the configured store of record fingerprints.
+
+    Args:
+        config: The tap config.
+
+    Returns:
+        The store, or ``None`` if the ``change_data_path`` setting is not set.
+    """
+    path = config.get("change_data_path")
+    return get_store(RecordFingerprints, path) if path else None
+
+
+class ChangeDataMixin:
+    """Emit only the records that are new or changed since the last run.
+
+    With the ``change_data_path`` setting, the fingerprint of every record
+    emitted is saved by primary key, and records with an unchanged fingerprint
+    are skipped. With ``change_data_tombstones``, the parent stream reports the
+    child contexts of each of its partitions once it is synced, and a record
+    with only its primary keys and ``_sdc_deleted_at`` is emitted for every key
+    that is no longer among them. Keys the parent could not have produced, such
+    as those of other shards, are kept.
+
+    Fingerprints are saved once their record was written, so an interrupted
+    sync emits the unsaved ones again on the next run.
+    """
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Initialize the stream, adding the tombstone property to its schema.
+
+        Args:
+            args: The stream arguments.
+            kwargs: The stream keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        if self.emits_tombstones:
+            # Streams declare their schema as a class attribute, shadowed here.
+            self.schema = {
+                **self.schema,
+                "properties": {
+                    **self.schema["properties"],
+                    DELETED_AT_PROPERTY: {
+                        "type": ["string", "null"],
+                        "format": "date-time",
+                    },
+                },
+            }
+        self._unsaved_fingerprints: dict[str, str | None] = {}
+        self._unchanged_records = 0
+
+    @cached_property
+    def record_fingerprints(self) -> RecordFingerprints | None:
+        """Return the configured store of record fingerprints."""
+        return get_record_fingerprints(self.config)
+
+    @property
+    def emits_tombstones(self) -> bool:
+        """Return whether deleted records are emitted as tombstones."""
+        return bool(
+            self.config.get("change_data_path")
+            and self.config.get("change_data_tombstones"),
+        )
+
+    @cached_property
+    def _fingerprints(self) -> dict[str, str]:
+        """Return the fingerprint of the last record emitted for each key."""
+        return self.record_fingerprints.load(self.name)
+
+    def record_key(self, record: t.Mapping[str, t.Any]) -> str:
+        """Return the key under which a record's fingerprint is saved.
+
+        Args:
+            record: A record, or a context with the stream's primary keys.
+
+        Returns:
+            The primary key values as a JSON object.
+        """
+        return json.dumps({key: record.get(key) for key in self.primary_keys}, sort_keys=True)
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Return the new and changed records.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            One item per record that changed since it was last emitted.
+        """
+        if self.record_fingerprints is None:
+            yield from super().get_records(context)
+            return
+
+        for record in super().get_records(context):
+            key = self.record_key(record)
+            value = fingerprint(record)
+            if self._fingerprints.get(key) == value:
+                self._unchanged_records += 1
+                continue
+            yield record
+            self._fingerprints[key] = value
+            self._save_fingerprint(key, value)
+
+    def _save_fingerprint(self, key: str, value: str | None) -> None:
+        self._unsaved_fingerprints[key] = value
+        if len(self._unsaved_fingerprints) >= FINGERPRINT_BATCH_SIZE:
+            self.save_fingerprints()
+
+    def save_fingerprints(self) -> None:
+        """Save the fingerprints of the records written so far."""
+        if self._unsaved_fingerprints:
+            self.record_fingerprints.save(self.name, self._unsaved_fingerprints)
+            self._unsaved_fingerprints = {}
+
+    def parent_partition_synced(
+        self,
+        context: Context | None,
+        child_contexts: t.Iterable[Context],
+        in_scope: t.Callable[[t.Mapping[str, t.Any]], bool] | None = None,
+    ) -> None:
+        """Emit tombstones for the keys a parent partition no longer produces.
+
+        Called by the parent stream once it synced a partition, with every child
+        context of the partition, including the ones whose sync was skipped.
+        Tombstones are written directly, after a SCHEMA message.
+
+        Args:
+            context: The parent partition.
+            child_contexts: The child contexts of the partition.
+            in_scope: Whether the parent could have produced a key, e.g. because
+                it belongs to the parent's shard; by default, every key of the
+                partition.
+        """
+        if self.record_fingerprints is None:
+            return
+        if self._unchanged_records:
+            self.logger.info("Skipped %d unchanged records", self._unchanged_records)
+            self._unchanged_records = 0
+
+        if self.emits_tombstones and self.selected:
+            seen = {self.record_key(child_context) for child_context in child_contexts}
+            partition = dict(context or {})
+            deleted = []
+            for key in self._fingerprints:
+                if key in seen:
+                    continue
+                values = json.loads(key)
+                if all(
+                    values.get(name) == value for name, value in partition.items()
+                ) and (in_scope is None or in_scope(values)):
+                    deleted.append((key, values))
+            if deleted:
+                self._write_schema_message()
+                deleted_at = datetime.now(timezone.utc).isoformat()
+                for key, values in deleted:
+                    self._write_record_message({**values, DELETED_AT_PROPERTY: deleted_at})
+                    del self._fingerprints[key]
+                    self._save_fingerprint(key, None)
+        self.save_fingerprints()
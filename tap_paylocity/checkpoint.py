@@ -0,0 +1,139 @@
+"""Resumable checkpoints of child stream syncs."""
+
+from __future__ import annotations
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+    from singer_sdk.streams import Stream
+
+#: The partition state key listing the child contexts synced so far.
+CHECKPOINT_STATE_KEY = "completed_children"
+
+
+class CheckpointMixin:
+    """Checkpoint the child contexts of a parent stream into Singer state.
+
+    While a partition of the parent stream is synced, the ``checkpoint_key`` of
+    every child context whose children completed is recorded. Every
+    ``checkpoint_interval`` contexts, the list is saved in the partition's state
+    and a STATE message is written. If the sync is interrupted, the next run
+    resumes from that state and skips the completed contexts. The list is
+    removed once the partition completes.
+
+    In between checkpoints, child streams do not write a STATE message per
+    context. This avoids re-serializing per-employee state thousands of times.
+    """
+
+    #: The child context key identifying completed contexts; ``None`` disables
+    #: checkpoints for this stream.
+    checkpoint_key: str | None = None
+
+    #: Set on child streams while their parent writes their state at checkpoints.
+    _defer_state_messages: bool = False
+
+    _completed_children: list[str]
+    _skipped_children: frozenset[str] = frozenset()
+
+    @property
+    def checkpoint_interval(self) -> int:
+        """Return the number of child contexts synced between checkpoints.
+
+        Returns:
+            The configured interval, or 0 if checkpoints are disabled.
+        """
+        if self.checkpoint_key is None:
+            return 0
+        return max(int(self.config.get("checkpoint_interval") or 0), 0)
+
+    def _checkpoint_children(self) -> list[Stream]:
+        """Return the child streams whose state is checkpointed."""
+        return [
+            child
+            for child in self.child_streams
+            if isinstance(child, CheckpointMixin)
+            and (child.selected or child.has_selected_descendents)
+        ]
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Return a generator of record-type dictionary objects.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        if not self.checkpoint_interval:
+            yield from super().get_records(context)
+            return
+
+        state = self.get_context_state(context)
+        self._completed_children = list(state.get(CHECKPOINT_STATE_KEY, []))
+        self._skipped_children = frozenset(self._completed_children)
+        if self._skipped_children:
+            self.logger.info(
+                "Resuming from checkpoint, skipping %d completed child contexts",
+                len(self._skipped_children),
+            )
+
+        children = self._checkpoint_children()
+        for child in children:
+            child._defer_state_messages = True  # noqa: SLF001
+        try:
+            yield from super().get_records(context)
+        finally:
+            for child in children:
+                child._defer_state_messages = False  # noqa: SLF001
+            self._skipped_children = frozenset()
+
+        # The partition is complete, a new sync must not skip anything.
+        state.pop(CHECKPOINT_STATE_KEY, None)
+
+    def include_child_context(self, child_context: Context) -> bool:
+        """Skip child contexts completed before the last checkpoint.
+
+        Args:
+            child_context: A child context generated by this stream.
+
+        Returns:
+            ``True`` to sync the child streams for the context.
+        """
+        if child_context.get(self.checkpoint_key) in self._skipped_children:
+            return False
+        return super().include_child_context(child_context)
+
+    def child_context_completed(
+        self,
+        child_context: Context,
+        context: Context | None,
+    ) -> None:
+        """Record a completed child context, writing a checkpoint if it is due.
+
+        Args:
+            child_context: The completed child context.
+            context: The stream sync context.
+        """
+        super().child_context_completed(child_context, context)
+        if not self.checkpoint_interval:
+            return
+
+        for child in self._checkpoint_children():
+            # The SDK only promotes the progress markers of child contexts that
+            # match a state partition exactly, i.e. at the end of the sync.
+            state = child.get_context_state(child_context)
+            child._finalize_state(state)  # noqa: SLF001
+
+        self._completed_children.append(child_context[self.checkpoint_key])
+        if len(self._completed_children) % self.checkpoint_interval == 0:
+            state = self.get_context_state(context)
+            state[CHECKPOINT_STATE_KEY] = list(self._completed_children)
+            self._is_state_flushed = False
+            self._write_state_message()
+
+    def _write_state_message(self) -> None:
+        """Write out a STATE message, unless the parent stream checkpoints it."""
+        if self._defer_state_messages:
+            return
+        super()._write_state_message()
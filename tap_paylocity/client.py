@@ -7,10 +7,21 @@ import typing as t
 from functools import cached_property
 from importlib import resources
 
+from singer_sdk.exceptions import ConfigValidationError, FatalAPIError
 from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk.pagination import BaseAPIPaginator, SinglePagePaginator
 from singer_sdk.streams import RESTStream
 
+from tap_paylocity.asynchttp import AsyncRequestsMixin
 from tap_paylocity.auth import PaylocityAuthenticator, PaylocityNextGenAuthenticator
+from tap_paylocity.batching import BatchMixin
+from tap_paylocity.checkpoint import CheckpointMixin
+from tap_paylocity.coercion import CompiledConformanceMixin
+from tap_paylocity.concurrency import ConcurrentFanOutMixin
+from tap_paylocity.instrumentation import InstrumentedMixin
+from tap_paylocity.parsing import RecordDecoder
+from tap_paylocity.ratelimit import RateLimitedMixin
+from tap_paylocity.session import SharedSessionMixin
 
 if t.TYPE_CHECKING:
     import requests
@@ -20,22 +31,50 @@ if t.TYPE_CHECKING:
 # TODO: Delete this is if not using json files for schema definition
 SCHEMAS_DIR = resources.files(__package__) / "schemas"
 
-
-class PaylocityStream(RESTStream):
+DEFAULT_API_URL = "https://api.paylocity.com"
+DEFAULT_NEXTGEN_API_URL = "https://dc1prodgwext.paylocity.com"
+
+
+def get_company_ids(config: t.Mapping[str, t.Any]) -> list[str]:
+    """Return the companies to sync.
+
+    Args:
+        config: The tap config.
+
+    Returns:
+        The ``company_ids`` setting, or the single ``company_id``.
+
+    Raises:
+        ConfigValidationError: If no company is configured.
+    """
+    company_ids = config.get("company_ids") or (
+        [config["company_id"]] if config.get("company_id") else []
+    )
+    if not company_ids:
+        msg = "Either company_id or company_ids must be set"
+        raise ConfigValidationError(msg)
+    return [str(company_id) for company_id in company_ids]
+
+
+class PaylocityStream(
+    CheckpointMixin,
+    BatchMixin,
+    CompiledConformanceMixin,
+    ConcurrentFanOutMixin,
+    InstrumentedMixin,
+    RateLimitedMixin,
+    SharedSessionMixin,
+    RESTStream,
+):
     """Paylocity stream class."""
 
     # Update this value if necessary or override `parse_response`.
     records_jsonpath = "$[*]"
 
-    # Update this value if necessary or override `get_new_paginator`.
-    next_page_token_jsonpath = "$.next_page"  # noqa: S105
-
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
-        # TODO: hardcode a value here, or retrieve it from self.config
-        return "https://api.paylocity.com/api"
-
+        return f"{self.config.get('api_url', DEFAULT_API_URL)}/api"
 
     @cached_property
     def authenticator(self) -> Auth:
@@ -46,6 +85,26 @@ class PaylocityStream(RESTStream):
         """
         return PaylocityAuthenticator.create_for_stream(self)
 
+    def get_new_paginator(self) -> BaseAPIPaginator:
+        """Create a new pagination helper instance.
+
+        Paging streams override this. Response bodies are streamed, so their
+        paginators must only look at response headers.
+
+        Returns:
+            A paginator for a single page.
+        """
+        return SinglePagePaginator()
+
+    @cached_property
+    def record_decoder(self) -> RecordDecoder:
+        """Return the decoder of this stream's responses.
+
+        Returns:
+            A record decoder.
+        """
+        return RecordDecoder.create_for_stream(self)
+
     @property
     def http_headers(self) -> dict:
         """Return the http headers needed.
@@ -55,21 +114,6 @@ class PaylocityStream(RESTStream):
         """
         return {}
 
-    # def get_new_paginator(self) -> BasePageNumberPaginator:
-    #     """Create a new pagination helper instance.
-    #
-    #     If the source API can make use of the `next_page_token_jsonpath`
-    #     attribute, or it contains a `X-Next-Page` header in the response
-    #     then you can remove this method.
-    #
-    #     If you need custom pagination that uses page numbers, "next" links, or
-    #     other approaches, please read the guide: https://sdk.meltano.com/en/v0.25.0/guides/pagination-classes.html.
-    #
-    #     Returns:
-    #         A pagination helper instance.
-    #     """
-    #     return BasePageNumberPaginator(start_value=0)
-
     def get_url_params(
         self,
         context: Context | None,  # noqa: ARG002
@@ -123,6 +167,9 @@ class PaylocityStream(RESTStream):
             Each record from the source.
         """
         # TODO: Parse response body and return a set of records.
+        if self.records_jsonpath == "$[*]":
+            yield from self.record_decoder.iter_records(response)
+            return
         yield from extract_jsonpath(
             self.records_jsonpath,
             input=response.json(parse_float=decimal.Decimal),
@@ -146,20 +193,26 @@ class PaylocityStream(RESTStream):
         return row
 
 
-class PaylocityNextGenStream(RESTStream):
+class PaylocityNextGenStream(
+    CheckpointMixin,
+    BatchMixin,
+    CompiledConformanceMixin,
+    AsyncRequestsMixin,
+    ConcurrentFanOutMixin,
+    InstrumentedMixin,
+    RateLimitedMixin,
+    SharedSessionMixin,
+    RESTStream,
+):
     """Paylocity NextGen API stream class."""
 
     # Update this value if necessary or override `parse_response`.
     records_jsonpath = "$[*]"
 
-    # Update this value if necessary or override `get_new_paginator`.
-    next_page_token_jsonpath = "$.next_page"  # noqa: S105
-
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
-        return "https://dc1prodgwext.paylocity.com"
-
+        return self.config.get("nextgen_api_url", DEFAULT_NEXTGEN_API_URL)
 
     @cached_property
     def authenticator(self) -> Auth:
@@ -170,6 +223,26 @@ class PaylocityNextGenStream(RESTStream):
         """
         return PaylocityNextGenAuthenticator.create_for_stream(self)
 
+    def get_new_paginator(self) -> BaseAPIPaginator:
+        """Create a new pagination helper instance.
+
+        Paging streams override this. Response bodies are streamed, so their
+        paginators must only look at response headers.
+
+        Returns:
+            A paginator for a single page.
+        """
+        return SinglePagePaginator()
+
+    @cached_property
+    def record_decoder(self) -> RecordDecoder:
+        """Return the decoder of this stream's responses.
+
+        Returns:
+            A record decoder.
+        """
+        return RecordDecoder.create_for_stream(self)
+
     @property
     def http_headers(self) -> dict:
         """Return the http headers needed.
@@ -233,6 +306,9 @@ class PaylocityNextGenStream(RESTStream):
             Each record from the source.
         """
         # TODO: Parse response body and return a set of records.
+        if self.records_jsonpath == "$[*]":
+            yield from self.record_decoder.iter_records(response)
+            return
         yield from extract_jsonpath(
             self.records_jsonpath,
             input=response.json(parse_float=decimal.Decimal),
@@ -257,10 +333,13 @@ class PaylocityNextGenStream(RESTStream):
 
     def validate_response(self, response):
         """Catch error status codes"""
-        # workaround until filtering in employees request is available
-        if response.status_code == 404:
+        try:
+            super().validate_response(response)
+        except FatalAPIError:
+            # workaround until filtering in employees request is available
+            if response.status_code != 404:
+                raise
             msg = (
                 f"{response.status_code} Tolerated Status Code"
             )
             self.logger.info(msg)
-            return
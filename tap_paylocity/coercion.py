@@ -0,0 +1,310 @@
+"""Record coercion and validation compiled from stream schemas."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import re
+import typing as t
+from functools import cached_property
+
+import singer_sdk._singerlib as singer
+from singer_sdk.exceptions import ConfigValidationError, InvalidRecord
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import conform_record_data_types, to_json_compatible
+from singer_sdk.helpers._util import utc_now
+
+from tap_paylocity.projection import selected_properties
+
+#: A function converting one non-null property value.
+Coercer = t.Callable[[t.Any], t.Any]
+
+_NUMBER_TYPES = (int, float, decimal.Decimal)
+
+
+def _property_types(schema: dict) -> frozenset[str]:
+    types = schema.get("type", [])
+    types = [types] if isinstance(types, str) else types
+    return frozenset(types) - {"null"}
+
+
+def _coerce_datetime(value: t.Any) -> t.Any:  # noqa: ANN401
+    if isinstance(value, datetime.datetime):
+        return to_json_compatible(value)
+    if value.__class__ is str:
+        # Write UTC as datetimes are written, "+00:00", with an uppercase "T".
+        if value[10:11] == "t":
+            value = f"{value[:10]}T{value[11:]}"
+        if value[-1:] in ("Z", "z"):
+            value = f"{value[:-1]}+00:00"
+    return value
+
+
+def _coerce_date(value: t.Any) -> t.Any:  # noqa: ANN401
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def _coerce_number(value: t.Any) -> t.Any:  # noqa: ANN401
+    if value.__class__ is str:
+        return decimal.Decimal(value)
+    return value
+
+
+def _coerce_integer(value: t.Any) -> t.Any:  # noqa: ANN401
+    if value.__class__ is str:
+        return int(value)
+    if value.__class__ is float and value.is_integer():
+        return int(value)
+    return value
+
+
+def _coerce_boolean(value: t.Any) -> t.Any:  # noqa: ANN401
+    return value != 0
+
+
+def _validated(coerce: Coercer, check: t.Callable[[t.Any], bool], kind: str) -> Coercer:
+    """Wrap a coercer to raise if the coerced value is not of the expected type."""
+
+    def coerce_and_check(value: t.Any) -> t.Any:  # noqa: ANN401
+        try:
+            value = coerce(value)
+        except (ValueError, ArithmeticError) as ex:
+            msg = f"{value!r} is not a valid {kind}"
+            raise TypeError(msg) from ex
+        if not check(value):
+            msg = f"{value!r} is not a valid {kind}"
+            raise TypeError(msg)
+        return value
+
+    return coerce_and_check
+
+
+# RFC 3339 full-date and date-time. The offset is optional, as the API sends
+# times local to the company without one; these are kept as they are, since
+# their offset is unknown.
+_DATE_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_DATETIME_PATTERN = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[Tt](\d{2}):(\d{2}):(\d{2})(?:\.\d+)?"
+    r"(?:[Zz]|[+-](\d{2}):(\d{2}))?",
+)
+
+
+def _is_datetime(value: t.Any) -> bool:  # noqa: ANN401
+    if not isinstance(value, str):
+        return False
+    match = _DATETIME_PATTERN.fullmatch(value)
+    if match is None:
+        return False
+    year, month, day, hour, minute, second, offset_hours, offset_minutes = (
+        int(group or 0) for group in match.groups()
+    )
+    try:
+        datetime.date(year, month, day)
+    except ValueError:
+        return False
+    # Allow leap seconds.
+    return (
+        hour <= 23  # noqa: PLR2004
+        and minute <= 59  # noqa: PLR2004
+        and second <= 60  # noqa: PLR2004
+        and offset_hours <= 23  # noqa: PLR2004
+        and offset_minutes <= 59  # noqa: PLR2004
+    )
+
+
+def _is_date(value: t.Any) -> bool:  # noqa: ANN401
+    if not isinstance(value, str):
+        return False
+    match = _DATE_PATTERN.fullmatch(value)
+    if match is None:
+        return False
+    try:
+        datetime.date(*(int(group) for group in match.groups()))
+    except ValueError:
+        return False
+    return True
+
+
+def compile_coercer(schema: dict, *, validate: bool) -> Coercer | None:
+    """Return the coercer of one property.
+
+    Args:
+        schema: The JSON schema of the property.
+        validate: Also check that the coerced value matches the schema.
+
+    Returns:
+        The coercer, or ``None`` if values are passed through unchanged.
+    """
+    types = _property_types(schema)
+    if types == {"boolean"}:
+        return _coerce_boolean
+    if types == {"string"} and schema.get("format") == "date-time":
+        coerce, check, kind = _coerce_datetime, _is_datetime, "date-time"
+    elif types == {"string"} and schema.get("format") == "date":
+        coerce, check, kind = _coerce_date, _is_date, "date"
+    elif types == {"number"}:
+        coerce, kind = _coerce_number, "number"
+        check = lambda v: isinstance(v, _NUMBER_TYPES) and v.__class__ is not bool  # noqa: E731
+    elif types == {"integer"}:
+        coerce, kind = _coerce_integer, "integer"
+        check = lambda v: isinstance(v, int) and v.__class__ is not bool  # noqa: E731
+    elif types == {"string"}:
+        if not validate:
+            return None
+        return _validated(lambda v: v, lambda v: isinstance(v, str), "string")
+    else:
+        # Objects, arrays and unions are passed through.
+        return None
+    return _validated(coerce, check, kind) if validate else coerce
+
+
+class RecordCoercer:
+    """The coercion of a stream's records, compiled once from its schema.
+
+    Only top-level properties are coerced. Properties that are not in the
+    schema, or not selected, are dropped, like the SDK does.
+    """
+
+    def __init__(
+        self,
+        schema: dict,
+        *,
+        validate: bool = True,
+        selected: t.Iterable[str] | None = None,
+    ) -> None:
+        """Compile a coercer.
+
+        Args:
+            schema: The stream schema.
+            validate: Raise `InvalidRecord` for values not matching the schema.
+            selected: Only keep these properties; all by default.
+        """
+        keep = None if selected is None else set(selected)
+        self.coercers: dict[str, Coercer | None] = {
+            name: compile_coercer(property_schema, validate=validate)
+            for name, property_schema in schema.get("properties", {}).items()
+            if keep is None or name in keep
+        }
+        self.unmapped: set[str] = set()
+
+    def __call__(self, record: dict) -> dict:
+        """Coerce a record.
+
+        Args:
+            record: A post-processed record.
+
+        Returns:
+            A new record with the selected properties, coerced.
+
+        Raises:
+            InvalidRecord: If a value does not match the schema.
+        """
+        coercers = self.coercers
+        output = {}
+        for name, value in record.items():
+            if name not in coercers:
+                self.unmapped.add(name)
+                continue
+            coerce = coercers[name]
+            if coerce is None or value is None:
+                output[name] = value
+                continue
+            try:
+                output[name] = coerce(value)
+            except TypeError as ex:
+                msg = f"{name}: {ex}"
+                raise InvalidRecord(msg, record) from ex
+        return output
+
+
+class CompiledConformanceMixin:
+    """Conform records with a `RecordCoercer` instead of the SDK's generic code.
+
+    The ``record_validation`` setting chooses ``sdk`` conformance, the default,
+    ``compiled`` coercion and validation, or ``coerce_only`` for trusted sources,
+    which coerces values without checking them.
+    """
+
+    record_validation_modes: t.ClassVar[tuple[str, ...]] = (
+        "sdk",
+        "compiled",
+        "coerce_only",
+    )
+
+    @cached_property
+    def record_coercer(self) -> RecordCoercer | None:
+        """Return the compiled coercer of this stream.
+
+        Returns:
+            The coercer, or ``None`` for the SDK's conformance.
+
+        Raises:
+            ConfigValidationError: If the mode is unknown.
+        """
+        mode = self.config.get("record_validation", "sdk")
+        if mode not in self.record_validation_modes:
+            msg = f"Unknown record_validation {mode!r}"
+            raise ConfigValidationError(msg)
+        if mode == "sdk":
+            return None
+        return RecordCoercer(
+            self.schema,
+            validate=mode == "compiled",
+            selected=selected_properties(self),
+        )
+
+    def conform_record(self, record: dict) -> dict:
+        """Drop the deselected properties of a record and conform its values.
+
+        Args:
+            record: A post-processed record.
+
+        Returns:
+            The conformed record.
+        """
+        coercer = self.record_coercer
+        if coercer is None:
+            pop_deselected_record_properties(record, self.schema, self.mask)
+            return conform_record_data_types(
+                stream_name=self.name,
+                record=record,
+                schema=self.schema,
+                level=self.TYPE_CONFORMANCE_LEVEL,
+                logger=self.logger,
+            )
+
+        record = coercer(record)
+        if coercer.unmapped:
+            self.logger.warning(
+                "Properties %s were present in the '%s' stream but not found in "
+                "catalog schema. Ignoring.",
+                tuple(sorted(coercer.unmapped)),
+                self.name,
+            )
+            coercer.unmapped.clear()
+        return record
+
+    def _generate_record_messages(
+        self,
+        record: dict,
+    ) -> t.Generator[singer.RecordMessage, None, None]:
+        """Yield the RECORD messages of a record, conformed by `conform_record`.
+
+        Args:
+            record: A single stream record.
+
+        Yields:
+            Record message objects.
+        """
+        record = self.conform_record(record)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            if mapped_record is not None:
+                yield singer.RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=utc_now(),
+                )
@@ -0,0 +1,384 @@
+"""Concurrency helpers for fanning out child stream requests."""
+
+from __future__ import annotations
+
+import collections
+import queue
+import threading
+import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+    from singer_sdk.streams import Stream
+
+
+def context_key(context: Context) -> tuple:
+    """Return a hashable key identifying a stream context.
+
+    Args:
+        context: The stream context.
+
+    Returns:
+        A tuple of the sorted context items.
+    """
+    return tuple(sorted(context.items()))
+
+
+class _Failure:
+    """An exception raised by a pipeline producer, passed to the consumer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_DONE = object()
+
+
+class RecordPipeline:
+    """Records produced on a background thread, through a bounded queue.
+
+    The producer blocks while ``maxsize`` records wait for the consumer, so memory
+    stays bounded however far ahead it could run. Records are yielded in order,
+    and an exception of the producer is raised by the consumer.
+    """
+
+    #: Seconds between checks of whether a blocked producer was closed.
+    poll_interval: float = 0.1
+
+    def __init__(self, records: t.Iterable[dict], maxsize: int, name: str) -> None:
+        """Start producing records.
+
+        Args:
+            records: The records to produce, iterated on the background thread.
+            maxsize: The maximum number of records produced ahead.
+            name: The name of the producer thread.
+        """
+        self._records = records
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name=name, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: t.Any) -> bool:  # noqa: ANN401
+        """Queue an item, unless the pipeline is closed while waiting."""
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=self.poll_interval)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _produce(self) -> None:
+        try:
+            for record in self._records:
+                if not self._put(record):
+                    return
+        except BaseException as ex:  # noqa: BLE001
+            self._put(_Failure(ex))
+        else:
+            self._put(_DONE)
+        finally:
+            close = getattr(self._records, "close", None)
+            if close is not None:
+                close()
+
+    def __iter__(self) -> t.Iterator[dict]:
+        """Yield the records as they are produced.
+
+        Yields:
+            The records, in order.
+
+        Raises:
+            BaseException: The exception the producer raised, if any.
+        """
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    def close(self) -> None:
+        """Stop the producer, discarding the records not consumed yet."""
+        self._closed.set()
+
+
+class ConcurrentFanOutMixin:
+    """Run child stream requests on a bounded worker pool.
+
+    When ``max_concurrency`` is greater than one, a parent stream runs ahead of the
+    records it yields, submitting the requests of each selected child stream to a
+    thread pool. Child streams then consume the prefetched results when the SDK
+    syncs them for that context, so RECORD and STATE messages are still written
+    in order, from the main thread only.
+
+    The parent's own records are requested on a background thread meanwhile, and
+    handed over through a queue of ``pipeline_queue_size`` records.
+    """
+
+    #: How many parent records per worker may be prefetched ahead of the writer.
+    fanout_lookahead_factor: int = 4
+
+    @property
+    def max_concurrency(self) -> int:
+        """Return the number of worker threads used to fan out child requests.
+
+        Returns:
+            The configured concurrency, or 1 for fully sequential syncs.
+        """
+        return max(int(self.config.get("max_concurrency") or 1), 1)
+
+    @cached_property
+    def _prefetched(self) -> dict[tuple, Future]:
+        """Return the in-flight child requests of this stream, keyed by context."""
+        return {}
+
+    def fetch_records(self, context: Context | None) -> list[dict]:
+        """Request and post-process all records for a context.
+
+        This is what worker threads run; it must not write messages or state.
+
+        Args:
+            context: The stream context.
+
+        Returns:
+            The post-processed records of the context.
+        """
+        return list(super().get_records(context))
+
+    def prefetch(self, context: Context, executor: ThreadPoolExecutor) -> None:
+        """Submit the requests of a context to a worker pool.
+
+        Args:
+            context: The child context provided by the parent stream.
+            executor: The worker pool of the parent stream.
+        """
+        # Seed the context's bookmark on the main thread, as the SDK does when it
+        # starts syncing a context, so that workers only ever read the state.
+        if self.replication_key:
+            self._write_starting_replication_value(context)
+        self._prefetched[context_key(context)] = self.submit_fetch(context, executor)
+
+    def submit_fetch(self, context: Context, executor: ThreadPoolExecutor) -> Future:
+        """Start requesting the records of a context in the background.
+
+        Args:
+            context: The child context provided by the parent stream.
+            executor: The worker pool of the parent stream.
+
+        Returns:
+            A future of the post-processed records of the context.
+        """
+        return executor.submit(self.fetch_records, context)
+
+    @property
+    def prefetch_limit(self) -> int:
+        """Return how many contexts of this stream a parent may prefetch ahead.
+
+        Returns:
+            The number of contexts, by default a few per worker thread.
+        """
+        return self.max_concurrency * self.fanout_lookahead_factor
+
+    @property
+    def pipeline_queue_size(self) -> int:
+        """Return how many records a background producer may run ahead.
+
+        Returns:
+            The configured queue size.
+        """
+        return max(int(self.config.get("pipeline_queue_size") or 1), 1)
+
+    @cached_property
+    def _pipelines(self) -> dict[tuple, RecordPipeline]:
+        """Return the partitions of this stream produced ahead, keyed by context."""
+        return {}
+
+    def _start_pipeline(self, records: t.Iterable[dict]) -> RecordPipeline:
+        """Produce records on a background thread.
+
+        Args:
+            records: The records to produce.
+
+        Returns:
+            The pipeline yielding the records.
+        """
+        return RecordPipeline(
+            records,
+            maxsize=self.pipeline_queue_size,
+            name=f"{self.name}-pipeline",
+        )
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Return a generator of record-type dictionary objects.
+
+        With ``max_concurrency`` greater than one, the records of a parent stream
+        are requested on a background thread, e.g. the next roster page is
+        downloaded while the children of the current one are fetched.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        key = context_key(context) if context else None
+        future = self._prefetched.pop(key, None) if key else None
+        children = self._fanout_children()
+        pipeline = None
+        if future is not None:
+            records: t.Iterable[dict] = future.result()
+        elif self.max_concurrency <= 1:
+            records = super().get_records(context)
+        else:
+            if key:
+                self._prefetch_partitions(context)
+                pipeline = self._pipelines.pop(key, None)
+            if pipeline is None and children:
+                pipeline = self._start_pipeline(super().get_records(context))
+            records = pipeline if pipeline is not None else super().get_records(context)
+
+        try:
+            if self.max_concurrency <= 1 or not children:
+                yield from records
+            else:
+                yield from self._fan_out(records, context, children)
+        except BaseException:
+            # The sync stops, so do the partitions produced ahead.
+            for pending in self._pipelines.values():
+                pending.close()
+            self._pipelines.clear()
+            raise
+        finally:
+            if pipeline is not None:
+                pipeline.close()
+
+    def _prefetch_partitions(self, context: Context) -> None:
+        """Keep the partitions following ``context`` in flight.
+
+        Up to ``max_concurrency`` partitions are produced ahead of the one being
+        synced, so that e.g. companies are requested in parallel while the SDK
+        still syncs, and writes the state of, one partition at a time.
+
+        Args:
+            context: The partition the SDK is about to sync.
+        """
+        keys = [context_key(partition) for partition in self.partitions or []]
+        key = context_key(context)
+        if key not in keys:
+            return
+        index = keys.index(key)
+        upcoming = self.partitions[index : index + 1 + self.max_concurrency]
+        for partition, partition_key in zip(upcoming, keys[index:]):
+            if partition_key in self._pipelines:
+                continue
+            # Seed the partition's bookmark on the main thread, see `prefetch`.
+            if self.replication_key and partition_key != key:
+                self._write_starting_replication_value(partition)
+            self._pipelines[partition_key] = self._start_pipeline(
+                super().get_records(partition),
+            )
+
+    def include_child_context(self, child_context: Context) -> bool:  # noqa: ARG002
+        """Return whether the child streams must be synced for a context.
+
+        Override this to skip child contexts. It is called before child requests
+        are prefetched, and again when the SDK is about to sync the children.
+
+        Args:
+            child_context: A child context generated by this stream.
+
+        Returns:
+            ``True`` to sync the child streams for the context.
+        """
+        return True
+
+    def generate_child_contexts(
+        self,
+        record: dict,
+        context: Context | None,
+    ) -> t.Iterable[Context | None]:
+        """Generate the child contexts of a record, except the skipped ones.
+
+        Args:
+            record: A record from this stream.
+            context: The stream sync context.
+
+        Yields:
+            The child contexts to sync.
+        """
+        for child_context in super().generate_child_contexts(record, context):
+            if child_context is None:
+                yield child_context
+            elif self.include_child_context(child_context):
+                yield child_context
+                # The SDK synced the children of the context before resuming here.
+                self.child_context_completed(child_context, context)
+
+    def child_context_completed(
+        self,
+        child_context: Context,
+        context: Context | None,
+    ) -> None:
+        """Handle a child context whose child streams are synced.
+
+        Args:
+            child_context: The completed child context.
+            context: The stream sync context.
+        """
+
+    def _fanout_children(self) -> list[Stream]:
+        """Return the child streams whose records are needed in this sync."""
+        return [
+            child
+            for child in self.child_streams
+            if isinstance(child, ConcurrentFanOutMixin)
+            and (child.selected or child.has_selected_descendents)
+        ]
+
+    def _fan_out(
+        self,
+        records: t.Iterable[dict],
+        context: Context | None,
+        children: list[Stream],
+    ) -> t.Iterator[dict]:
+        """Yield parent records while their children are fetched in the background.
+
+        Args:
+            records: The parent records, in source order.
+            context: The parent stream context.
+            children: The child streams to prefetch.
+
+        Yields:
+            The parent records, in source order.
+        """
+        pending: collections.deque[dict] = collections.deque()
+        lookahead = max(child.prefetch_limit for child in children)
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=f"{self.name}-fanout",
+        )
+        try:
+            for record in records:
+                child_context = self.get_child_context(record=record, context=context)
+                if child_context is not None and self.include_child_context(
+                    child_context,
+                ):
+                    for child in children:
+                        child.prefetch(child_context, executor)
+                pending.append(record)
+                if len(pending) > lookahead:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for child in children:
+                # Drop results of contexts the SDK did not sync, e.g. mapped out.
+                for future in child._prefetched.values():  # noqa: SLF001
+                    future.cancel()
+                child._prefetched.clear()  # noqa: SLF001
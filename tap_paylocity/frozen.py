@@ -0,0 +1,128 @@
+"""Persisted record of employees whose data no longer changes."""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+
+from tap_paylocity.storage import SQLiteStore, get_store
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+#: Roster status code of terminated employees.
+TERMINATED_STATUS = "T"
+
+DEFAULT_TERMINATED_GRACE_DAYS = 90
+
+
+class FrozenEmployees(SQLiteStore):
+    """A SQLite file of the employees whose child streams can be skipped.
+
+    An employee is frozen once their details show they were terminated more than
+    a grace period ago, and only after all their child streams were synced. They
+    stay frozen while their roster status is the one they were frozen with, so a
+    rehired employee is synced again.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS frozen_employees (
+            company_id TEXT NOT NULL,
+            employee_id TEXT NOT NULL,
+            status_code TEXT NOT NULL,
+            frozen_at REAL NOT NULL,
+            PRIMARY KEY (company_id, employee_id)
+        );
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open a store file, creating it if needed.
+
+        Args:
+            path: The SQLite file.
+        """
+        super().__init__(path)
+        self._frozen: dict[tuple[str, str], str] = {
+            (company_id, employee_id): status_code
+            for company_id, employee_id, status_code in self.execute(
+                "SELECT company_id, employee_id, status_code FROM frozen_employees",
+            )
+        }
+        self._observed: dict[tuple[str, str], str | None] = {}
+        self._observed_lock = threading.Lock()
+
+    def is_frozen(self, company_id: str, employee_id: str, status_code: str) -> bool:
+        """Return whether an employee's child streams can be skipped.
+
+        Args:
+            company_id: The company ID.
+            employee_id: The employee ID.
+            status_code: The employee's current roster status.
+
+        Returns:
+            ``True`` if the employee was frozen with the same status.
+        """
+        return self._frozen.get((company_id, employee_id)) == status_code
+
+    def observe(
+        self,
+        company_id: str,
+        employee_id: str,
+        frozen_status: str | None,
+    ) -> None:
+        """Note whether an employee's details show frozen data.
+
+        The observation is only saved by `complete`, once every child stream of
+        the employee was synced.
+
+        Args:
+            company_id: The company ID.
+            employee_id: The employee ID.
+            frozen_status: The status the employee is frozen with, or ``None`` if
+                their data may still change.
+        """
+        with self._observed_lock:
+            self._observed[(company_id, employee_id)] = frozen_status
+
+    def complete(self, company_id: str, employee_id: str) -> None:
+        """Save the observation of an employee whose child streams were synced.
+
+        Args:
+            company_id: The company ID.
+            employee_id: The employee ID.
+        """
+        key = (company_id, employee_id)
+        with self._observed_lock:
+            if key not in self._observed:
+                return
+            frozen_status = self._observed.pop(key)
+
+        if frozen_status is not None:
+            self._frozen[key] = frozen_status
+            self.execute(
+                "INSERT OR REPLACE INTO frozen_employees VALUES (?, ?, ?, ?)",
+                (company_id, employee_id, frozen_status, time.time()),
+            )
+        elif self._frozen.pop(key, None) is not None:
+            self.execute(
+                "DELETE FROM frozen_employees WHERE company_id = ? AND employee_id = ?",
+                key,
+            )
+
+    def __len__(self) -> int:
+        """Return the number of frozen employees."""
+        return len(self._frozen)
+
+
+def get_frozen_employees(config: t.Mapping[str, t.Any]) -> FrozenEmployees | None:
+    """Return the configured store of frozen employees.
+
+    Args:
+        config: The tap config.
+
+    Returns:
+        The store, or ``None`` if the ``frozen_employees_path`` setting is not set.
+    """
+    path = config.get("frozen_employees_path")
+    return get_store(FrozenEmployees, path) if path else None
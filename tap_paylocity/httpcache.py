@@ -0,0 +1,263 @@
+"""Persistent HTTP response cache with conditional requests."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+import typing as t
+from dataclasses import dataclass
+from functools import cached_property
+from http import HTTPStatus
+from pathlib import Path
+
+from tap_paylocity.session import release_connection
+from tap_paylocity.storage import SQLiteStore, get_store
+
+if t.TYPE_CHECKING:
+    import requests
+    from singer_sdk.helpers.types import Context
+
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ENTRIES = 100_000
+
+# The request headers made from a cached response's validators.
+_VALIDATORS = ("If-None-Match", "If-Modified-Since")
+
+
+def content_hash(body: bytes) -> str:
+    """Return the fingerprint of a response body.
+
+    Args:
+        body: The raw response body.
+
+    Returns:
+        The hex SHA-256 digest of the body.
+    """
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A response body stored in the cache, with its validators."""
+
+    url: str
+    etag: str | None
+    last_modified: str | None
+    content_hash: str
+    body: bytes
+
+
+class HTTPCache(SQLiteStore):
+    """A SQLite file of response bodies keyed by URL, readable by its owner only.
+
+    Entries expire ``ttl_days`` after they were last downloaded, so that every
+    response is fully fetched again from time to time, and only the
+    ``max_entries`` most recently used entries are kept.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT NOT NULL,
+            body BLOB NOT NULL,
+            stored_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+    """
+
+    private = True
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl_days: float = DEFAULT_TTL_DAYS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """Open a cache file, creating it if needed, and evict stale entries.
+
+        Args:
+            path: The SQLite file.
+            ttl_days: Days after which an entry is downloaded again in full.
+            max_entries: The maximum number of entries kept.
+        """
+        super().__init__(path)
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.evict()
+
+    def get(self, url: str, *, include_expired: bool = False) -> CachedResponse | None:
+        """Return the entry of a URL.
+
+        Args:
+            url: The request URL.
+            include_expired: Also return an entry older than the TTL.
+
+        Returns:
+            The cached response, or ``None`` if there is none or it expired.
+        """
+        expires = float("-inf") if include_expired else time.time() - self.ttl
+        rows = self.execute(
+            "SELECT etag, last_modified, content_hash, body FROM responses "
+            "WHERE url = ? AND stored_at >= ?",
+            (url, expires),
+        )
+        return CachedResponse(url, *rows[0]) if rows else None
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store the body of a full response.
+
+        A body equal to the cached one, by content hash, is not written again;
+        only its validators and timestamps are updated.
+
+        Args:
+            url: The request URL.
+            body: The raw response body.
+            etag: The ``ETag`` header of the response.
+            last_modified: The ``Last-Modified`` header of the response.
+        """
+        digest = content_hash(body)
+        now = time.time()
+        rows = self.execute("SELECT content_hash FROM responses WHERE url = ?", (url,))
+        if rows and rows[0][0] == digest:
+            self.execute(
+                "UPDATE responses SET etag = ?, last_modified = ?, "
+                "stored_at = ?, accessed_at = ? WHERE url = ?",
+                (etag, last_modified, now, now, url),
+            )
+            return
+        self.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, digest, body, now, now),
+        )
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as used, for LRU eviction.
+
+        Args:
+            url: The request URL.
+        """
+        self.execute(
+            "UPDATE responses SET accessed_at = ? WHERE url = ?",
+            (time.time(), url),
+        )
+
+    def evict(self) -> None:
+        """Delete expired entries and the least recently used ones over the limit."""
+        self.execute(
+            "DELETE FROM responses WHERE stored_at < ?",
+            (time.time() - self.ttl,),
+        )
+        self.execute(
+            "DELETE FROM responses WHERE url NOT IN ("
+            "SELECT url FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return self.execute("SELECT COUNT(*) FROM responses")[0][0]
+
+
+class HTTPCacheMixin:
+    """Revalidate a REST stream's responses against the ``http_cache_path`` file.
+
+    Requests carry ``If-None-Match`` and ``If-Modified-Since`` when the cached
+    response had validators, and ``304 Not Modified`` answers are replayed from
+    the cache. Full responses are stored, in a file readable by its owner only
+    since bodies hold personal data.
+    """
+
+    @cached_property
+    def http_cache(self) -> HTTPCache | None:
+        """Return the configured cache.
+
+        Returns:
+            The cache, or ``None`` if the ``http_cache_path`` setting is not set.
+        """
+        path = self.config.get("http_cache_path")
+        if not path:
+            return None
+        return get_store(
+            HTTPCache,
+            path,
+            ttl_days=self.config.get("http_cache_ttl_days", DEFAULT_TTL_DAYS),
+            max_entries=self.config.get("http_cache_max_entries", DEFAULT_MAX_ENTRIES),
+        )
+
+    def prepare_request(
+        self,
+        context: Context | None,
+        next_page_token: t.Any | None,  # noqa: ANN401
+    ) -> requests.PreparedRequest:
+        """Prepare a request, made conditional if its response is cached.
+
+        Args:
+            context: The stream context.
+            next_page_token: The next page index or value.
+
+        Returns:
+            The prepared request.
+        """
+        prepared_request = super().prepare_request(context, next_page_token)
+        if self.http_cache is None:
+            return prepared_request
+        cached = self.http_cache.get(prepared_request.url)
+        if cached is not None:
+            if cached.etag:
+                prepared_request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                prepared_request.headers["If-Modified-Since"] = cached.last_modified
+        return prepared_request
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        """Send a request, serving ``304 Not Modified`` bodies from the cache.
+
+        A ``304`` whose entry was evicted since the request was prepared is
+        answered by sending the request again without its validators.
+
+        Args:
+            prepared_request: The request to send.
+            context: The stream context.
+
+        Returns:
+            The HTTP response, with its body read.
+        """
+        response = super()._request(prepared_request, context)
+        if self.http_cache is None:
+            return response
+
+        url = prepared_request.url
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            # The entry may have expired since the request was prepared.
+            cached = self.http_cache.get(url, include_expired=True)
+            if cached is not None:
+                self.http_cache.touch(url)
+                response._content = cached.body  # noqa: SLF001
+                response._content_consumed = True  # noqa: SLF001
+            elif any(header in prepared_request.headers for header in _VALIDATORS):
+                # The entry was evicted meanwhile; fetch the body in full.
+                release_connection(response)
+                unconditional = prepared_request.copy()
+                for header in _VALIDATORS:
+                    unconditional.headers.pop(header, None)
+                return self._request(unconditional, context)
+        elif response.ok:
+            self.http_cache.put(
+                url,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return response
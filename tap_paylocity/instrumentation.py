@@ -0,0 +1,637 @@
+"""Performance metrics of the HTTP and record processing hot paths."""
+
+from __future__ import annotations
+
+import enum
+import functools
+import json
+import os
+import threading
+import time
+import typing as t
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from singer_sdk import metrics
+
+if t.TYPE_CHECKING:
+    import requests
+    from singer_sdk.helpers.types import Context
+
+#: The upper bounds of the request latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+PROMETHEUS_PREFIX = "tap_paylocity"
+
+#: The stream name of OAuth token requests.
+AUTH_STREAM = "auth"
+
+
+class PerformanceMetric(str, enum.Enum):
+    """The names of the performance summary metrics."""
+
+    HTTP_REQUEST_LATENCY = "http_request_latency"
+    HTTP_RESPONSE_BYTES = "http_response_bytes"
+    HTTP_RETRY_COUNT = "http_retry_count"
+    THROTTLE_WAIT = "throttle_wait"
+    PARSE_DURATION = "parse_duration"
+    POST_PROCESS_DURATION = "post_process_duration"
+    RECORDS_PER_SECOND = "records_per_second"
+
+
+class Histogram:
+    """A histogram with fixed buckets, like a Prometheus histogram."""
+
+    def __init__(self, buckets: t.Sequence[float] = LATENCY_BUCKETS) -> None:
+        """Create an empty histogram.
+
+        Args:
+            buckets: The sorted upper bounds of the buckets.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation.
+
+        Args:
+            value: The observed value.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Return an upper bound of a quantile.
+
+        Args:
+            q: The quantile, between 0 and 1.
+
+        Returns:
+            The bound of the bucket holding the quantile, ``inf`` if it is in the
+            last bucket, or ``None`` without observations.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        """Return the cumulative count of each bucket, keyed by its ``le`` label."""
+        bounds = [*(repr(bound) for bound in self.buckets), "+Inf"]
+        cumulative = 0
+        counts = []
+        for bound, count in zip(bounds, self.counts):
+            cumulative += count
+            counts.append((bound, cumulative))
+        return counts
+
+    def summary(self) -> dict[str, t.Any]:
+        """Return the count, sum and main quantiles."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+@dataclass
+class EndpointStats:
+    """The performance of the requests of one stream to one endpoint template."""
+
+    latency: Histogram = field(default_factory=Histogram)
+    statuses: dict[str, int] = field(default_factory=dict)
+    bytes_received: int = 0
+    retries: int = 0
+    throttle_waits: int = 0
+    throttle_wait_seconds: float = 0.0
+    parse_seconds: float = 0.0
+
+
+@dataclass
+class StreamStats:
+    """The record processing performance of one stream."""
+
+    records: int = 0
+    post_process_seconds: float = 0.0
+
+
+class PerformanceMetrics:
+    """Thread-safe performance metrics of a tap run.
+
+    Requests are tracked per stream and endpoint template, e.g.
+    ``/v2/companies/{companyId}/employees``, so that per-employee requests are
+    aggregated. At the end of a run the metrics are logged as SDK metric lines
+    and, optionally, written as JSON or as a Prometheus textfile.
+    """
+
+    def __init__(self) -> None:
+        """Create empty metrics."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all observations and restart the run clock."""
+        with self._lock:
+            self.started = time.monotonic()
+            self.endpoints: dict[tuple[str, str], EndpointStats] = {}
+            self.streams: dict[str, StreamStats] = {}
+
+    def _endpoint(self, stream: str, endpoint: str) -> EndpointStats:
+        # Callers hold the lock.
+        key = (stream, endpoint)
+        if key not in self.endpoints:
+            self.endpoints[key] = EndpointStats()
+        return self.endpoints[key]
+
+    def _stream(self, stream: str) -> StreamStats:
+        if stream not in self.streams:
+            self.streams[stream] = StreamStats()
+        return self.streams[stream]
+
+    def observe_request(
+        self,
+        stream: str,
+        endpoint: str,
+        seconds: float | None,
+        status: int | str,
+    ) -> None:
+        """Add a response.
+
+        Args:
+            stream: The stream name.
+            endpoint: The endpoint template.
+            seconds: The time until the response headers arrived, if known.
+            status: The HTTP status code, or a description of the failure.
+        """
+        with self._lock:
+            stats = self._endpoint(stream, endpoint)
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            if seconds is not None:
+                stats.latency.observe(seconds)
+
+    def observe_retry(self, stream: str, endpoint: str) -> None:
+        """Count a retried request.
+
+        Args:
+            stream: The stream name.
+            endpoint: The endpoint template.
+        """
+        with self._lock:
+            self._endpoint(stream, endpoint).retries += 1
+
+    def observe_throttle_wait(self, stream: str, endpoint: str, seconds: float) -> None:
+        """Add a wait for the rate limiter.
+
+        Args:
+            stream: The stream name.
+            endpoint: The endpoint template.
+            seconds: The time waited.
+        """
+        with self._lock:
+            stats = self._endpoint(stream, endpoint)
+            stats.throttle_waits += 1
+            stats.throttle_wait_seconds += seconds
+
+    def observe_parse(
+        self,
+        stream: str,
+        endpoint: str,
+        seconds: float,
+        size: int,
+    ) -> None:
+        """Add a parsed response.
+
+        Args:
+            stream: The stream name.
+            endpoint: The endpoint template.
+            seconds: The time spent parsing, including reading a streamed body.
+            size: The bytes received for the body.
+        """
+        with self._lock:
+            stats = self._endpoint(stream, endpoint)
+            stats.parse_seconds += seconds
+            stats.bytes_received += size
+
+    def observe_post_process(self, stream: str, seconds: float, records: int) -> None:
+        """Add post-processed records.
+
+        Args:
+            stream: The stream name.
+            seconds: The time spent post-processing.
+            records: The number of records kept.
+        """
+        with self._lock:
+            stats = self._stream(stream)
+            stats.post_process_seconds += seconds
+            stats.records += records
+
+    def summary(self) -> dict[str, t.Any]:
+        """Return the metrics as a JSON-compatible dictionary."""
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                "run_seconds": elapsed,
+                "streams": {
+                    name: {
+                        "records": stats.records,
+                        "records_per_second": (
+                            stats.records / elapsed if elapsed else 0.0
+                        ),
+                        "post_process_seconds": stats.post_process_seconds,
+                    }
+                    for name, stats in sorted(self.streams.items())
+                },
+                "endpoints": [
+                    {
+                        "stream": stream,
+                        "endpoint": endpoint,
+                        "requests": dict(sorted(stats.statuses.items())),
+                        "latency": stats.latency.summary(),
+                        "bytes_received": stats.bytes_received,
+                        "retries": stats.retries,
+                        "throttle_waits": stats.throttle_waits,
+                        "throttle_wait_seconds": stats.throttle_wait_seconds,
+                        "parse_seconds": stats.parse_seconds,
+                    }
+                    for (stream, endpoint), stats in sorted(self.endpoints.items())
+                ],
+            }
+
+    def points(self) -> t.Iterator[metrics.Point]:
+        """Yield the summary as SDK metric points."""
+        summary = self.summary()
+        for name, stats in summary["streams"].items():
+            tags = {metrics.Tag.STREAM: name}
+            yield metrics.Point(
+                "timer",
+                PerformanceMetric.POST_PROCESS_DURATION,
+                stats["post_process_seconds"],
+                tags,
+            )
+            yield metrics.Point(
+                "gauge",
+                PerformanceMetric.RECORDS_PER_SECOND,
+                stats["records_per_second"],
+                tags,
+            )
+        for stats in summary["endpoints"]:
+            tags = {
+                metrics.Tag.STREAM: stats["stream"],
+                metrics.Tag.ENDPOINT: stats["endpoint"],
+            }
+            yield metrics.Point(
+                "histogram",
+                PerformanceMetric.HTTP_REQUEST_LATENCY,
+                stats["latency"],
+                {**tags, "requests": stats["requests"]},
+            )
+            yield metrics.Point(
+                "counter",
+                PerformanceMetric.HTTP_RESPONSE_BYTES,
+                stats["bytes_received"],
+                tags,
+            )
+            yield metrics.Point(
+                "counter",
+                PerformanceMetric.HTTP_RETRY_COUNT,
+                stats["retries"],
+                tags,
+            )
+            yield metrics.Point(
+                "timer",
+                PerformanceMetric.THROTTLE_WAIT,
+                stats["throttle_wait_seconds"],
+                {**tags, "waits": stats["throttle_waits"]},
+            )
+            yield metrics.Point(
+                "timer",
+                PerformanceMetric.PARSE_DURATION,
+                stats["parse_seconds"],
+                tags,
+            )
+
+    def to_prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            metric = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            return metric
+
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            endpoints = sorted(self.endpoints.items())
+            streams = sorted(self.streams.items())
+
+        metric = family("run_duration_seconds", "gauge", "Duration of the run.")
+        lines.append(f"{metric} {elapsed}")
+
+        metric = family(
+            "http_request_duration_seconds",
+            "histogram",
+            "Time until the response headers arrived.",
+        )
+        for (stream, endpoint), stats in endpoints:
+            labels = _labels(stream=stream, endpoint=endpoint)
+            for bound, count in stats.latency.cumulative_counts():
+                le = _labels(stream=stream, endpoint=endpoint, le=bound)
+                lines.append(f"{metric}_bucket{le} {count}")
+            lines.append(f"{metric}_sum{labels} {stats.latency.sum}")
+            lines.append(f"{metric}_count{labels} {stats.latency.count}")
+
+        metric = family("http_requests_total", "counter", "Responses by status.")
+        for (stream, endpoint), stats in endpoints:
+            for status, count in sorted(stats.statuses.items()):
+                labels = _labels(stream=stream, endpoint=endpoint, status=status)
+                lines.append(f"{metric}{labels} {count}")
+
+        counters = [
+            ("http_response_bytes_total", "Bytes received.", "bytes_received"),
+            ("http_retries_total", "Retried requests.", "retries"),
+            ("throttle_waits_total", "Waits for the rate limiter.", "throttle_waits"),
+            (
+                "throttle_wait_seconds_total",
+                "Time waited for the rate limiter.",
+                "throttle_wait_seconds",
+            ),
+            ("parse_seconds_total", "Time spent parsing responses.", "parse_seconds"),
+        ]
+        for name, help_text, attribute in counters:
+            metric = family(name, "counter", help_text)
+            for (stream, endpoint), stats in endpoints:
+                labels = _labels(stream=stream, endpoint=endpoint)
+                lines.append(f"{metric}{labels} {getattr(stats, attribute)}")
+
+        metric = family("records_total", "counter", "Records post-processed.")
+        for stream, stats in streams:
+            lines.append(f"{metric}{_labels(stream=stream)} {stats.records}")
+        metric = family(
+            "post_process_seconds_total",
+            "counter",
+            "Time spent post-processing records.",
+        )
+        for stream, stats in streams:
+            labels = _labels(stream=stream)
+            lines.append(f"{metric}{labels} {stats.post_process_seconds}")
+        return "\n".join(lines) + "\n"
+
+    def log(self) -> None:
+        """Log the summary as SDK metric lines."""
+        logger = metrics.get_metrics_logger()
+        for point in self.points():
+            metrics.log(logger, point)
+
+    def write(self, path: str | Path, metrics_format: str = "json") -> None:
+        """Write the metrics to a file, replacing it atomically.
+
+        Args:
+            path: The output file.
+            metrics_format: ``json`` or ``prometheus``.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if metrics_format == "prometheus":
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.summary(), indent=2)
+        # Textfile collectors may read the file at any time.
+        partial = path.with_name(f".{path.name}.{os.getpid()}")
+        partial.write_text(text)
+        partial.replace(path)
+
+
+def _labels(**labels: str) -> str:
+    """Return a Prometheus label set, with escaped values."""
+    escaped = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in labels.values()
+    )
+    pairs = (f'{key}="{value}"' for key, value in zip(labels, escaped))
+    return "{" + ",".join(pairs) + "}"
+
+
+_METRICS = PerformanceMetrics()
+
+
+def get_performance_metrics() -> PerformanceMetrics:
+    """Return the process-wide performance metrics, shared by all streams.
+
+    Returns:
+        The metrics of the current run.
+    """
+    return _METRICS
+
+
+def _bytes_received(response: requests.Response) -> int:
+    """Return the size of a response body as received, before decompression."""
+    tell = getattr(response.raw, "tell", None)
+    if tell is not None:
+        return tell()
+    return len(response.content or b"")
+
+
+# The per-thread state of the timed methods, see `InstrumentedMixin`.
+_timing = threading.local()
+
+
+def _timed_parse_response(
+    parse_response: t.Callable[..., t.Iterable[dict]],
+) -> t.Callable[..., t.Iterable[dict]]:
+    """Wrap a stream's ``parse_response`` to time it."""
+
+    @functools.wraps(parse_response)
+    def wrapper(
+        self: InstrumentedMixin,
+        response: requests.Response,
+    ) -> t.Iterable[dict]:
+        records = parse_response(self, response)
+        if getattr(_timing, "parsing", False):
+            # Called through super() by a timed parse_response.
+            return records
+        return self.parse_records(response, records)
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _timed_post_process(
+    post_process: t.Callable[..., dict | None],
+) -> t.Callable[..., dict | None]:
+    """Wrap a stream's ``post_process`` to time it."""
+
+    @functools.wraps(post_process)
+    def wrapper(
+        self: InstrumentedMixin,
+        row: dict,
+        context: Context | None = None,
+    ) -> dict | None:
+        if getattr(_timing, "post_processing", False):
+            # Called through super() by a timed post_process.
+            return post_process(self, row, context)
+        _timing.post_processing = True
+        started = time.perf_counter()
+        try:
+            row = post_process(self, row, context)
+        finally:
+            _timing.post_processing = False
+            totals = _post_process_totals(self.name)
+            totals[0] += time.perf_counter() - started
+        if row is not None:
+            totals[1] += 1
+        return row
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _post_process_totals(stream: str) -> list:
+    """Return this thread's unobserved post-processing seconds and records."""
+    if not hasattr(_timing, "post_process"):
+        _timing.post_process = {}
+    return _timing.post_process.setdefault(stream, [0.0, 0])
+
+
+class InstrumentedMixin:
+    """Measure where a REST stream spends its time.
+
+    Tracks, per endpoint template, the latency and status of responses, the
+    bytes received, retries, rate limiter waits and parse time, and per stream
+    the records kept and the time spent post-processing them.
+
+    Stream classes override ``parse_response`` and ``post_process`` without
+    calling ``super()``, so the methods each stream class resolves are wrapped
+    when the class is created, and time the outermost call. Post-processing is
+    added up per thread and observed once the records of a context were
+    returned by ``get_records``, or by `observe_post_process` for the mixins
+    post-processing records their own way. The mixin must come after the
+    mixins wrapping ``get_records`` in worker threads, e.g.
+    `ConcurrentFanOutMixin`, and before `RateLimitedMixin`, whose
+    ``throttle_waited`` hook it implements.
+    """
+
+    def __init_subclass__(cls, **kwargs: t.Any) -> None:
+        """Wrap the ``parse_response`` and ``post_process`` of a stream class.
+
+        Args:
+            kwargs: The class keyword arguments.
+        """
+        super().__init_subclass__(**kwargs)
+        for name, timed in (
+            ("parse_response", _timed_parse_response),
+            ("post_process", _timed_post_process),
+        ):
+            method = getattr(cls, name)
+            if not getattr(method, "instrumented", False):
+                setattr(cls, name, timed(method))
+
+    @property
+    def performance(self) -> PerformanceMetrics:
+        """Return the performance metrics of the run."""
+        return get_performance_metrics()
+
+    def parse_records(
+        self,
+        response: requests.Response,
+        records: t.Iterable[dict],
+    ) -> t.Iterator[dict]:
+        """Time how long the records parsed from a response take to come.
+
+        ``parse_response`` is timed this way; streams parsing responses with
+        another method can use it too.
+
+        Args:
+            response: The HTTP response.
+            records: The records parsed from the response.
+
+        Yields:
+            The parsed records.
+        """
+        records = iter(records)
+        elapsed = 0.0
+        try:
+            while True:
+                _timing.parsing = True
+                started = time.perf_counter()
+                try:
+                    record = next(records)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - started
+                    _timing.parsing = False
+                yield record
+        finally:
+            self.performance.observe_parse(
+                self.name,
+                self.path,
+                elapsed,
+                _bytes_received(response),
+            )
+
+    def observe_post_process(self) -> None:
+        """Add the records post-processed so far by this thread to the metrics."""
+        totals = _post_process_totals(self.name)
+        if totals[0] or totals[1]:
+            self.performance.observe_post_process(self.name, *totals)
+            totals[:] = [0.0, 0]
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Return the post-processed records, observing their processing time.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        try:
+            yield from super().get_records(context)
+        finally:
+            self.observe_post_process()
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Record the latency and status of a response, then validate it.
+
+        Args:
+            response: The HTTP response.
+        """
+        self.performance.observe_request(
+            self.name,
+            self.path,
+            response.elapsed.total_seconds(),
+            response.status_code,
+        )
+        super().validate_response(response)
+
+    def throttle_waited(self, seconds: float) -> None:
+        """Record a wait for the rate limiter.
+
+        Args:
+            seconds: The time waited.
+        """
+        self.performance.observe_throttle_wait(self.name, self.path, seconds)
+        super().throttle_waited(seconds)
+
+    def backoff_handler(self, details: t.Mapping[str, t.Any]) -> None:
+        """Count a retried request.
+
+        Args:
+            details: The backoff invocation details.
+        """
+        self.performance.observe_retry(self.name, self.path)
+        super().backoff_handler(details)
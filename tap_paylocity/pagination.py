@@ -0,0 +1,152 @@
+"""Concurrent fetching of page-numbered responses."""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import math
+import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from singer_sdk import metrics
+
+if t.TYPE_CHECKING:
+    import requests
+    from singer_sdk.helpers.types import Context
+
+#: The response header carrying the total number of records of a paged endpoint.
+TOTAL_COUNT_HEADER = "X-Pcty-Total-Count"
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 5000
+
+
+def get_total_count(response: requests.Response) -> int | None:
+    """Return the total number of records announced by a paged response.
+
+    Args:
+        response: The HTTP response of a page requested with
+            ``includetotalcount=true``.
+
+    Returns:
+        The total count, or ``None`` if the header is missing or invalid.
+    """
+    value = response.headers.get(TOTAL_COUNT_HEADER)
+    if value is None:
+        return None
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return None
+
+
+class ParallelPagesMixin:
+    """Fetch the pages of a page-numbered REST stream concurrently.
+
+    When ``parallel_pages`` is enabled, the first page is requested with
+    ``includetotalcount=true``. The total count tells how many pages follow, and
+    up to ``max_concurrency`` of them are then requested at a time, while the
+    records are still yielded in page order. Without a total count, the
+    remaining pages are requested one after another, as usual.
+    """
+
+    @property
+    def page_size(self) -> int:
+        """Return the number of records requested per page."""
+        return DEFAULT_PAGE_SIZE
+
+    @property
+    def parallel_pages(self) -> bool:
+        """Return whether pages are fetched concurrently."""
+        return False
+
+    def get_url_params(
+        self,
+        context: Context | None,
+        next_page_token: t.Any | None,  # noqa: ANN401
+    ) -> dict[str, t.Any]:
+        """Return the URL parameters, asking the first page for the total count.
+
+        Args:
+            context: The stream context.
+            next_page_token: The page number.
+
+        Returns:
+            A dictionary of URL query parameters.
+        """
+        params = super().get_url_params(context, next_page_token)
+        params["pagesize"] = self.page_size
+        if self.parallel_pages and not next_page_token:
+            params["includetotalcount"] = "true"
+        return params
+
+    def request_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Request records from all pages, fetching pages ahead when possible.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every record in the response, in page order.
+        """
+        if not self.parallel_pages:
+            yield from super().request_records(context)
+            return
+
+        decorated_request = self.request_decorator(self._request)
+
+        def fetch_page(
+            page: int,
+        ) -> tuple[requests.PreparedRequest, requests.Response, list[dict]]:
+            prepared_request = self.prepare_request(context, next_page_token=page)
+            response = decorated_request(prepared_request, context)
+            # Workers read the whole page, the main thread only yields it.
+            return prepared_request, response, list(self.parse_response(response))
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+
+            prepared_request = self.prepare_request(context, next_page_token=0)
+            response = decorated_request(prepared_request, context)
+            request_counter.increment()
+            self.update_sync_costs(prepared_request, response, context)
+
+            total_count = get_total_count(response)
+            if total_count is None:
+                self.logger.info(
+                    "No %s header, fetching %s pages sequentially",
+                    TOTAL_COUNT_HEADER,
+                    self.name,
+                )
+                pages: t.Iterable[int] = itertools.count(1)
+            else:
+                pages = range(1, math.ceil(total_count / self.page_size))
+
+            page_records = list(self.parse_response(response))
+            if not page_records:
+                return
+
+            executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix=f"{self.name}-pages",
+            )
+            pending: collections.deque[Future] = collections.deque()
+            remaining = iter(pages)
+            try:
+                # Sequential pages stop at the first empty one, so are not run ahead.
+                lookahead = self.max_concurrency if total_count is not None else 1
+                for page in itertools.islice(remaining, lookahead):
+                    pending.append(executor.submit(fetch_page, page))
+                yield from page_records
+
+                while pending:
+                    prepared_request, response, page_records = pending.popleft().result()
+                    request_counter.increment()
+                    self.update_sync_costs(prepared_request, response, context)
+                    if not page_records:
+                        break
+                    for page in itertools.islice(remaining, 1):
+                        pending.append(executor.submit(fetch_page, page))
+                    yield from page_records
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,287 @@
+"""Incremental JSON parsing of streamed API responses."""
+
+from __future__ import annotations
+
+import codecs
+import decimal
+import json
+import typing as t
+
+from singer_sdk.exceptions import ConfigValidationError
+
+if t.TYPE_CHECKING:
+    import requests
+    from singer_sdk.streams import Stream
+
+#: Number of bytes read from the network at a time.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _ChunkBuffer:
+    """The not yet parsed text of a stream of UTF-8 encoded chunks."""
+
+    def __init__(self, chunks: t.Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping the text parsed so far.
+
+        Returns:
+            ``False`` if the stream is exhausted.
+        """
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.text = self.text[self.pos :] + text
+                self.pos = 0
+                return True
+        if not self.eof:
+            self.eof = True
+            self.text += self._decoder.decode(b"", final=True)
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character.
+
+        Returns:
+            The next non-whitespace character, or ``""`` at the end of the stream.
+        """
+        while True:
+            text = self.text
+            pos = self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+
+def iter_json_array(
+    chunks: t.Iterable[bytes],
+    *,
+    parse_float: t.Callable[[str], t.Any] = decimal.Decimal,
+) -> t.Iterator[t.Any]:
+    """Yield the elements of a JSON array as its bytes arrive.
+
+    Only one element is held in memory at a time, besides the current chunk. A
+    document that is not an array is yielded as a single element once complete,
+    like ``extract_jsonpath("$[*]", ...)`` does.
+
+    Args:
+        chunks: The raw response body, in chunks of any size.
+        parse_float: The constructor of non-integer numbers.
+
+    Yields:
+        Each element of the array.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+    """
+    decoder = json.JSONDecoder(parse_float=parse_float)
+    buffer = _ChunkBuffer(chunks)
+
+    first = buffer.peek()
+    if not first:
+        return
+    if first != "[":
+        while buffer.fill():
+            pass
+        yield decoder.decode(buffer.text[buffer.pos :])
+        return
+    buffer.pos += 1
+
+    if buffer.peek() == "]":
+        buffer.pos += 1
+    else:
+        while True:
+            buffer.peek()
+            try:
+                value, end = decoder.raw_decode(buffer.text, buffer.pos)
+            except json.JSONDecodeError:
+                if buffer.fill():
+                    continue
+                raise
+            if end == len(buffer.text) and buffer.fill():
+                # A number or literal may continue in the next chunk.
+                continue
+            buffer.pos = end
+            yield value
+
+            delimiter = buffer.peek()
+            buffer.pos += 1
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                msg = "Expecting ',' delimiter"
+                raise json.JSONDecodeError(msg, buffer.text, buffer.pos - 1)
+
+    if buffer.peek():
+        msg = "Extra data"
+        raise json.JSONDecodeError(msg, buffer.text, buffer.pos)
+
+
+def money_fields(schema: dict) -> frozenset[str]:
+    """Return the names of the number properties of a JSON schema, at any depth.
+
+    Args:
+        schema: A stream schema.
+
+    Returns:
+        The property names whose type includes ``number``.
+    """
+    names: set[str] = set()
+    pending = [schema]
+    while pending:
+        node = pending.pop()
+        for name, prop in node.get("properties", {}).items():
+            types = prop.get("type", [])
+            if "number" in (types if isinstance(types, list) else [types]):
+                names.add(name)
+            pending.append(prop)
+        if isinstance(node.get("items"), dict):
+            pending.append(node["items"])
+    return frozenset(names)
+
+
+def decimalize(value: t.Any, fields: t.Container[str] | None = None) -> t.Any:  # noqa: ANN401
+    """Replace floats with Decimals in a decoded JSON value, in place.
+
+    Floats are converted through their shortest ``repr``, which is exact for the
+    values JSON encoders write with up to 15 significant digits, e.g. money.
+
+    Args:
+        value: A decoded JSON value.
+        fields: Only convert floats under these keys; ``None`` converts all.
+
+    Returns:
+        The value.
+    """
+    # Exact type checks: JSON decoders only create these types, and this is hot.
+    if type(value) is dict:
+        for key, item in value.items():
+            kind = type(item)
+            if kind is float:
+                if fields is None or key in fields:
+                    value[key] = decimal.Decimal(repr(item))
+            elif kind is dict or kind is list:
+                decimalize(item, fields)
+    elif type(value) is list:
+        for index, item in enumerate(value):
+            kind = type(item)
+            if kind is float:
+                if fields is None:
+                    value[index] = decimal.Decimal(repr(item))
+            elif kind is dict or kind is list:
+                decimalize(item, fields)
+    return value
+
+
+class RecordDecoder:
+    """Decode the records of JSON array responses.
+
+    The ``stdlib`` backend parses bodies incrementally, see `iter_json_array`.
+    The ``orjson`` backend parses whole bodies with the optional ``orjson``
+    package. It is fastest when few floats must be converted to Decimals.
+
+    The decimal policy chooses which numbers become `decimal.Decimal`: ``all``
+    non-integer numbers, only the ``schema`` number fields such as salaries and
+    earnings, or ``none``.
+    """
+
+    backends: t.ClassVar[tuple[str, ...]] = ("stdlib", "orjson")
+    decimal_policies: t.ClassVar[tuple[str, ...]] = ("all", "schema", "none")
+
+    def __init__(
+        self,
+        backend: str = "stdlib",
+        decimal_policy: str = "all",
+        fields: t.Iterable[str] = (),
+    ) -> None:
+        """Create a decoder.
+
+        Args:
+            backend: The JSON backend, ``stdlib`` or ``orjson``.
+            decimal_policy: Which numbers to parse as Decimal.
+            fields: The number fields converted by the ``schema`` policy.
+
+        Raises:
+            ConfigValidationError: If the backend or policy is unknown, or if
+                ``orjson`` is not installed.
+        """
+        if backend not in self.backends:
+            msg = f"Unknown json_backend {backend!r}"
+            raise ConfigValidationError(msg)
+        if decimal_policy not in self.decimal_policies:
+            msg = f"Unknown decimal_policy {decimal_policy!r}"
+            raise ConfigValidationError(msg)
+
+        self._loads: t.Callable[[bytes], t.Any] | None = None
+        if backend == "orjson":
+            try:
+                import orjson  # noqa: PLC0415
+            except ImportError as ex:
+                msg = "json_backend 'orjson' requires tap-paylocity[orjson]"
+                raise ConfigValidationError(msg) from ex
+            self._loads = orjson.loads
+
+        self.backend = backend
+        self.decimal_policy = decimal_policy
+        self.fields = frozenset(fields)
+
+    @classmethod
+    def create_for_stream(cls, stream: Stream) -> RecordDecoder:
+        """Instantiate a decoder from a stream's config and schema.
+
+        Args:
+            stream: The Singer stream instance.
+
+        Returns:
+            A new decoder.
+        """
+        return cls(
+            backend=stream.config.get("json_backend", "stdlib"),
+            decimal_policy=stream.config.get("decimal_policy", "all"),
+            fields=money_fields(stream.schema),
+        )
+
+    def decode(self, chunks: t.Iterable[bytes]) -> t.Iterator[t.Any]:
+        """Yield the elements of a JSON array body.
+
+        Args:
+            chunks: The raw body, in chunks of any size.
+
+        Returns:
+            An iterator of the array elements.
+        """
+        if self._loads is not None:
+            data = self._loads(b"".join(chunks))
+            records = data if isinstance(data, list) else [data]
+            if self.decimal_policy == "all":
+                return (decimalize(record) for record in records)
+        else:
+            records = iter_json_array(
+                chunks,
+                parse_float=decimal.Decimal if self.decimal_policy == "all" else float,
+            )
+        if self.decimal_policy == "schema" and self.fields:
+            return (decimalize(record, self.fields) for record in records)
+        return iter(records)
+
+    def iter_records(self, response: requests.Response) -> t.Iterator[t.Any]:
+        """Yield the elements of a JSON array response.
+
+        Args:
+            response: The HTTP response, ideally sent with ``stream=True``.
+
+        Returns:
+            An iterator of the array elements.
+        """
+        return self.decode(response.iter_content(chunk_size=CHUNK_SIZE))
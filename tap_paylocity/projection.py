@@ -0,0 +1,170 @@
+"""Compiled projections of nested API payloads onto flat stream records."""
+
+from __future__ import annotations
+
+import typing as t
+from functools import cached_property
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+    from singer_sdk.streams import Stream
+
+#: A dotted path into a payload, e.g. ``"primaryPayRate.baseRate"``.
+Path = t.Union[str, t.Sequence[str]]
+
+
+def _split(path: Path) -> tuple[str, ...]:
+    return tuple(path.split(".")) if isinstance(path, str) else tuple(path)
+
+
+def selected_properties(stream: Stream) -> frozenset[str] | None:
+    """Return the top-level properties of a stream selected in the catalog.
+
+    Args:
+        stream: The Singer stream instance.
+
+    Returns:
+        The names of the selected properties, or ``None`` if all are selected.
+    """
+    properties = stream.schema.get("properties", {})
+    selected = frozenset(
+        name for name in properties if stream.mask.get(("properties", name), True)
+    )
+    return None if len(selected) == len(properties) else selected
+
+
+class Projection:
+    """A mapping of payload paths to output columns, compiled to one function.
+
+    The function builds each record with a single dict display, looking every
+    nested object up once however many columns read from it. A missing or null
+    object on the path yields the column's default.
+
+    Example::
+
+        project = Projection({"baseRate": "primaryPayRate.baseRate"})
+        project({"primaryPayRate": {"baseRate": 20.0}})  # {"baseRate": 20.0}
+    """
+
+    def __init__(
+        self,
+        columns: t.Mapping[str, Path],
+        defaults: t.Mapping[str, t.Any] | None = None,
+        selected: t.Iterable[str] | None = None,
+    ) -> None:
+        """Compile a projection.
+
+        Args:
+            columns: The payload path of each output column.
+            defaults: The value of columns whose path is missing; ``None`` if
+                not given.
+            selected: Only output these columns; all by default.
+        """
+        defaults = defaults or {}
+        keep = None if selected is None else set(selected)
+        self.columns = {
+            column: _split(path)
+            for column, path in columns.items()
+            if keep is None or column in keep
+        }
+        self.defaults = {column: defaults.get(column) for column in self.columns}
+        self._project = self._compile()
+
+    def _compile(self) -> t.Callable[[dict], dict]:
+        """Generate the projection function."""
+        constants: dict[str, t.Any] = {}
+        objects: dict[tuple[str, ...], str] = {(): "record"}
+        lines: list[str] = []
+
+        def lookup(parent: tuple[str, ...]) -> str:
+            # Bind each nested object to a local, falling back to an empty dict.
+            if parent not in objects:
+                name = f"o{len(objects)}"
+                source = lookup(parent[:-1])
+                lines.append(f"    {name} = {source}.get({parent[-1]!r}) or EMPTY")
+                objects[parent] = name
+            return objects[parent]
+
+        items = []
+        for column, path in self.columns.items():
+            default = self.defaults[column]
+            if default is None:
+                default_source = ""
+            else:
+                constants[f"d{len(constants)}"] = default
+                default_source = f", d{len(constants) - 1}"
+            source = lookup(path[:-1])
+            items.append(f"        {column!r}: {source}.get({path[-1]!r}{default_source}),")
+
+        source = "\n".join(
+            ["def project(record):", *lines, "    return {", *items, "    }"],
+        )
+        namespace: dict[str, t.Any] = {"EMPTY": {}, **constants}
+        exec(compile(source, "<projection>", "exec"), namespace)  # noqa: S102
+        return namespace["project"]
+
+    def __call__(self, record: dict) -> dict:
+        """Project a payload.
+
+        Args:
+            record: A decoded API payload.
+
+        Returns:
+            The output record.
+        """
+        return self._project(record)
+
+
+class ProjectionMixin:
+    """Flatten a stream's payloads with a compiled `Projection`.
+
+    Streams declare the payload path of their columns in ``projection_columns``.
+    Only the columns selected in the catalog are extracted, and the rest of the
+    payload is dropped before the SDK validates the record. Schema properties
+    that are not projected, e.g. set from the context, are left to
+    ``post_process`` overrides.
+    """
+
+    #: The payload path of each output column.
+    projection_columns: t.ClassVar[dict[str, Path]] = {}
+
+    #: The values of columns whose path is missing from a payload.
+    projection_defaults: t.ClassVar[dict[str, t.Any]] = {}
+
+    @classmethod
+    def create_projection(cls, stream: Stream) -> Projection:
+        """Compile the projection of a stream's selected columns.
+
+        Args:
+            stream: The Singer stream instance.
+
+        Returns:
+            A new projection.
+        """
+        return Projection(
+            cls.projection_columns,
+            cls.projection_defaults,
+            selected_properties(stream),
+        )
+
+    @cached_property
+    def projection(self) -> Projection:
+        """Return the projection of this stream, compiled on first use."""
+        return self.create_projection(self)
+
+    def post_process(
+        self,
+        row: dict,
+        context: Context | None = None,
+    ) -> dict | None:
+        """Project a payload onto the selected columns.
+
+        Args:
+            row: An individual record from the stream.
+            context: The stream context.
+
+        Returns:
+            The projected record, or ``None`` to skip the record.
+        """
+        row = super().post_process(row, context)
+        return None if row is None else self.projection(row)
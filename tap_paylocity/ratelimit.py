@@ -0,0 +1,245 @@
+"""Process-wide, per-host adaptive rate limiting."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import typing as t
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from http import HTTPStatus
+from urllib.parse import urlparse
+
+import backoff
+
+if t.TYPE_CHECKING:
+    import requests
+    from singer_sdk.helpers.types import Context
+
+DEFAULT_REQUESTS_PER_SECOND = 20.0
+MIN_REQUESTS_PER_SECOND = 0.5
+
+
+def parse_retry_after(response: requests.Response) -> float | None:
+    """Return the number of seconds a ``Retry-After`` header asks to wait.
+
+    Args:
+        response: The HTTP response.
+
+    Returns:
+        The delay in seconds, or ``None`` if the header is missing or invalid.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """A thread-safe token bucket whose rate adapts to throttling feedback.
+
+    The rate is halved on every 429 response and grows back additively, by about
+    one request per second for every second of successful traffic, up to the
+    configured maximum.
+    """
+
+    #: Factor applied to the rate on a throttled response.
+    decrease_factor: float = 0.5
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        """Create a bucket.
+
+        Args:
+            rate: The maximum sustained number of requests per second.
+            burst: The bucket capacity; defaults to one second worth of requests.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(burst or rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.rate,
+        )
+        self._updated = now
+
+    def _take(self) -> float:
+        """Take one token if one is available.
+
+        Returns:
+            0 if a token was taken, else the seconds to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._blocked_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return max(
+                self._blocked_until - now,
+                (1 - self._tokens) / self.rate,
+            )
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while delay := self._take():
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    async def acquire_async(self) -> float:
+        """Take one token, yielding to the event loop until one is available.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while delay := self._take():
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    def on_success(self) -> None:
+        """Grow the rate after a request that was not throttled."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+    def on_throttled(self, retry_after: float | None) -> None:
+        """Slow down after a 429 response.
+
+        Args:
+            retry_after: The delay requested by the server, if any.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.rate * self.decrease_factor, MIN_REQUESTS_PER_SECOND)
+            self._tokens = 0.0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+
+_BUCKETS: dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_bucket(host: str, rate: float, burst: float | None = None) -> TokenBucket:
+    """Return the process-wide bucket of a host, creating it on first use.
+
+    Args:
+        host: The API host, e.g. ``api.paylocity.com``.
+        rate: The maximum requests per second, used if the bucket is created.
+        burst: The bucket capacity, used if the bucket is created.
+
+    Returns:
+        The bucket shared by every stream calling the host.
+    """
+    with _BUCKETS_LOCK:
+        if host not in _BUCKETS:
+            _BUCKETS[host] = TokenBucket(rate, burst)
+        return _BUCKETS[host]
+
+
+class RateLimitedMixin:
+    """Throttle a REST stream through the shared bucket of its API host."""
+
+    @cached_property
+    def rate_limiter(self) -> TokenBucket:
+        """Return the bucket shared by all streams calling this stream's host.
+
+        Returns:
+            The token bucket of the host.
+        """
+        return get_bucket(
+            urlparse(self.url_base).netloc,
+            rate=float(
+                self.config.get("rate_limit_requests_per_second")
+                or DEFAULT_REQUESTS_PER_SECOND,
+            ),
+            burst=self.config.get("rate_limit_burst"),
+        )
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        """Send a request once the host's bucket allows it.
+
+        Args:
+            prepared_request: The request to send.
+            context: The stream context.
+
+        Returns:
+            The HTTP response.
+        """
+        waited = self.rate_limiter.acquire()
+        if waited:
+            self.throttle_waited(waited)
+        return super()._request(prepared_request, context)
+
+    def throttle_waited(self, seconds: float) -> None:
+        """Handle a request having waited for the bucket, e.g. to measure it.
+
+        Args:
+            seconds: The time waited.
+        """
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Feed the response status back to the rate limiter, then validate it.
+
+        Args:
+            response: The HTTP response.
+        """
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            retry_after = parse_retry_after(response)
+            self.logger.info(
+                "Throttled by %s, retrying after %s seconds",
+                urlparse(response.url).netloc,
+                retry_after,
+            )
+            self.rate_limiter.on_throttled(retry_after)
+        elif response.ok:
+            self.rate_limiter.on_success()
+        super().validate_response(response)
+
+    def backoff_wait_generator(self) -> t.Generator[float, t.Any, None]:
+        """Back off exponentially, except on 429s where the limiter already waits.
+
+        Yields:
+            The number of seconds to wait before the next attempt.
+        """
+        expo = backoff.expo(factor=2)
+        next(expo)
+        exception = yield  # type: ignore[misc]
+        while True:
+            response = getattr(exception, "response", None)
+            if (
+                response is not None
+                and response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+            ):
+                exception = yield 0
+            else:
+                exception = yield next(expo)
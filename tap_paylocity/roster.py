@@ -0,0 +1,182 @@
+"""Snapshots of company rosters, reused by syncs of child streams only."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import typing as t
+from functools import cached_property
+
+import requests
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+
+from tap_paylocity.storage import SQLiteStore, get_store
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+
+DEFAULT_ROSTER_SNAPSHOT_TTL_MINUTES = 60
+
+
+class RosterSnapshots(SQLiteStore):
+    """A SQLite file of the last roster fetched for each company."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS rosters (
+            company_id TEXT PRIMARY KEY,
+            fetched_at REAL NOT NULL,
+            employees TEXT NOT NULL
+        );
+    """
+
+    def get(self, company_id: str) -> tuple[list[dict], float] | None:
+        """Return the roster snapshot of a company.
+
+        Args:
+            company_id: The company ID.
+
+        Returns:
+            The roster records and the timestamp they were fetched at, or
+            ``None`` if the company has no snapshot.
+        """
+        rows = self.execute(
+            "SELECT employees, fetched_at FROM rosters WHERE company_id = ?",
+            (company_id,),
+        )
+        if not rows:
+            return None
+        employees, fetched_at = rows[0]
+        return json.loads(employees), fetched_at
+
+    def put(
+        self,
+        company_id: str,
+        employees: list[dict],
+        fetched_at: float | None = None,
+    ) -> None:
+        """Store the roster of a company.
+
+        Args:
+            company_id: The company ID.
+            employees: The roster records, in API order.
+            fetched_at: When the roster was fetched; now by default.
+        """
+        self.execute(
+            "INSERT OR REPLACE INTO rosters VALUES (?, ?, ?)",
+            (
+                company_id,
+                time.time() if fetched_at is None else fetched_at,
+                json.dumps(employees, default=str),
+            ),
+        )
+
+
+def get_roster_snapshots(config: t.Mapping[str, t.Any]) -> RosterSnapshots | None:
+    """Return the configured store of roster snapshots.
+
+    Args:
+        config: The tap config.
+
+    Returns:
+        The store, or ``None`` if the ``roster_snapshot_path`` setting is not set.
+    """
+    path = config.get("roster_snapshot_path")
+    return get_store(RosterSnapshots, path) if path else None
+
+
+class RosterSnapshotMixin:
+    """Create child contexts from a roster snapshot instead of paging the API.
+
+    With the ``roster_snapshot_path`` setting, every roster fetched is saved.
+    While the roster stream itself is not selected, e.g. in frequent syncs of
+    ``punch_details`` alone, a snapshot younger than ``roster_snapshot_ttl_minutes``
+    replaces the roster requests. Once it is past half its lifetime, it is still
+    used but refreshed in the background meanwhile, so the next sync finds a
+    fresh one.
+    """
+
+    @cached_property
+    def roster_snapshots(self) -> RosterSnapshots | None:
+        """Return the configured store of roster snapshots."""
+        return get_roster_snapshots(self.config)
+
+    @property
+    def roster_snapshot_ttl(self) -> float:
+        """Return the age in seconds after which a snapshot is not used."""
+        return 60 * float(
+            self.config.get(
+                "roster_snapshot_ttl_minutes",
+                DEFAULT_ROSTER_SNAPSHOT_TTL_MINUTES,
+            ),
+        )
+
+    def request_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Return the roster of a company, from its snapshot if possible.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every roster record.
+        """
+        if self.roster_snapshots is None:
+            yield from super().request_records(context)
+            return
+
+        # Records written downstream are always fetched fresh.
+        snapshot = None
+        if not self.selected:
+            snapshot = self.roster_snapshots.get(context["companyId"])
+        age = None if snapshot is None else time.time() - snapshot[1]
+        if snapshot is None or age >= self.roster_snapshot_ttl:
+            yield from self._fetch_roster(context)
+            return
+
+        employees, _ = snapshot
+        self.logger.info(
+            "Using the %d minutes old roster snapshot of company %s",
+            age // 60,
+            context["companyId"],
+        )
+        refresh = None
+        if age >= self.roster_snapshot_ttl / 2:
+            refresh = threading.Thread(
+                target=self._refresh_roster,
+                args=(context,),
+                name=f"{self.name}-snapshot",
+                daemon=True,
+            )
+            refresh.start()
+        try:
+            yield from employees
+        finally:
+            # The refresh overlaps the child streams' sync, and ends with it.
+            if refresh is not None:
+                refresh.join()
+
+    def _fetch_roster(self, context: Context) -> t.Iterator[dict]:
+        """Request the roster, then save its snapshot once it is complete."""
+        employees = []
+        for record in super().request_records(context):
+            employees.append(record)
+            yield record
+        self.roster_snapshots.put(context["companyId"], employees)
+
+    def _refresh_roster(self, context: Context) -> None:
+        # The current snapshot stays in use if this fails.
+        try:
+            for _ in self._fetch_roster(context):
+                pass
+        except (
+            FatalAPIError,
+            RetriableAPIError,
+            RuntimeError,
+            requests.RequestException,
+            sqlite3.Error,
+            ValueError,
+            KeyError,
+        ):
+            # API, authentication, snapshot file or malformed response errors.
+            self.logger.warning("Background roster refresh failed", exc_info=True)
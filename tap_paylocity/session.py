@@ -0,0 +1,129 @@
+"""HTTP sessions sharing per-host connection pools."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import typing as t
+from functools import cached_property
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 300.0
+
+_ADAPTERS: dict[int, HTTPAdapter] = {}
+_ADAPTERS_LOCK = threading.Lock()
+
+
+def get_adapter(pool_size: int) -> HTTPAdapter:
+    """Return the process-wide transport adapter for a pool size.
+
+    Every session mounting the adapter shares its connection pools, so that
+    streams reuse each other's kept-alive connections, one pool per host.
+
+    Args:
+        pool_size: The maximum number of connections kept per host.
+
+    Returns:
+        The shared adapter.
+    """
+    with _ADAPTERS_LOCK:
+        if pool_size not in _ADAPTERS:
+            _ADAPTERS[pool_size] = HTTPAdapter(
+                pool_connections=DEFAULT_POOL_SIZE,
+                pool_maxsize=pool_size,
+            )
+        return _ADAPTERS[pool_size]
+
+
+def release_connection(response: requests.Response) -> None:
+    """Return the connection of a response whose records are not parsed to its pool.
+
+    Streamed bodies keep their connection checked out until they are read, so
+    error and tolerated responses are read to the end, then closed.
+
+    Args:
+        response: A response whose body was not read yet.
+    """
+    with contextlib.suppress(requests.exceptions.RequestException):
+        response.content  # noqa: B018
+    response.close()
+
+
+class SharedSessionMixin:
+    """Send a REST stream's requests through the shared connection pools.
+
+    Each stream keeps its own `requests.Session`, since the SDK sets the
+    stream's authenticator on it, but the sessions share their transport
+    adapter. Response bodies are streamed and, unless ``http_compression`` is
+    disabled, compressed with the encodings ``requests`` can decode as they
+    arrive. Error responses are read before they are raised, so that their
+    connection is reused.
+    """
+
+    @property
+    def http_pool_size(self) -> int:
+        """Return the number of connections kept per host.
+
+        Returns:
+            The configured size, or enough for the configured concurrency.
+        """
+        pool_size = self.config.get("http_pool_size")
+        if pool_size:
+            return int(pool_size)
+        # Workers, pipelines and page fetches of several streams run at once.
+        return max(DEFAULT_POOL_SIZE, 4 * self.max_concurrency)
+
+    @cached_property
+    def requests_session(self) -> requests.Session:
+        """Return the session, set to stream response bodies.
+
+        Returns:
+            The :class:`requests.Session` object for HTTP requests.
+        """
+        session = super().requests_session
+        adapter = get_adapter(self.http_pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Accept-Encoding"] = (
+            DEFAULT_ACCEPT_ENCODING
+            if self.config.get("http_compression", True)
+            else "identity"
+        )
+        # Records are parsed as the body arrives, see `parse_response`.
+        session.stream = True
+        return session
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """Return the connect and read timeouts of this stream's host.
+
+        Returns:
+            The timeouts in seconds, for `requests.Session.send`.
+        """
+        host = urlparse(self.url_base).netloc
+        read_timeouts: t.Mapping[str, float] = self.config.get("http_timeouts") or {}
+        return (
+            float(self.config.get("http_connect_timeout", DEFAULT_CONNECT_TIMEOUT)),
+            float(
+                read_timeouts.get(
+                    host,
+                    self.config.get("http_read_timeout", DEFAULT_READ_TIMEOUT),
+                ),
+            ),
+        )
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Release the connection of an error response, then validate it.
+
+        Args:
+            response: The HTTP response.
+        """
+        if not response:
+            release_connection(response)
+        super().validate_response(response)
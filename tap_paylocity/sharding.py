@@ -0,0 +1,151 @@
+"""Sharding of the employee roster across tap instances, and merging their states."""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import sys
+import typing as t
+import zlib
+from functools import cached_property
+from pathlib import Path
+
+from singer_sdk.exceptions import ConfigValidationError
+
+from tap_paylocity.checkpoint import CHECKPOINT_STATE_KEY
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """Return the shard of a key, the same in every process and on every node.
+
+    Args:
+        key: The sharding key, e.g. an employee ID.
+        shard_count: The number of shards.
+
+    Returns:
+        The shard index, between 0 and ``shard_count - 1``.
+    """
+    return zlib.crc32(key.encode()) % shard_count
+
+
+class ShardedMixin:
+    """Keep only the records of the employees in this tap instance's shard.
+
+    With the ``shard_index`` and ``shard_count`` settings, several tap instances
+    split the employees between them by a hash of their ID. Applied to the
+    roster, this also splits the child contexts, so each instance syncs the
+    child streams of its own employees, with its own state.
+    """
+
+    #: The record field whose hash assigns records to shards.
+    shard_key = "employeeId"
+
+    @cached_property
+    def shard(self) -> tuple[int, int]:
+        """Return the index of this instance's shard and the number of shards.
+
+        Raises:
+            ConfigValidationError: If the shard index is out of range.
+        """
+        index = int(self.config.get("shard_index", 0))
+        count = int(self.config.get("shard_count", 1))
+        if count < 1 or not 0 <= index < count:
+            msg = f"shard_index {index} is not between 0 and shard_count - 1"
+            raise ConfigValidationError(msg)
+        return index, count
+
+    def post_process(
+        self,
+        row: dict,
+        context: Context | None = None,
+    ) -> dict | None:
+        """Skip the records of employees in other shards.
+
+        Args:
+            row: An individual record from the stream.
+            context: The stream context.
+
+        Returns:
+            The record, or ``None`` to skip it.
+        """
+        row = super().post_process(row, context)
+        return row if row is not None and self.in_shard(row) else None
+
+    def in_shard(self, record: t.Mapping[str, t.Any]) -> bool:
+        """Return whether a record belongs to this instance's shard.
+
+        Args:
+            record: A record, or a child context, with the shard key.
+
+        Returns:
+            ``True`` if the record is synced by this instance.
+        """
+        index, count = self.shard
+        return count == 1 or shard_of(str(record[self.shard_key]), count) == index
+
+
+def _merge_values(target: dict, values: dict) -> None:
+    """Merge the bookmark values of one partition synced by several shards."""
+    for key, value in values.items():
+        if target.get(key) is None:
+            target[key] = copy.deepcopy(value)
+        elif key == "replication_key_value" and value is not None:
+            # A shard that stopped early must not skip anything on the next run.
+            target[key] = min(target[key], value)
+        elif key == CHECKPOINT_STATE_KEY:
+            target[key] = sorted({*target[key], *value})
+
+
+def merge_states(states: t.Iterable[dict]) -> dict:
+    """Merge the states of the shards of a sync into one state.
+
+    Child stream partitions are disjoint between shards and are kept as they
+    are. Partitions synced by several shards, e.g. the roster of a company,
+    keep the earliest replication key value and the union of their completed
+    child contexts.
+
+    Args:
+        states: The final states of the shards.
+
+    Returns:
+        A state from which any number of shards can resume.
+    """
+    bookmarks: dict[str, dict] = {}
+    for state in states:
+        for stream, bookmark in state.get("bookmarks", {}).items():
+            target = bookmarks.setdefault(stream, {})
+            partitions = {
+                json.dumps(partition["context"], sort_keys=True): partition
+                for partition in target.get("partitions", [])
+            }
+            for partition in bookmark.get("partitions", []):
+                key = json.dumps(partition["context"], sort_keys=True)
+                if key in partitions:
+                    _merge_values(partitions[key], partition)
+                else:
+                    partitions[key] = copy.deepcopy(partition)
+            if partitions:
+                target["partitions"] = list(partitions.values())
+            _merge_values(
+                target,
+                {key: value for key, value in bookmark.items() if key != "partitions"},
+            )
+    return {"bookmarks": bookmarks}
+
+
+def main() -> None:
+    """Merge shard state files and print the merged state."""
+    parser = argparse.ArgumentParser(description=merge_states.__doc__.splitlines()[0])
+    parser.add_argument("states", nargs="+", type=Path, help="Shard state files.")
+    args = parser.parse_args()
+    states = [json.loads(path.read_text()) for path in args.states]
+    json.dump(merge_states(states), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""SQLite files persisted between syncs."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import typing as t
+from pathlib import Path
+
+_T = t.TypeVar("_T", bound="SQLiteStore")
+
+
+class SQLiteStore:
+    """A SQLite file shared by the threads of a sync.
+
+    Subclasses declare their tables in ``schema``. The file is opened in WAL
+    mode, so that several tap processes may use it at once.
+    """
+
+    #: The statements creating the tables of the store, run on open.
+    schema: t.ClassVar[str] = ""
+
+    #: Whether the file is readable by its owner only, for stores of secrets or
+    #: personal data.
+    private: t.ClassVar[bool] = False
+
+    def __init__(self, path: str | Path) -> None:
+        """Open a store file, creating it if needed.
+
+        Args:
+            path: The SQLite file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.private:
+            # SQLite creates the journal files with the permissions of the database.
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+            self.path.chmod(0o600)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(self.schema)
+
+    def execute(self, sql: str, parameters: t.Sequence = ()) -> list[tuple]:
+        """Run a statement.
+
+        Args:
+            sql: The SQL statement.
+            parameters: The statement parameters.
+
+        Returns:
+            The rows returned by the statement.
+        """
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def executemany(self, sql: str, parameters: t.Iterable[t.Sequence]) -> None:
+        """Run a statement for each set of parameters, in one transaction.
+
+        Args:
+            sql: The SQL statement.
+            parameters: The parameters of each execution.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(sql, parameters)
+
+
+_STORES: dict[tuple[type, Path], SQLiteStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(cls: type[_T], path: str | Path, **kwargs: t.Any) -> _T:
+    """Return the process-wide store of a file, opening it on first use.
+
+    Args:
+        cls: The store class.
+        path: The SQLite file.
+        kwargs: Store options, used if the store is opened.
+
+    Returns:
+        The store shared by every stream using the file.
+    """
+    key = (cls, Path(path).resolve())
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = cls(key[1], **kwargs)
+        return t.cast("_T", _STORES[key])
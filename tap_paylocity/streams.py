@@ -2,37 +2,92 @@
 
 from __future__ import annotations
 
+import asyncio
 import typing as t
 import requests
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
+from functools import cached_property
 from importlib import resources
 
+from singer_sdk import metrics
 from singer_sdk import typing as th  # JSON Schema typing helpers
+from singer_sdk.exceptions import FatalAPIError
 from singer_sdk.pagination import BasePageNumberPaginator
 
-from tap_paylocity.client import PaylocityStream, PaylocityNextGenStream
+from tap_paylocity.changes import ChangeDataMixin
+from tap_paylocity.client import (
+    PaylocityNextGenStream,
+    PaylocityStream,
+    get_company_ids,
+)
+from tap_paylocity.frozen import (
+    DEFAULT_TERMINATED_GRACE_DAYS,
+    TERMINATED_STATUS,
+    FrozenEmployees,
+    get_frozen_employees,
+)
+from tap_paylocity.httpcache import HTTPCacheMixin
+from tap_paylocity.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ParallelPagesMixin
+from tap_paylocity.parsing import CHUNK_SIZE
+from tap_paylocity.projection import ProjectionMixin, selected_properties
+from tap_paylocity.roster import RosterSnapshotMixin
+from tap_paylocity.session import release_connection
+from tap_paylocity.sharding import ShardedMixin
 
 # TODO: Delete this is if not using json files for schema definition
 SCHEMAS_DIR = resources.files(__package__) / "schemas"
 
+# Punch windows are not split below this length.
+MIN_PUNCH_WINDOW = timedelta(hours=1)
 
-class EmployeesStream(PaylocityStream):
+
+class _PunchWindowTooLargeError(Exception):
+    """Raised when a punch window must be split before it can be fetched."""
+
+
+class EmployeesStream(
+    ShardedMixin,
+    RosterSnapshotMixin,
+    ParallelPagesMixin,
+    PaylocityStream,
+):
     """Stream for retrieving all employees from Paylocity."""
 
     name = "employees"
     path = "/v2/companies/{companyId}/employees"
-    primary_keys: t.ClassVar[list[str]] = ["employeeId"]
+    primary_keys: t.ClassVar[list[str]] = ["companyId", "employeeId"]
     replication_key = None  # Set to the appropriate field if incremental sync is supported
+    # Child syncs are checkpointed per employee.
+    checkpoint_key = "employeeId"
 
     schema = th.PropertiesList(
+        th.Property("companyId", th.StringType, description="Unique identifier for the company."),
         th.Property("employeeId", th.StringType, description="Unique identifier for the employee."),
         th.Property("statusCode", th.StringType, description="Code for an employees current status"),
         th.Property("statusTypeCode", th.StringType, description="")
         # Add additional properties as per the API response
     ).to_dict()
 
+    @property
+    def partitions(self) -> list[dict]:
+        """Return one partition per configured company."""
+        return [{"companyId": company_id} for company_id in get_company_ids(self.config)]
+
+    @property
+    def page_size(self) -> int:
+        """Return the number of employees requested per page."""
+        page_size = self.config.get("employees_page_size", DEFAULT_PAGE_SIZE)
+        return min(max(page_size, 1), MAX_PAGE_SIZE)
+
+    @property
+    def parallel_pages(self) -> bool:
+        """Return whether roster pages are fetched concurrently."""
+        return self.config.get("employees_parallel_pages", False)
+
     def get_new_paginator(self):
         return BasePageNumberPaginator(start_value=0)
 
@@ -52,7 +107,7 @@ class EmployeesStream(PaylocityStream):
         """
         params = super().get_url_params(context, next_page_token)
 
-        params["companyId"] = self.config.get("company_id")
+        params["companyId"] = context["companyId"]
 
         if next_page_token:
             params["pagenumber"] = next_page_token
@@ -75,23 +130,93 @@ class EmployeesStream(PaylocityStream):
             A context object for child streams.
         """
         return {
+            "companyId": context["companyId"],
             "employeeId": record["employeeId"],
             "statusCode": record["statusCode"],
         }
 
+    @cached_property
+    def frozen_employees(self) -> FrozenEmployees | None:
+        """Return the store of employees whose child streams are skipped."""
+        return get_frozen_employees(self.config)
+
+    def include_child_context(self, child_context: dict) -> bool:
+        """Skip employees by roster status, and those whose data is frozen.
+
+        Args:
+            child_context: A child context generated by this stream.
+
+        Returns:
+            ``True`` to sync the child streams for the employee.
+        """
+        status_codes = self.config.get("child_stream_status_codes")
+        if status_codes and child_context["statusCode"] not in status_codes:
+            return False
+        if self.frozen_employees is not None and self.frozen_employees.is_frozen(
+            child_context["companyId"],
+            child_context["employeeId"],
+            child_context["statusCode"],
+        ):
+            return False
+        return super().include_child_context(child_context)
+
+    def child_context_completed(self, child_context: dict, context: dict | None) -> None:
+        """Remember whether an employee is frozen once their child streams synced.
+
+        Args:
+            child_context: The completed child context.
+            context: The stream sync context.
+        """
+        super().child_context_completed(child_context, context)
+        if self.frozen_employees is not None:
+            self.frozen_employees.complete(
+                child_context["companyId"],
+                child_context["employeeId"],
+            )
 
-class EmployeeDetailsStream(PaylocityStream):
+    def get_records(self, context: dict | None) -> t.Iterable[dict]:
+        """Return the roster, then report it to the change-data child streams.
+
+        Args:
+            context: The stream sync context.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        children = [
+            child for child in self.child_streams
+            if isinstance(child, ChangeDataMixin) and child.selected
+        ]
+        child_contexts = []
+        for record in super().get_records(context):
+            if children:
+                child_contexts.append(self.get_child_context(record, context))
+            yield record
+        # The roster is complete: its employees' child streams were all synced.
+        for child in children:
+            child.parent_partition_synced(context, child_contexts, self.in_shard)
+
+
+class EmployeeDetailsStream(
+    ChangeDataMixin,
+    ProjectionMixin,
+    HTTPCacheMixin,
+    PaylocityStream,
+):
     """Stream for retrieving employee details from Paylocity."""
 
     name = "employee_details"
     path = "/v2/companies/{companyId}/employees/{employeeId}"
-    primary_keys: t.ClassVar[list[str]] = ["employeeId"]
+    primary_keys: t.ClassVar[list[str]] = ["companyId", "employeeId"]
     replication_key = None
     ignore_parent_replication_keys = True
+    # Full-table child: one stream-level state instead of a partition per employee.
+    state_partitioning_keys: t.ClassVar[list[str]] = []
 
     parent_stream_type = EmployeesStream
 
     schema = th.PropertiesList(
+        th.Property("companyId", th.StringType, description="Unique identifier for the company."),
         th.Property("employeeId", th.StringType, description="Unique identifier fror the employee."),
         th.Property("firstName", th.StringType, description="Employee's first name."),
         th.Property("lastName", th.StringType, description="Employee's last name."),
@@ -107,6 +232,28 @@ class EmployeeDetailsStream(PaylocityStream):
         th.Property("hireDate", th.DateTimeType, description="Date employee was hired."),
     ).to_dict()
 
+    projection_columns: t.ClassVar[dict[str, str]] = {
+        "employeeId": "employeeId",
+        "firstName": "firstName",
+        "lastName": "lastName",
+        "employeeStatus": "status.employeeStatus",
+        "hireDate": "status.hireDate",
+        "payType": "primaryPayRate.payType",
+        "annualSalary": "primaryPayRate.annualSalary",
+        "baseRate": "primaryPayRate.baseRate",
+        "ratePer": "primaryPayRate.ratePer",
+        "payFrequency": "primaryPayRate.payFrequency",
+        "jobTitle": "departmentPosition.jobTitle",
+        "positionCode": "departmentPosition.positionCode",
+        "supervisorEmployeeId": "departmentPosition.supervisorEmployeeId",
+    }
+    projection_defaults: t.ClassVar[dict[str, str]] = {
+        "payFrequency": "",
+        "jobTitle": "",
+        "positionCode": "",
+        "supervisorEmployeeId": "",
+    }
+
     def get_url_params(
         self,
         context: dict | None,
@@ -123,7 +270,7 @@ class EmployeeDetailsStream(PaylocityStream):
         """
         params = super().get_url_params(context, next_page_token)
 
-        params["companyId"] = self.config.get("company_id")
+        params["companyId"] = context["companyId"]
         params["employeeId"] = context["employeeId"]
 
         return params
@@ -143,36 +290,59 @@ class EmployeeDetailsStream(PaylocityStream):
             The processed row.
 
         """
+        if self.frozen_employees is not None:
+            self.frozen_employees.observe(
+                context["companyId"],
+                context["employeeId"],
+                TERMINATED_STATUS if self.is_frozen(row) else None,
+            )
+
         new_row = super().post_process(row, context)
         if new_row:
-
-            new_row["employeeStatus"] = new_row.get("status", {}).get("employeeStatus")
-            new_row["payType"] = new_row.get("primaryPayRate", {}).get("payTyp")
-            new_row["annualSalary"] = new_row.get("primaryPayRate", {}).get("annualSalary")
-            new_row["baseRate"] = new_row.get("primaryPayRate", {}).get("baseRate")
-            new_row["ratePer"] = new_row.get("primaryPayRate", {}).get("ratePer")
-            new_row["payFrequency"] = new_row.get("primaryPayRate", {}).get("payFrequency", "")
-            
-            new_row["jobTitle"] = new_row.get("departmentPosition", {}).get("jobTitle", "")
-            new_row["positionCode"] = new_row.get("departmentPosition", {}).get("positionCode", "")
-            new_row["supervisorEmployeeId"] = new_row.get("departmentPosition", {}).get("supervisorEmployeeId", "")
-            new_row["hireDate"] = new_row.get("status", {}).get("hireDate")
+            new_row["companyId"] = context["companyId"]
 
         return new_row
 
+    @cached_property
+    def frozen_employees(self) -> FrozenEmployees | None:
+        """Return the store of employees whose child streams are skipped."""
+        return get_frozen_employees(self.config)
+
+    def is_frozen(self, row: dict) -> bool:
+        """Return whether an employee was terminated before the grace period.
+
+        Args:
+            row: An employee details record.
+
+        Returns:
+            ``True`` if the employee's data is not expected to change anymore.
+        """
+        status = row.get("status") or {}
+        termination_date = status.get("terminationDate")
+        if status.get("employeeStatus") != TERMINATED_STATUS or not termination_date:
+            return False
+        # Naive dates are taken as UTC.
+        terminated = self._parse_datetime(termination_date)
+        grace_days = self.config.get("terminated_grace_days", DEFAULT_TERMINATED_GRACE_DAYS)
+        return datetime.now(timezone.utc) - terminated > timedelta(days=grace_days)
+
 
 class PunchDetails(PaylocityNextGenStream):
     """Stream for getting an Employee's PunchDetails."""
 
     name = "punch_details"
-    path = "/apiHub/time/v1/companies/149471/employees/{employeeId}/punchDetails"
-    primary_keys: t.ClassVar[list[str]] = ["employeeId", "relativeEnd"]
-    # replication_key = "relativeEnd"
+    path = "/apiHub/time/v1/companies/{companyId}/employees/{employeeId}/punchDetails"
+    primary_keys: t.ClassVar[list[str]] = ["companyId", "employeeId", "relativeEnd"]
+    replication_key = "relativeEnd"
+    is_sorted = False
     ignore_parent_replication_keys = True
+    # One relativeEnd bookmark per employee.
+    state_partitioning_keys: t.ClassVar[list[str]] = ["companyId", "employeeId"]
 
     parent_stream_type = EmployeesStream
 
     schema = th.PropertiesList(
+        th.Property("companyId", th.StringType, description="Unique identifier for the company."),
         th.Property("employeeId", th.StringType, description="Unique identifier for the employee."),
         th.Property("badgeNumber", th.IntegerType, description="Badge number of the employee."),
         th.Property("relativeStart", th.DateTimeType, description="Start time for the worked shift."),
@@ -196,12 +366,17 @@ class PunchDetails(PaylocityNextGenStream):
         params = super().get_url_params(context, next_page_token)
 
         # Add fixed parameters
-        params["companyId"] = self.config.get("company_id")
-        params["employeeId"] = context["employeeId"]
-
-        # Handle date ranges dynamically
-        relative_start = self.config.get("start_date")
-        relative_end = self.config.get("end_date") or datetime.now().isoformat()
+        params["companyId"] = context["companyId"]
+        params["employeeId"] = context.get("employeeId")
+
+        # Handle date ranges dynamically; request_records sets one window per call
+        if "relativeEnd" in context:
+            relative_start = context["relativeStart"]
+            relative_end = context["relativeEnd"]
+        else:
+            start = self.get_relative_start(context)
+            relative_start = start.isoformat() if start else None
+            relative_end = self.get_relative_end().isoformat()
 
         # Convert to ISO format for the API
         params["relativeStart"] = relative_start
@@ -209,21 +384,424 @@ class PunchDetails(PaylocityNextGenStream):
 
         return params
 
+    def get_relative_start(self, context: dict | None) -> datetime | None:
+        """Return the start of the punch range for an employee.
+
+        Resumes from the employee's ``relativeEnd`` bookmark, moved back by the
+        ``punch_lookback_hours`` setting to pick up punches edited after they were
+        last synced, but never earlier than ``start_date``.
+
+        Args:
+            context: Stream sync context.
+
+        Returns:
+            The range start, or None to let the API decide.
+        """
+        start = self.get_starting_timestamp(context)
+        if start is None:
+            return None
+
+        if self.get_context_state(context).get("replication_key_value"):
+            start -= timedelta(hours=self.config.get("punch_lookback_hours", 24))
+            start_date = self.config.get("start_date")
+            if start_date:
+                start = max(start, self._parse_datetime(start_date))
+
+        # Punch times are relative to the company's time zone.
+        return start.replace(tzinfo=None)
+
+    def get_relative_end(self) -> datetime:
+        """Return the end of the punch range.
+
+        Returns:
+            The ``end_date`` setting, or the current time.
+        """
+        end_date = self.config.get("end_date")
+        if end_date:
+            return self._parse_datetime(end_date).replace(tzinfo=None)
+        return datetime.now()
+
+    def get_punch_windows(
+        self,
+        context: dict | None,
+    ) -> list[tuple[datetime | None, datetime]]:
+        """Split the punch range of an employee into windows.
+
+        Args:
+            context: Stream sync context.
+
+        Returns:
+            The ``(relativeStart, relativeEnd)`` windows, in order.
+        """
+        start = self.get_relative_start(context)
+        end = self.get_relative_end()
+        window_days = self.config.get("punch_window_days")
+        if start is None or not window_days:
+            return [(start, end)]
+
+        windows = []
+        step = timedelta(days=window_days)
+        while start < end:
+            windows.append((start, min(start + step, end)))
+            start += step
+        return windows
+
+    def request_records(self, context: dict | None) -> t.Iterable[dict]:
+        """Request the punches of an employee, one date window at a time.
+
+        Windows are fetched in parallel on `window_executor` when
+        ``max_concurrency`` allows it, and yielded as each completes in order. A
+        window that times out or returns more than ``punch_max_response_bytes`` is
+        split in half and retried. Punches spanning two windows are only emitted
+        once.
+
+        Args:
+            context: Stream sync context.
+
+        Yields:
+            One record per punch segment.
+        """
+        windows = self.get_punch_windows(context)
+        decorated_request = self.request_decorator(self._request_window)
+
+        def fetch(window: tuple[datetime | None, datetime]) -> list[dict]:
+            start, end = window
+            return list(
+                self._request_window_records(context, start, end, decorated_request)
+            )
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            if self.max_concurrency <= 1 or len(windows) <= 1:
+                pages = (fetch(window) for window in windows)
+                yield from self._merge_windows(pages, request_counter)
+                return
+
+            futures = [self.window_executor.submit(fetch, window) for window in windows]
+            try:
+                pages = (future.result() for future in futures)
+                yield from self._merge_windows(pages, request_counter)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    @cached_property
+    def window_executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool shared by the windows of every employee.
+
+        Employees are fetched ``max_concurrency`` at a time by the parent stream,
+        so windows get a pool of their own, of the same size, rather than one pool
+        per employee; at most ``max_concurrency`` windows are requested at once.
+        """
+        return ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=f"{self.name}-windows",
+        )
+
+    async def request_records_async(self, context: dict | None) -> list[dict]:
+        """Request the punches of an employee on the asyncio engine.
+
+        The windows of the employee are requested concurrently, and split as
+        in `request_records`.
+
+        Args:
+            context: Stream sync context.
+
+        Returns:
+            One record per punch segment.
+        """
+        windows = self.get_punch_windows(context)
+        decorated_request = self.request_decorator(self._request_window_async)
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            pages = await asyncio.gather(
+                *(
+                    self._request_window_records_async(
+                        context, start, end, decorated_request
+                    )
+                    for start, end in windows
+                )
+            )
+            return list(self._merge_windows(pages, request_counter))
+
+    @staticmethod
+    def _merge_windows(
+        pages: t.Iterable[list[dict]],
+        request_counter: metrics.Counter,
+    ) -> t.Iterator[dict]:
+        """Yield the records of window pages, punches spanning two windows once.
+
+        Windows split in half are deduplicated too, as their halves may both
+        return a punch spanning the middle.
+        """
+        seen_punch_ids: set[str] = set()
+        for page in pages:
+            request_counter.increment()
+            for record in page:
+                punch_id = record.get("punchID")
+                if punch_id is not None:
+                    if punch_id in seen_punch_ids:
+                        continue
+                    seen_punch_ids.add(punch_id)
+                yield record
+
+    def _request_window_records(
+        self,
+        context: dict | None,
+        start: datetime | None,
+        end: datetime,
+        decorated_request: t.Callable[..., requests.Response],
+    ) -> t.Iterator[dict]:
+        """Request one punch window, halving it until the API can serve it."""
+        window_context = {
+            **(context or {}),
+            "relativeStart": start.isoformat() if start else None,
+            "relativeEnd": end.isoformat(),
+        }
+        try:
+            records = self.request_window(window_context, context, decorated_request)
+        except _PunchWindowTooLargeError as ex:
+            if start is None or end - start <= MIN_PUNCH_WINDOW:
+                msg = f"Punch window {start} - {end} cannot be split any further"
+                raise FatalAPIError(msg) from ex
+            middle = start + (end - start) / 2
+            self.logger.info(
+                "Splitting punch window %s - %s for employee %s: %s",
+                start,
+                end,
+                window_context.get("employeeId"),
+                ex,
+            )
+            yield from self._request_window_records(
+                context, start, middle, decorated_request
+            )
+            yield from self._request_window_records(
+                context, middle, end, decorated_request
+            )
+            return
+
+        yield from records
+
+    async def _request_window_records_async(
+        self,
+        context: dict | None,
+        start: datetime | None,
+        end: datetime,
+        decorated_request: t.Callable[..., t.Awaitable[requests.Response]],
+    ) -> list[dict]:
+        """Request one punch window on the engine, halving it as needed."""
+        window_context = {
+            **(context or {}),
+            "relativeStart": start.isoformat() if start else None,
+            "relativeEnd": end.isoformat(),
+        }
+        prepared_request = await self.prepare_request_async(
+            window_context,
+            next_page_token=None,
+        )
+        try:
+            response = await decorated_request(prepared_request, context)
+        except _PunchWindowTooLargeError as ex:
+            if start is None or end - start <= MIN_PUNCH_WINDOW:
+                msg = f"Punch window {start} - {end} cannot be split any further"
+                raise FatalAPIError(msg) from ex
+            middle = start + (end - start) / 2
+            self.logger.info(
+                "Splitting punch window %s - %s for employee %s: %s",
+                start,
+                end,
+                window_context.get("employeeId"),
+                ex,
+            )
+            halves = await asyncio.gather(
+                self._request_window_records_async(context, start, middle, decorated_request),
+                self._request_window_records_async(context, middle, end, decorated_request),
+            )
+            return [record for half in halves for record in half]
+
+        self.update_sync_costs(prepared_request, response, context)
+        return await self.run_in_worker(list, self.parse_response(response))
+
+    def request_window(
+        self,
+        window_context: dict,
+        context: dict | None,
+        decorated_request: t.Callable[..., requests.Response],
+    ) -> list[dict]:
+        """Request all records of one punch window.
+
+        Args:
+            window_context: Stream sync context, with the window's range.
+            context: Stream sync context.
+            decorated_request: The request function, wrapped for retries.
+
+        Returns:
+            The records of the window.
+        """
+        prepared_request = self.prepare_request(window_context, next_page_token=None)
+        response = decorated_request(prepared_request, context)
+        self.update_sync_costs(prepared_request, response, context)
+        return list(self.parse_response(response))
+
+    def _request_window(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a window request, flagging responses too large to handle."""
+        try:
+            response = self._request(prepared_request, context)
+        except requests.exceptions.ReadTimeout as ex:
+            msg = "request timed out"
+            raise _PunchWindowTooLargeError(msg) from ex
+        self._check_window_size(response)
+        return response
+
+    async def _request_window_async(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a window request on the engine, see `_request_window`."""
+        try:
+            response = await self._request_async(prepared_request, context)
+        except requests.exceptions.ReadTimeout as ex:
+            msg = "request timed out"
+            raise _PunchWindowTooLargeError(msg) from ex
+        self._check_window_size(response)
+        return response
+
+    def _check_window_size(self, response: requests.Response) -> None:
+        """Flag a window response larger than ``punch_max_response_bytes``.
+
+        The limit applies to the decoded body, which is read until it is exceeded,
+        since ``Content-Length`` only gives the size of a compressed body. A body
+        within the limit is kept for parsing.
+        """
+        max_bytes = self.config.get("punch_max_response_bytes")
+        if not max_bytes or not response.ok:
+            return
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                # The rest of the body is not read, so the connection is dropped.
+                response.close()
+                msg = f"response of over {max_bytes} bytes"
+                raise _PunchWindowTooLargeError(msg)
+            chunks.append(chunk)
+        response._content = b"".join(chunks)  # noqa: SLF001
+        response._content_consumed = True  # noqa: SLF001
+
     def parse_response(self, response) -> t.Iterable[dict]:
         """Parse API responses into individual segment records."""
         if not response:
+            release_connection(response)
             return
 
-        records = response.json()
+        yield from self.flatten_punches(self.record_decoder.iter_records(response))
+
+    @cached_property
+    def deselected_fields(self) -> tuple[str, ...]:
+        """Return the properties not selected in the catalog."""
+        selected = selected_properties(self)
+        if selected is None:
+            return ()
+        return tuple(name for name in self.schema["properties"] if name not in selected)
+
+    def flatten_punches(self, records: t.Iterable[dict]) -> t.Iterable[dict]:
+        """Flatten punches into one record per segment.
+
+        The punch fields are gathered once per punch, then each segment record is
+        a copy of them updated with the segment fields.
+        """
+        deselected = self.deselected_fields
         for record in records:
-            if "relativeEnd" not in record:
+            segments = record.pop("segments", None) or ()
+            if "relativeEnd" not in record and segments:
                 # This field must exist for tracking state through the replication key (relativeEnd)
-                record["relativeEnd"] = record["segments"][0]["date"]
-            for segment in record.get("segments", []):
-                # Merge top-level keys with segment keys
-                yield {
-                    **{k: v for k, v in record.items() if k != "segments"},  # Exclude "segments"
-                    **segment,  # Include individual segment details
-                }
+                record["relativeEnd"] = segments[0]["date"]
+            for segment in segments:
+                row = record.copy()
+                row.update(segment)
+                for key in deselected:
+                    row.pop(key, None)
+                yield row
+
+
+class BulkPunchDetails(ShardedMixin, PunchDetails):
+    """Stream for getting the PunchDetails of a whole company in pages.
+
+    Replaces the per-employee requests of ``PunchDetails`` when the
+    ``punch_details_bulk`` setting is enabled, so that the number of requests
+    depends on the number of punches rather than on headcount.
+    """
+
+    path = "/apiHub/time/v1/companies/{companyId}/punchDetails"
+    # One relativeEnd bookmark per company.
+    state_partitioning_keys = None
+
+    parent_stream_type = None
+
+    @property
+    def partitions(self) -> list[dict]:
+        """Return one partition per configured company."""
+        return [{"companyId": company_id} for company_id in get_company_ids(self.config)]
+
+    @property
+    def page_size(self) -> int:
+        """Return the number of punches requested per page."""
+        return self.config.get("punch_details_bulk_page_size", 1000)
+
+    def get_url_params(
+        self,
+        context: dict | None,
+        next_page_token: int | None,
+    ) -> dict[str, t.Any]:
+        """Get URL query parameters."""
+        params = super().get_url_params(context, None)
+
+        params["limit"] = self.page_size
+        params["offset"] = next_page_token or 0
 
+        return params
 
+    def request_window(
+        self,
+        window_context: dict,
+        context: dict | None,
+        decorated_request: t.Callable[..., requests.Response],
+    ) -> list[dict]:
+        """Request all pages of one punch window.
+
+        Args:
+            window_context: Stream sync context, with the window's range.
+            context: Stream sync context.
+            decorated_request: The request function, wrapped for retries.
+
+        Returns:
+            The records of the window.
+        """
+        records: list[dict] = []
+        offset = 0
+        while True:
+            prepared_request = self.prepare_request(
+                window_context,
+                next_page_token=offset,
+            )
+            response = decorated_request(prepared_request, context)
+            self.update_sync_costs(prepared_request, response, context)
+            if not response:
+                release_connection(response)
+                break
+
+            punches = list(
+                self.parse_records(response, self.record_decoder.iter_records(response))
+            )
+            records.extend(self.flatten_punches(punches))
+            if len(punches) < self.page_size:
+                break
+            offset += len(punches)
+        return records
@@ -7,6 +7,7 @@ from singer_sdk import typing as th  # JSON schema typing helpers
 
 # TODO: Import your custom stream types here:
 from tap_paylocity import streams
+from tap_paylocity.instrumentation import get_performance_metrics
 
 
 class TapPaylocity(Tap):
@@ -35,10 +36,19 @@ class TapPaylocity(Tap):
         th.Property(
             "company_id",
             th.StringType,
-            required=True,
             title="Company ID",
             description="The unique company ID",
         ),
+        th.Property(
+            "company_ids",
+            th.ArrayType(th.StringType),
+            title="Company IDs",
+            description=(
+                "The IDs of all companies to sync, used instead of company_id. "
+                "Each company is a separate stream partition with its own state, "
+                "and companies are synced in parallel when max_concurrency allows it."
+            ),
+        ),
         # th.Property(
         #     "project_ids",
         #     th.ArrayType(th.StringType),
@@ -56,6 +66,192 @@ class TapPaylocity(Tap):
             th.DateTimeType,
             description="The latest record date to sync",
         ),
+        th.Property(
+            "punch_lookback_hours",
+            th.NumberType,
+            default=24,
+            title="Punch Lookback (Hours)",
+            description=(
+                "How far before an employee's last synced punch to restart "
+                "incremental punch_details syncs, so that punches edited after "
+                "they were synced are picked up again."
+            ),
+        ),
+        th.Property(
+            "punch_window_days",
+            th.IntegerType,
+            title="Punch Window (Days)",
+            description=(
+                "Split each employee's punch_details date range into windows of "
+                "this many days, e.g. 7 or 31. Windows are fetched in parallel "
+                "when max_concurrency allows it. By default the whole range is "
+                "requested at once."
+            ),
+        ),
+        th.Property(
+            "punch_max_response_bytes",
+            th.IntegerType,
+            title="Punch Max Response Size (Bytes)",
+            description=(
+                "Split a punch_details window in half and retry it when its "
+                "response is larger than this, once decompressed. Windows that "
+                "time out are split the same way."
+            ),
+        ),
+        th.Property(
+            "employees_page_size",
+            th.IntegerType,
+            default=25,
+            title="Employees Page Size",
+            description=(
+                "The number of employees requested per roster page, up to the "
+                "API maximum of 5000."
+            ),
+        ),
+        th.Property(
+            "employees_parallel_pages",
+            th.BooleanType,
+            default=False,
+            title="Employees Parallel Pages",
+            description=(
+                "Ask the API for the total number of employees with the first "
+                "roster page, then fetch the remaining pages concurrently, on up "
+                "to max_concurrency connections."
+            ),
+        ),
+        th.Property(
+            "punch_details_bulk",
+            th.BooleanType,
+            default=False,
+            title="Bulk Punch Details",
+            description=(
+                "Extract punch_details for the whole company with paged "
+                "company-level requests instead of one request per employee."
+            ),
+        ),
+        th.Property(
+            "punch_details_bulk_page_size",
+            th.IntegerType,
+            default=1000,
+            title="Bulk Punch Details Page Size",
+            description="The number of punches requested per page in bulk mode.",
+        ),
+        th.Property(
+            "json_backend",
+            th.StringType,
+            default="stdlib",
+            allowed_values=["stdlib", "orjson"],
+            title="JSON Backend",
+            description=(
+                "The JSON parser for API responses. 'stdlib' parses responses as "
+                "they arrive, with flat memory use. 'orjson' reads each response "
+                "whole, and is up to several times faster when few numbers are "
+                "parsed as decimals, see decimal_policy. It requires the orjson "
+                "extra, e.g. 'pip install tap-paylocity[orjson]'."
+            ),
+        ),
+        th.Property(
+            "decimal_policy",
+            th.StringType,
+            default="all",
+            allowed_values=["all", "schema", "none"],
+            title="Decimal Policy",
+            description=(
+                "Which non-integer numbers are parsed as exact decimals rather "
+                "than floats: 'all' of them, only the 'schema' number fields such "
+                "as annualSalary, baseRate and earnings, or 'none'."
+            ),
+        ),
+        th.Property(
+            "record_validation",
+            th.StringType,
+            default="sdk",
+            allowed_values=["sdk", "compiled", "coerce_only"],
+            title="Record Validation",
+            description=(
+                "How records are conformed to their schema. 'sdk' uses the SDK's "
+                "generic conformance. 'compiled' coerces and checks each record "
+                "with a validator compiled once per stream from its schema, and "
+                "fails on values of the wrong type. 'coerce_only' coerces values "
+                "without checking them, for trusted sources."
+            ),
+        ),
+        th.Property(
+            "batch_streams",
+            th.ArrayType(th.StringType),
+            title="Batch Streams",
+            description=(
+                "The streams written to batch files, with BATCH messages, when "
+                "batch_config is set, e.g. [\"punch_details\"]. The other streams "
+                "write RECORD messages. All streams by default."
+            ),
+        ),
+        th.Property(
+            "batch_max_bytes",
+            th.IntegerType,
+            default=100000000,
+            title="Batch Max Size (Bytes)",
+            description=(
+                "Start a new JSONL batch file once this many bytes of records, "
+                "before compression, were written to the current one. Files also "
+                "end after batch_config's batch_size records, and before each "
+                "STATE message: set checkpoint_interval so that child streams do "
+                "not write one per employee."
+            ),
+        ),
+        th.Property(
+            "http_cache_path",
+            th.StringType,
+            title="HTTP Cache Path",
+            description=(
+                "A SQLite file in which employee_details responses are cached "
+                "between runs. Cached responses are revalidated with conditional "
+                "requests, so unchanged employees are not downloaded again. "
+                "Disabled by default."
+            ),
+        ),
+        th.Property(
+            "http_cache_ttl_days",
+            th.NumberType,
+            default=30,
+            title="HTTP Cache TTL (Days)",
+            description=(
+                "Days after which a cached response is evicted and downloaded "
+                "again in full."
+            ),
+        ),
+        th.Property(
+            "http_cache_max_entries",
+            th.IntegerType,
+            default=100000,
+            title="HTTP Cache Max Entries",
+            description=(
+                "The maximum number of cached responses. The least recently used "
+                "ones are evicted first."
+            ),
+        ),
+        th.Property(
+            "token_cache_path",
+            th.StringType,
+            title="Token Cache Path",
+            description=(
+                "A file, readable by its owner only, in which OAuth access tokens "
+                "are kept between runs. Runs reuse a cached token until it is "
+                "about to expire instead of requesting a new one. Disabled by "
+                "default."
+            ),
+        ),
+        th.Property(
+            "token_refresh_margin_seconds",
+            th.NumberType,
+            default=300,
+            title="Token Refresh Margin (Seconds)",
+            description=(
+                "How long before an access token expires a new one is requested. "
+                "Requests keep using the current token while it is refreshed in "
+                "the background."
+            ),
+        ),
         th.Property(
             "user_agent",
             th.StringType,
@@ -64,18 +260,302 @@ class TapPaylocity(Tap):
                 "'<tap_name>/<tap_version>'"
             ),
         ),
+        th.Property(
+            "api_url",
+            th.StringType,
+            default="https://api.paylocity.com",
+            title="WebLink API URL",
+            description="The root URL of the Paylocity WebLink API.",
+        ),
+        th.Property(
+            "nextgen_api_url",
+            th.StringType,
+            default="https://dc1prodgwext.paylocity.com",
+            title="NextGen API URL",
+            description="The root URL of the Paylocity NextGen API.",
+        ),
+        th.Property(
+            "max_concurrency",
+            th.IntegerType,
+            default=1,
+            title="Max Concurrency",
+            description=(
+                "The number of child stream requests (employee details, punch "
+                "details) to run in parallel. Records are still written in order. "
+                "Default is 1, which syncs child streams sequentially."
+            ),
+        ),
+        th.Property(
+            "pipeline_queue_size",
+            th.IntegerType,
+            default=1000,
+            title="Pipeline Queue Size",
+            description=(
+                "When max_concurrency is above 1, the employee roster is requested "
+                "in the background while child streams are synced. This bounds "
+                "how many employees it may be ahead, and so the memory used."
+            ),
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            title="HTTP Pool Size",
+            description=(
+                "The number of connections kept alive per API host, shared by all "
+                "streams. Defaults to 4 times max_concurrency, and at least 10."
+            ),
+        ),
+        th.Property(
+            "http_engine",
+            th.StringType,
+            default="requests",
+            allowed_values=["requests", "asyncio"],
+            title="HTTP Engine",
+            description=(
+                "How prefetched punch_details requests are sent when max_concurrency "
+                "is above 1: 'requests' on worker threads, or 'asyncio' on an event "
+                "loop, with thousands of requests in flight on http_pool_size "
+                "connections. 'asyncio' requires tap-paylocity[async]."
+            ),
+        ),
+        th.Property(
+            "http2",
+            th.BooleanType,
+            default=True,
+            title="HTTP/2",
+            description=(
+                "With the asyncio HTTP engine, multiplex requests over HTTP/2 on the "
+                "hosts that negotiate it."
+            ),
+        ),
+        th.Property(
+            "async_max_in_flight",
+            th.IntegerType,
+            default=1000,
+            title="Async Max In-Flight Requests",
+            description=(
+                "With the asyncio HTTP engine, the number of employees whose "
+                "punch_details are requested at once."
+            ),
+        ),
+        th.Property(
+            "http_compression",
+            th.BooleanType,
+            default=True,
+            title="HTTP Compression",
+            description=(
+                "Ask for compressed responses, decompressed as they arrive. gzip "
+                "and deflate are always accepted, br when brotli is installed."
+            ),
+        ),
+        th.Property(
+            "http_connect_timeout",
+            th.NumberType,
+            default=10,
+            title="HTTP Connect Timeout (Seconds)",
+            description="How long to wait for a connection to an API host.",
+        ),
+        th.Property(
+            "http_read_timeout",
+            th.NumberType,
+            default=300,
+            title="HTTP Read Timeout (Seconds)",
+            description="How long to wait for data of a response.",
+        ),
+        th.Property(
+            "http_timeouts",
+            th.ObjectType(),
+            title="HTTP Read Timeouts by Host",
+            description=(
+                "Read timeouts overriding http_read_timeout for some API hosts, in "
+                "seconds, e.g. {\"dc1prodgwext.paylocity.com\": 60}."
+            ),
+        ),
+        th.Property(
+            "metrics_path",
+            th.StringType,
+            title="Metrics Path",
+            description=(
+                "A file to which the performance metrics of the run are written "
+                "when it ends: request latency histograms, bytes, retries and "
+                "rate limiter waits per endpoint, and parse and post-processing "
+                "time and records per second per stream. They are also logged as "
+                "metric lines. Disabled by default."
+            ),
+        ),
+        th.Property(
+            "metrics_format",
+            th.StringType,
+            default="json",
+            allowed_values=["json", "prometheus"],
+            title="Metrics Format",
+            description=(
+                "The format of the metrics_path file: a 'json' summary, or a "
+                "'prometheus' textfile, e.g. for the node exporter's textfile "
+                "collector."
+            ),
+        ),
+        th.Property(
+            "checkpoint_interval",
+            th.IntegerType,
+            title="Checkpoint Interval",
+            description=(
+                "Save the employees whose child streams (employee details, punch "
+                "details) completed into the state every this many employees, so "
+                "that an interrupted sync resumes where it stopped. Child streams "
+                "then write their state at checkpoints only. Unset or 0 disables "
+                "checkpoints, and a state message is written per employee."
+            ),
+        ),
+        th.Property(
+            "shard_index",
+            th.IntegerType,
+            default=0,
+            title="Shard Index",
+            description=(
+                "The shard of employees synced by this tap instance, from 0 to "
+                "shard_count - 1. Each instance needs its own state."
+            ),
+        ),
+        th.Property(
+            "shard_count",
+            th.IntegerType,
+            default=1,
+            title="Shard Count",
+            description=(
+                "Split the employees between this many tap instances, by a hash "
+                "of their ID. Each instance writes the employees and child stream "
+                "records of its shard only. Bulk punch_details are still "
+                "requested in full by every instance. Merge the final states with "
+                "tap-paylocity-merge-state."
+            ),
+        ),
+        th.Property(
+            "child_stream_status_codes",
+            th.ArrayType(th.StringType),
+            title="Child Stream Status Codes",
+            description=(
+                "Only sync the child streams (employee details, punch details) of "
+                "employees with these roster status codes, e.g. [\"A\", \"L\"]. "
+                "All employees by default."
+            ),
+        ),
+        th.Property(
+            "change_data_path",
+            th.StringType,
+            title="Change Data Path",
+            description=(
+                "A SQLite file keeping a fingerprint of every employee_details "
+                "record emitted. Records that did not change since they were last "
+                "emitted are skipped. Each shard needs its own file. Disabled by "
+                "default."
+            ),
+        ),
+        th.Property(
+            "change_data_tombstones",
+            th.BooleanType,
+            default=False,
+            title="Change Data Tombstones",
+            description=(
+                "With change_data_path, emit an employee_details record with only "
+                "its keys and _sdc_deleted_at for each employee no longer in the "
+                "roster. Run discovery with this setting to add _sdc_deleted_at to "
+                "the catalog."
+            ),
+        ),
+        th.Property(
+            "roster_snapshot_path",
+            th.StringType,
+            title="Roster Snapshot Path",
+            description=(
+                "A SQLite file keeping the last employee roster of each company. "
+                "When the employees stream is not selected, child streams use a "
+                "snapshot younger than the TTL instead of requesting the roster. "
+                "Disabled by default."
+            ),
+        ),
+        th.Property(
+            "roster_snapshot_ttl_minutes",
+            th.NumberType,
+            default=60,
+            title="Roster Snapshot TTL (Minutes)",
+            description=(
+                "Age after which a roster snapshot is fetched again. Past half "
+                "this age, a snapshot is still used but refreshed in the "
+                "background."
+            ),
+        ),
+        th.Property(
+            "frozen_employees_path",
+            th.StringType,
+            title="Frozen Employees Path",
+            description=(
+                "A SQLite file remembering the employees terminated for longer "
+                "than the grace period. Their child streams are skipped on later "
+                "runs, until their roster status changes. Disabled by default."
+            ),
+        ),
+        th.Property(
+            "terminated_grace_days",
+            th.NumberType,
+            default=90,
+            title="Terminated Grace Period (Days)",
+            description=(
+                "Days after their termination date during which the child streams "
+                "of terminated employees are still synced."
+            ),
+        ),
+        th.Property(
+            "rate_limit_requests_per_second",
+            th.NumberType,
+            default=20,
+            title="Rate Limit (Requests per Second)",
+            description=(
+                "The maximum request rate per API host, shared by all streams. The "
+                "rate is lowered automatically when the API answers with HTTP 429 "
+                "and recovers gradually while requests succeed."
+            ),
+        ),
+        th.Property(
+            "rate_limit_burst",
+            th.NumberType,
+            title="Rate Limit Burst",
+            description=(
+                "How many requests may be sent at once before the rate limit "
+                "applies. Defaults to one second worth of requests."
+            ),
+        ),
     ).to_dict()
 
+    def sync_all(self) -> None:
+        """Sync all streams, then log and export the run's performance metrics."""
+        performance = get_performance_metrics()
+        performance.reset()
+        try:
+            super().sync_all()
+        finally:
+            performance.log()
+            if self.config.get("metrics_path"):
+                performance.write(
+                    self.config["metrics_path"],
+                    self.config.get("metrics_format", "json"),
+                )
+
     def discover_streams(self) -> list[streams.PaylocityStream]:
         """Return a list of discovered streams.
 
         Returns:
             A list of discovered streams.
         """
+        punch_details = (
+            streams.BulkPunchDetails
+            if self.config.get("punch_details_bulk")
+            else streams.PunchDetails
+        )
         return [
             streams.EmployeesStream(self),
             streams.EmployeeDetailsStream(self),
-            streams.PunchDetails(self),
+            punch_details(self),
         ]
 
 
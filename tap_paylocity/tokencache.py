@@ -0,0 +1,272 @@
+"""OAuth access tokens shared between tap runs, refreshed ahead of expiry."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import typing as t
+from datetime import datetime, timezone
+from functools import cached_property
+from urllib.parse import urlparse
+
+import requests
+
+from tap_paylocity.instrumentation import AUTH_STREAM, get_performance_metrics
+from tap_paylocity.storage import SQLiteStore, get_store
+
+DEFAULT_REFRESH_MARGIN_SECONDS = 300
+
+
+class TokenCache(SQLiteStore):
+    """A SQLite file of access tokens, readable by its owner only.
+
+    Tokens are keyed by a hash of the token endpoint, client ID and scope, so
+    client secrets are never stored.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS tokens (
+            key TEXT PRIMARY KEY,
+            access_token TEXT NOT NULL,
+            expires_at REAL
+        );
+    """
+
+    private = True
+
+    def get(self, key: str) -> tuple[str, float | None] | None:
+        """Return a cached token.
+
+        Args:
+            key: The token key.
+
+        Returns:
+            The access token and its expiry timestamp, or ``None``.
+        """
+        rows = self.execute(
+            "SELECT access_token, expires_at FROM tokens WHERE key = ?",
+            (key,),
+        )
+        return rows[0] if rows else None
+
+    def put(self, key: str, access_token: str, expires_at: float | None) -> None:
+        """Store a token.
+
+        Args:
+            key: The token key.
+            access_token: The access token.
+            expires_at: The expiry timestamp, or ``None`` if it never expires.
+        """
+        self.execute(
+            "INSERT OR REPLACE INTO tokens VALUES (?, ?, ?)",
+            (key, access_token, expires_at),
+        )
+
+
+class CachedTokenMixin:
+    """Reuse and proactively refresh the tokens of an OAuth authenticator.
+
+    With the ``token_cache_path`` setting, a token is reused across tap runs
+    until ``token_refresh_margin_seconds`` before it expires. Within that
+    margin, requests keep using the current token while a new one is fetched on
+    a background thread, so that concurrent workers do not wait for it.
+    """
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Create a new authenticator.
+
+        Args:
+            args: The authenticator positional arguments.
+            kwargs: The authenticator keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self._token_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+
+    @cached_property
+    def token_cache(self) -> TokenCache | None:
+        """Return the configured token cache.
+
+        Returns:
+            The cache, or ``None`` if the ``token_cache_path`` setting is not set.
+        """
+        path = self.config.get("token_cache_path")
+        return get_store(TokenCache, path) if path else None
+
+    @property
+    def refresh_margin(self) -> float:
+        """Return how many seconds before expiry a token is refreshed."""
+        return float(
+            self.config.get(
+                "token_refresh_margin_seconds",
+                DEFAULT_REFRESH_MARGIN_SECONDS,
+            ),
+        )
+
+    @cached_property
+    def token_key(self) -> str:
+        """Return the key of this authenticator's tokens in the cache."""
+        body = self.oauth_request_body
+        identity = [self.auth_endpoint, body.get("client_id"), body.get("scope")]
+        return hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+
+    def seconds_until_expiry(self) -> float | None:
+        """Return the remaining lifetime of the current token.
+
+        Returns:
+            The seconds left, 0 without a token, or ``None`` if it never expires.
+        """
+        if self.last_refreshed is None:
+            return 0.0
+        if not self.expires_in:
+            return None
+        elapsed = (datetime.now(timezone.utc) - self.last_refreshed).total_seconds()
+        return self.expires_in - elapsed
+
+    def authenticate_request(
+        self,
+        request: requests.PreparedRequest,
+    ) -> requests.PreparedRequest:
+        """Authenticate a request, refreshing the token ahead of expiry.
+
+        The token is checked, and replaced if needed, under the token lock; the
+        header is then set from that token, without the SDK's own re-check.
+
+        Args:
+            request: A :class:`requests.PreparedRequest` object.
+
+        Returns:
+            The authenticated request object.
+        """
+        with self._token_lock:
+            if not self.is_token_valid():
+                self.update_access_token()
+            else:
+                remaining = self.seconds_until_expiry()
+                # Short-lived tokens are refreshed halfway through their lifetime.
+                if remaining is not None and remaining < min(
+                    self.refresh_margin,
+                    self.expires_in / 2,
+                ):
+                    self._start_background_refresh()
+            access_token = self.access_token
+        request.headers["Authorization"] = f"Bearer {access_token}"
+        return request
+
+    def update_access_token(self) -> None:
+        """Adopt a fresh cached token, or request a new one and cache it.
+
+        Callers hold the token lock.
+        """
+        if self._load_cached_token():
+            return
+        self._adopt_token(*self._request_token())
+
+    def _request_token(self) -> tuple[str, int | None, datetime]:
+        """Request a new token from the token endpoint, without adopting it.
+
+        Returns:
+            The access token, its lifetime in seconds and the time it was requested.
+
+        Raises:
+            RuntimeError: When OAuth login fails.
+        """
+        requested_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        status: int | str = "error"
+        try:
+            response = requests.post(
+                self.auth_endpoint,
+                headers=self._oauth_headers,
+                data=self.oauth_request_payload,
+                timeout=60,
+            )
+            status = response.status_code
+            response.raise_for_status()
+        except requests.HTTPError as ex:
+            msg = f"Failed OAuth login, response was '{response.text}'. {ex}"
+            raise RuntimeError(msg) from ex
+        finally:
+            get_performance_metrics().observe_request(
+                AUTH_STREAM,
+                urlparse(self.auth_endpoint).path,
+                time.perf_counter() - started,
+                status,
+            )
+        self.logger.info("OAuth authorization attempt was successful.")
+
+        token = response.json()
+        expiration = token.get("expires_in", self._default_expiration)
+        expires_in = int(expiration) if expiration else None
+        return token["access_token"], expires_in, requested_at
+
+    def _adopt_token(
+        self,
+        access_token: str,
+        expires_in: int | None,
+        requested_at: datetime,
+    ) -> None:
+        """Use a new token and cache it. Callers hold the token lock.
+
+        Args:
+            access_token: The access token.
+            expires_in: The token lifetime in seconds, or ``None``.
+            requested_at: When the token was requested.
+        """
+        self.access_token = access_token
+        self.expires_in = expires_in
+        self.last_refreshed = requested_at
+        if self.token_cache is not None:
+            expires_at = requested_at.timestamp() + expires_in if expires_in else None
+            self.token_cache.put(self.token_key, access_token, expires_at)
+
+    def _load_cached_token(self) -> bool:
+        """Adopt the cached token, unless it is due for a refresh.
+
+        Callers hold the token lock.
+
+        Returns:
+            Whether a cached token was adopted.
+        """
+        if self.token_cache is None:
+            return False
+        cached = self.token_cache.get(self.token_key)
+        if cached is None:
+            return False
+        access_token, expires_at = cached
+        now = time.time()
+        if expires_at is not None and expires_at - now <= self.refresh_margin:
+            return False
+        self.access_token = access_token
+        self.expires_in = None if expires_at is None else int(expires_at - now)
+        self.last_refreshed = datetime.fromtimestamp(now, tz=timezone.utc)
+        self.logger.info("Reusing the cached OAuth access token.")
+        return True
+
+    def _start_background_refresh(self) -> None:
+        """Refresh the token on a background thread, unless one already is."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_in_background,
+            name=f"{type(self).__name__}-refresh",
+            daemon=True,
+        )
+        self._refresh_thread.start()
+
+    def _refresh_in_background(self) -> None:
+        # Requests keep using the current token meanwhile; if this fails, the
+        # token is refreshed on the next request once it expired.
+        with self._token_lock:
+            if self._load_cached_token():
+                return
+        try:
+            token = self._request_token()
+        except (RuntimeError, requests.RequestException, ValueError, KeyError):
+            # Failed logins, connection errors and malformed token responses.
+            self.logger.warning("Background OAuth token refresh failed", exc_info=True)
+            return
+        with self._token_lock:
+            self._adopt_token(*token)
@@ -0,0 +1,382 @@
+"""Benchmarks for tap-paylocity, run against the local mock server.
+
+Usage::
+
+    python -m tests.benchmarks fanout --employees 200 --latency 0.02
+    python -m tests.benchmarks decode --records 100000
+    python -m tests.benchmarks roster --employees 5000 --page-size 100
+    python -m tests.benchmarks flatten --records 1000000
+    python -m tests.benchmarks conform --records 100000
+    python -m tests.benchmarks streams --employees 1000 --latency 0.01 --throttle-every 100
+    python -m tests.benchmarks engines --employees 2000 --latency 0.05 --concurrency 4 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import decimal
+import io
+import json
+import multiprocessing
+import time
+import tracemalloc
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_paylocity.parsing import CHUNK_SIZE, RecordDecoder, money_fields
+from tap_paylocity.streams import EmployeeDetailsStream
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import MockCompany, MockPaylocityServer, run_tap
+
+
+def _timed_sync(config: dict) -> tuple[float, int]:
+    started = time.perf_counter()
+    messages = run_tap(config)
+    elapsed = time.perf_counter() - started
+    return elapsed, sum(1 for m in messages if m["type"] == "RECORD")
+
+
+def bench_fanout(args: argparse.Namespace) -> None:
+    """Compare sequential and concurrent child stream syncs."""
+    company = MockCompany(employees=args.employees)
+    server = MockPaylocityServer([company], latency=args.latency).start()
+    try:
+        for concurrency in args.concurrency:
+            elapsed, records = _timed_sync(
+                server.tap_config(max_concurrency=concurrency),
+            )
+            print(  # noqa: T201
+                f"max_concurrency={concurrency:<3} {elapsed:8.2f}s "
+                f"{records / elapsed:10.1f} records/s",
+            )
+    finally:
+        server.stop()
+
+
+def bench_roster(args: argparse.Namespace) -> None:
+    """Compare sequential and parallel listing of the employee roster."""
+    company = MockCompany(employees=args.employees)
+    server = MockPaylocityServer([company], latency=args.latency).start()
+    try:
+        for concurrency in args.concurrency:
+            config = server.tap_config(
+                employees_page_size=args.page_size,
+                employees_parallel_pages=concurrency > 1,
+                max_concurrency=concurrency,
+            )
+            stream = TapPaylocity(config=config).streams["employees"]
+            started = time.perf_counter()
+            records = sum(
+                1 for _ in stream.request_records({"companyId": company.company_id})
+            )
+            elapsed = time.perf_counter() - started
+            print(  # noqa: T201
+                f"max_concurrency={concurrency:<3} {elapsed:8.2f}s "
+                f"{records / elapsed:10.1f} records/s",
+            )
+    finally:
+        server.stop()
+
+
+def bench_decode(args: argparse.Namespace) -> None:
+    """Compare JSON backends and decimal policies on employee_details bodies."""
+    company = MockCompany(employees=args.records)
+    details = [company.employee_details(eid) for eid in company.employee_ids]
+    pages = [
+        json.dumps(details[start : start + args.page_size]).encode()
+        for start in range(0, len(details), args.page_size)
+    ]
+    bodies = [
+        [page[i : i + CHUNK_SIZE] for i in range(0, len(page), CHUNK_SIZE)]
+        for page in pages
+    ]
+    fields = money_fields(EmployeeDetailsStream.schema)
+
+    def jsonpath() -> int:
+        return sum(
+            1
+            for page in pages
+            for _ in extract_jsonpath(
+                "$[*]",
+                input=json.loads(page, parse_float=decimal.Decimal),
+            )
+        )
+
+    cases: dict[str, t.Callable[[], int]] = {"json.loads + jsonpath": jsonpath}
+    for backend in RecordDecoder.backends:
+        for policy in RecordDecoder.decimal_policies:
+            decoder = RecordDecoder(backend, policy, fields)
+            cases[f"{backend}, decimal_policy={policy}"] = (
+                lambda decoder=decoder: sum(
+                    1 for chunks in bodies for _ in decoder.decode(chunks)
+                )
+            )
+
+    print(  # noqa: T201
+        f"{sum(map(len, pages)) / 1e6:.1f} MB, {args.records} records "
+        f"in pages of {args.page_size}",
+    )
+    for name, decode in cases.items():
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            records = decode()
+            timings.append(time.perf_counter() - started)
+        elapsed = min(timings)
+        print(f"{name:<32} {records / elapsed:12.0f} records/s")  # noqa: T201
+
+
+def _flatten_with_merge(records: t.Iterable[dict]) -> t.Iterator[dict]:
+    """Flatten punches like PunchDetails did before reusing the punch fields."""
+    for record in records:
+        for segment in record.get("segments", []):
+            yield {
+                **{k: v for k, v in record.items() if k != "segments"},
+                **segment,
+            }
+
+
+def bench_flatten(args: argparse.Namespace) -> None:
+    """Compare punch segment flattening strategies on ``--records`` segments."""
+    segments_per_punch = 10
+    company = MockCompany(
+        employees=max(args.records // (segments_per_punch * 10), 1),
+        punches_per_employee=10,
+        segments_per_punch=segments_per_punch,
+    )
+    server = MockPaylocityServer([company]).start()
+    try:
+        tap = TapPaylocity(config=server.tap_config())
+    finally:
+        server.stop()
+    all_fields = tap.streams["punch_details"]
+    some_fields = TapPaylocity(config=server.tap_config()).streams["punch_details"]
+    for name in ("badgeNumber", "origin", "relativeOriginalStart", "relativeOriginalEnd"):
+        some_fields.mask[("properties", name)] = False
+
+    def punches() -> list[dict]:
+        return [p for eid in company.employee_ids for p in company.punch_details(eid)]
+
+    cases: dict[str, t.Callable[[list[dict]], t.Iterable[dict]]] = {
+        "merge per segment": _flatten_with_merge,
+        "copy punch fields": all_fields.flatten_punches,
+        "copy selected fields": some_fields.flatten_punches,
+    }
+    segments = sum(len(p["segments"]) for p in punches())
+    print(f"{segments} segments")  # noqa: T201
+    for name, flatten in cases.items():
+        timings = []
+        for _ in range(args.repeat):
+            records = punches()
+            started = time.perf_counter()
+            for _ in flatten(records):
+                pass
+            timings.append(time.perf_counter() - started)
+
+        records = punches()
+        tracemalloc.start()
+        flattened = list(flatten(records))
+        kept, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del flattened
+        print(  # noqa: T201
+            f"{name:<24} {segments / min(timings):12.0f} segments/s "
+            f"{kept / segments:8.0f} bytes/segment",
+        )
+
+
+def bench_conform(args: argparse.Namespace) -> None:
+    """Compare record conformance modes on ``--records`` punch_details records."""
+    company = MockCompany(
+        employees=max(args.records // 100, 1),
+        punches_per_employee=10,
+        segments_per_punch=10,
+    )
+    server = MockPaylocityServer([company]).start()
+    try:
+        streams = {
+            mode: TapPaylocity(
+                config=server.tap_config(record_validation=mode),
+            ).streams["punch_details"]
+            for mode in ("sdk", "compiled", "coerce_only")
+        }
+    finally:
+        server.stop()
+    punches = [p for eid in company.employee_ids for p in company.punch_details(eid)]
+    records = list(streams["sdk"].flatten_punches(punches))
+    print(f"{len(records)} records")  # noqa: T201
+    for mode, stream in streams.items():
+        timings = []
+        for _ in range(args.repeat):
+            # The SDK conforms records in place, so each run gets fresh copies.
+            copies = [record.copy() for record in records]
+            started = time.perf_counter()
+            for record in copies:
+                for _ in stream._generate_record_messages(record):  # noqa: SLF001
+                    pass
+            timings.append(time.perf_counter() - started)
+        print(f"{mode:<12} {len(records) / min(timings):12.0f} records/s")  # noqa: T201
+
+
+class _RecordCounter(io.TextIOBase):
+    """A stdout replacement counting the RECORD messages written to it."""
+
+    def __init__(self) -> None:
+        self.records = 0
+
+    def write(self, text: str) -> int:
+        self.records += text.count('"type":"RECORD"')
+        return len(text)
+
+
+def _sync_stream(stream_name: str, options: dict) -> dict:
+    """Sync only one stream against a fresh server, in a fresh process.
+
+    Returns:
+        The wall time, records, API requests and peak RSS of the sync.
+    """
+    import resource  # noqa: PLC0415
+
+    company = MockCompany(
+        employees=options["employees"],
+        punches_per_employee=options["punches"],
+    )
+    server = MockPaylocityServer([company], latency=options["latency"]).start()
+    server.throttle_every = options["throttle_every"]
+    try:
+        config = server.tap_config(**options["config"])
+        catalog = TapPaylocity(config=config).catalog_dict
+        for entry in catalog["streams"]:
+            for metadata in entry["metadata"]:
+                if not metadata["breadcrumb"]:
+                    metadata["metadata"]["selected"] = entry["tap_stream_id"] == stream_name
+        tap = TapPaylocity(config=config, catalog=catalog, setup_mapper=True)
+        sink = _RecordCounter()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            tap.sync_all()
+        elapsed = time.perf_counter() - started
+    finally:
+        server.stop()
+    return {
+        "seconds": elapsed,
+        "records": sink.records,
+        "requests": sum(
+            count for name, count in server.request_counts.items() if name != "token"
+        ),
+        # Kilobytes on Linux.
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def bench_streams(args: argparse.Namespace) -> None:
+    """Report the throughput and peak memory of syncing each stream alone.
+
+    Each sync runs in a new process, so that peak RSS is measured per stream.
+    The parent ``employees`` stream is requested for its child streams, but only
+    the measured stream's records are written.
+    """
+    print(  # noqa: T201
+        f"{'stream':<18} {'conc':>4} {'wall s':>8} {'records':>9} {'records/s':>10} "
+        f"{'requests':>9} {'requests/s':>10} {'peak RSS MB':>11}",
+    )
+    context = multiprocessing.get_context("spawn")
+    for stream_name in ("employees", "employee_details", "punch_details"):
+        for concurrency in args.concurrency:
+            options = {
+                "employees": args.employees,
+                "punches": args.punches,
+                "latency": args.latency,
+                "throttle_every": args.throttle_every,
+                "config": {
+                    "max_concurrency": concurrency,
+                    "employees_page_size": args.page_size,
+                },
+            }
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(_sync_stream, stream_name, options).result()
+            seconds = result["seconds"]
+            print(  # noqa: T201
+                f"{stream_name:<18} {concurrency:>4} {seconds:8.2f} "
+                f"{result['records']:>9} {result['records'] / seconds:10.1f} "
+                f"{result['requests']:>9} {result['requests'] / seconds:10.1f} "
+                f"{result['peak_rss_mb']:11.1f}",
+            )
+
+
+def bench_engines(args: argparse.Namespace) -> None:
+    """Compare the thread pool and asyncio engines syncing punch_details.
+
+    The thread pool runs ``concurrency`` requests at once. The asyncio engine
+    runs up to ``--in-flight`` employees at once on ``concurrency`` connections.
+    """
+    print(  # noqa: T201
+        f"{'engine':<9} {'conc':>4} {'wall s':>8} {'records/s':>10} "
+        f"{'requests/s':>10} {'peak RSS MB':>11}",
+    )
+    context = multiprocessing.get_context("spawn")
+    for concurrency in args.concurrency:
+        for engine in ("requests", "asyncio"):
+            options = {
+                "employees": args.employees,
+                "punches": args.punches,
+                "latency": args.latency,
+                "throttle_every": args.throttle_every,
+                "config": {
+                    # Child contexts are only prefetched above one.
+                    "max_concurrency": max(concurrency, 2),
+                    "http_pool_size": concurrency,
+                    "http_engine": engine,
+                    "async_max_in_flight": args.in_flight,
+                    "employees_page_size": args.page_size,
+                },
+            }
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(_sync_stream, "punch_details", options).result()
+            seconds = result["seconds"]
+            print(  # noqa: T201
+                f"{engine:<9} {concurrency:>4} {seconds:8.2f} "
+                f"{result['records'] / seconds:10.1f} "
+                f"{result['requests'] / seconds:10.1f} "
+                f"{result['peak_rss_mb']:11.1f}",
+            )
+
+
+BENCHMARKS: dict[str, t.Callable[[argparse.Namespace], None]] = {
+    "conform": bench_conform,
+    "decode": bench_decode,
+    "engines": bench_engines,
+    "fanout": bench_fanout,
+    "flatten": bench_flatten,
+    "roster": bench_roster,
+    "streams": bench_streams,
+}
+
+
+def main() -> None:
+    """Run the benchmark named on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--punches", type=int, default=2)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--in-flight", type=int, default=1000)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16],
+    )
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
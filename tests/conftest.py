@@ -0,0 +1,15 @@
+"""Shared fixtures for tap-paylocity tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from tests.mock_server import get_shared_server
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    """Serve two synthetic companies for the whole session, see `get_shared_server`."""
+    server = get_shared_server()
+    yield server
+    server.stop()
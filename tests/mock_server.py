@@ -0,0 +1,461 @@
+"""A local stand-in for the Paylocity WebLink and NextGen APIs.
+
+The server generates a synthetic company with a configurable number of employees and
+answers the endpoints used by the tap, optionally after an artificial delay and with
+injected 429, 404 or 400 answers, so that syncs can be tested and benchmarked
+without credentials or network access.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import typing as t
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_PAGE_SIZE = 25
+
+
+class MockCompany:
+    """Deterministic synthetic data for one company."""
+
+    def __init__(
+        self,
+        company_id: str = "149471",
+        employees: int = 50,
+        punches_per_employee: int = 2,
+        segments_per_punch: int = 2,
+    ) -> None:
+        """Create a synthetic company.
+
+        Args:
+            company_id: The company ID.
+            employees: The number of employees on the roster.
+            punches_per_employee: The number of punches returned per employee.
+            segments_per_punch: The number of segments of each punch.
+        """
+        self.company_id = company_id
+        self.employee_ids = [f"E{idx:05d}" for idx in range(employees)]
+        #: Fields overriding the generated details of an employee.
+        self.changes: dict[str, dict] = {}
+        #: Roster status codes overriding the generated ones, e.g. rehires.
+        self.statuses: dict[str, str] = {}
+        self.punches_per_employee = punches_per_employee
+        self.segments_per_punch = segments_per_punch
+
+    def employee(self, employee_id: str) -> dict:
+        """Return the roster entry of an employee."""
+        idx = int(employee_id[1:])
+        return {
+            "employeeId": employee_id,
+            "statusCode": self.statuses.get(
+                employee_id,
+                "T" if idx % 10 == 9 else "A",  # noqa: PLR2004
+            ),
+            "statusTypeCode": "A",
+        }
+
+    def employee_details(self, employee_id: str) -> dict:
+        """Return the details payload of an employee."""
+        idx = int(employee_id[1:])
+        status = self.employee(employee_id)["statusCode"]
+        return {
+            "employeeId": employee_id,
+            "firstName": f"First{idx}",
+            "lastName": f"Last{idx}",
+            "status": {
+                "employeeStatus": status,
+                "hireDate": "2020-01-01T00:00:00",
+                "terminationDate": self._termination_date(idx, status),
+            },
+            "primaryPayRate": {
+                "payType": "Hourly",
+                "annualSalary": 41600.25 + idx,
+                "baseRate": 20.01,
+                "ratePer": "Hour",
+                "payFrequency": "B",
+            },
+            "departmentPosition": {
+                "jobTitle": "Associate",
+                "positionCode": "ASSOC",
+                "supervisorEmployeeId": "E00000",
+            },
+            "homeAddress": {"address1": "1 Main St", "city": "Springfield"},
+            **self.changes.get(employee_id, {}),
+        }
+
+    @staticmethod
+    def _termination_date(idx: int, status: str) -> str | None:
+        """Return a termination date; half of the terminated employees left long ago."""
+        if status != "T":
+            return None
+        if idx % 20 == 19:  # noqa: PLR2004
+            return "2020-06-30T00:00:00"
+        return f"{date.today()}T00:00:00"
+
+    def punch_details(self, employee_id: str) -> list[dict]:
+        """Return the punches of an employee."""
+        punches = []
+        for punch in range(self.punches_per_employee):
+            day = f"2025-01-{punch + 1:02d}"
+            punches.append(
+                {
+                    "employeeId": employee_id,
+                    "badgeNumber": int(employee_id[1:]),
+                    "relativeStart": f"{day}T08:00:00",
+                    "relativeEnd": f"{day}T17:00:00",
+                    "segments": [
+                        {
+                            "punchID": f"{employee_id}-{punch}-{segment}",
+                            "origin": "WebPunch",
+                            "date": day,
+                            "punchType": "work",
+                            "relativeStart": f"{day}T{8 + segment:02d}:00:00",
+                            "relativeEnd": f"{day}T{9 + segment:02d}:00:00",
+                            "durationSeconds": 3600,
+                            "earnings": 20.01,
+                        }
+                        for segment in range(self.segments_per_punch)
+                    ],
+                },
+            )
+        return punches
+
+
+def _in_range(punches: list[dict], query: dict) -> list[dict]:
+    """Return the punches overlapping the requested relative range."""
+    start = query.get("relativeStart") or ""
+    end = query.get("relativeEnd") or "9999"
+    return [
+        punch
+        for punch in punches
+        if punch["relativeEnd"] >= start and punch["relativeStart"] <= end
+    ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockPaylocityServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    routes: t.ClassVar[list[tuple[str, str, str]]] = [
+        ("POST", r"/IdentityServer/connect/token", "token"),
+        ("POST", r"/public/security/v1/token", "token"),
+        ("GET", r"/api/v2/companies/(?P<cid>[^/]+)/employees", "employees"),
+        (
+            "GET",
+            r"/api/v2/companies/(?P<cid>[^/]+)/employees/(?P<eid>[^/]+)",
+            "employee_details",
+        ),
+        (
+            "GET",
+            r"/apiHub/time/v1/companies/(?P<cid>[^/]+)/employees/(?P<eid>[^/]+)"
+            r"/punchDetails",
+            "punch_details",
+        ),
+        (
+            "GET",
+            r"/apiHub/time/v1/companies/(?P<cid>[^/]+)/punchDetails",
+            "company_punch_details",
+        ),
+    ]
+
+    def log_message(self, *args: t.Any) -> None:
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.record_connection()
+
+    def _dispatch(self, method: str) -> None:
+        # Consume the body, so that the connection can be kept alive.
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        for route_method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, url.path)
+            if route_method == method and match:
+                self.server.record_request(name, query)
+                try:
+                    self._answer(name, query, match)
+                finally:
+                    self.server.record_answered(name)
+                return
+        self._send(404, {"message": "Not found"})
+
+    def _answer(self, name: str, query: dict, match: re.Match) -> None:
+        """Answer a request routed to the named endpoint."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        eid = match.groupdict().get("eid")
+        if name != "token" and self.server.is_throttled():
+            retry_after = {"Retry-After": str(self.server.retry_after)}
+            self._send(429, {"message": "Too many requests"}, retry_after, name)
+            return
+        if eid in self.server.missing.get(name, ()):
+            self._send(404, {"message": "Injected missing employee"}, name=name)
+            return
+        if eid in self.server.failures.get(name, ()):
+            self._send(400, {"message": "Injected failure"}, name=name)
+            return
+        # Handlers answer (status, body) or (status, body, headers).
+        answer = getattr(self, f"_{name}")(query, **match.groupdict())
+        self._send(*answer, name=name)
+
+    def _send(
+        self,
+        status: int,
+        body: t.Any,  # noqa: ANN401
+        headers: dict[str, str] | None = None,
+        name: str | None = None,
+    ) -> None:
+        payload = json.dumps(body).encode()
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        ok = status == 200  # noqa: PLR2004
+        if self.command == "GET" and ok and self.server.etags:
+            headers["ETag"] = f'"{hashlib.sha1(payload).hexdigest()}"'  # noqa: S324
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, payload = 304, b""
+        accepted = self.headers.get("Accept-Encoding", "")
+        if self.server.compression and payload and "gzip" in accepted:
+            payload = gzip.compress(payload)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        if name:
+            self.server.record_response(name, status, len(payload))
+
+    def _token(self, query: dict) -> tuple[int, t.Any]:  # noqa: ARG002
+        return 200, {
+            "access_token": f"mock-token-{self.server.request_counts['token']}",
+            "expires_in": self.server.token_expires_in,
+        }
+
+    def _employees(self, query: dict, cid: str) -> tuple[int, t.Any, dict[str, str]]:
+        company = self.server.companies.get(cid)
+        if company is None:
+            return 404, {"message": "Unknown company"}
+        page = int(query.get("pagenumber", 0))
+        size = int(query.get("pagesize", DEFAULT_PAGE_SIZE))
+        ids = company.employee_ids[page * size : (page + 1) * size]
+        headers = {}
+        if query.get("includetotalcount") == "true":
+            headers["X-Pcty-Total-Count"] = str(len(company.employee_ids))
+        return 200, [company.employee(eid) for eid in ids], headers
+
+    def _employee_details(self, query: dict, cid: str, eid: str) -> tuple[int, t.Any]:  # noqa: ARG002
+        company = self.server.companies.get(cid)
+        if company is None or eid not in company.employee_ids:
+            return 404, {"message": "Unknown employee"}
+        return 200, company.employee_details(eid)
+
+    def _punch_details(self, query: dict, cid: str, eid: str) -> tuple[int, t.Any]:  # noqa: ARG002
+        company = self.server.companies.get(cid)
+        if company is None or eid not in company.employee_ids:
+            return 404, {"message": "Unknown employee"}
+        return 200, _in_range(company.punch_details(eid), query)
+
+    def _company_punch_details(self, query: dict, cid: str) -> tuple[int, t.Any]:
+        company = self.server.companies.get(cid)
+        if company is None:
+            return 404, {"message": "Unknown company"}
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 1000))
+        punches = [
+            punch
+            for eid in company.employee_ids
+            for punch in _in_range(company.punch_details(eid), query)
+        ]
+        return 200, punches[offset : offset + limit]
+
+
+class MockPaylocityServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering both Paylocity API families."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        companies: t.Iterable[MockCompany] = (),
+        latency: float = 0.0,
+    ) -> None:
+        """Create a server listening on a free local port.
+
+        Args:
+            companies: The companies served; defaults to one small company.
+            latency: Seconds to sleep before answering each request.
+        """
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.companies = {c.company_id: c for c in companies or [MockCompany()]}
+        self.latency = latency
+        #: The lifetime of the access tokens issued, in seconds.
+        self.token_expires_in = 3600
+        #: Whether responses are gzipped for clients accepting it.
+        self.compression = False
+        #: The number of client connections accepted.
+        self.connections = 0
+        #: Whether responses carry an ETag and honor If-None-Match.
+        self.etags = True
+        #: Employee IDs whose requests fail, by endpoint name.
+        self.failures: dict[str, set[str]] = {}
+        #: Employee IDs answered with 404 Not Found, by endpoint name.
+        self.missing: dict[str, set[str]] = {}
+        #: Answer every this many API requests with 429 Too Many Requests; 0 never.
+        self.throttle_every = 0
+        #: The Retry-After seconds of 429 answers.
+        self.retry_after = 0
+        self._api_requests = 0
+        self.request_counts: dict[str, int] = {}
+        #: The most requests of each endpoint answered at once.
+        self.peak_requests: dict[str, int] = {}
+        self._in_flight: dict[str, int] = {}
+        self.requests: list[tuple[str, dict]] = []
+        self.responses: list[tuple[str, int, int]] = []
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Return the root URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_request(self, name: str, query: dict) -> None:
+        """Log a request to the named endpoint."""
+        with self._lock:
+            self.request_counts[name] = self.request_counts.get(name, 0) + 1
+            self.requests.append((name, query))
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+            self.peak_requests[name] = max(
+                self.peak_requests.get(name, 0),
+                self._in_flight[name],
+            )
+
+    def record_answered(self, name: str) -> None:
+        """Count a request of the named endpoint as answered."""
+        with self._lock:
+            self._in_flight[name] -= 1
+
+    def is_throttled(self) -> bool:
+        """Count an API request and return whether to answer it with a 429."""
+        with self._lock:
+            self._api_requests += 1
+            return bool(self.throttle_every) and (
+                self._api_requests % self.throttle_every == 0
+            )
+
+    def record_connection(self) -> None:
+        """Count a new client connection."""
+        with self._lock:
+            self.connections += 1
+
+    def record_response(self, name: str, status: int, size: int) -> None:
+        """Log the status and body size of a response of the named endpoint."""
+        with self._lock:
+            self.responses.append((name, status, size))
+
+    def reset(self) -> None:
+        """Forget the requests served so far."""
+        with self._lock:
+            self.request_counts.clear()
+            self.peak_requests.clear()
+            self.connections = 0
+            self._api_requests = 0
+            self.requests.clear()
+            self.responses.clear()
+
+    def start(self) -> MockPaylocityServer:
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.shutdown()
+        self.server_close()
+
+    def tap_config(self, **overrides: t.Any) -> dict:
+        """Return a tap config pointed at this server."""
+        return {
+            "client_id": "mock-client",
+            "client_secret": "mock-secret",
+            "nextgen_client_id": "mock-client",
+            "nextgen_client_secret": "mock-secret",
+            "company_id": next(iter(self.companies)),
+            "start_date": "2025-01-01T00:00:00",
+            "end_date": "2025-01-31T00:00:00",
+            "api_url": self.url,
+            "nextgen_api_url": self.url,
+            "rate_limit_requests_per_second": 10000,
+            **overrides,
+        }
+
+
+_SHARED_SERVER: MockPaylocityServer | None = None
+
+
+def get_shared_server() -> MockPaylocityServer:
+    """Return the server shared by the whole test session, starting it if needed.
+
+    The authenticators are process-wide singletons bound to the first token
+    endpoint they see, so every test must use the same server. Two synthetic
+    companies are served.
+    """
+    global _SHARED_SERVER  # noqa: PLW0603
+    if _SHARED_SERVER is None:
+        _SHARED_SERVER = MockPaylocityServer(
+            [MockCompany(employees=60), MockCompany(company_id="200001", employees=15)],
+        ).start()
+    return _SHARED_SERVER
+
+
+def run_tap(
+    config: dict,
+    state: dict | None = None,
+    errors: list[Exception] | None = None,
+    catalog: dict | None = None,
+) -> list[dict]:
+    """Run a full sync in-process and return the Singer messages it wrote.
+
+    Args:
+        config: The tap config.
+        state: An optional state to resume from.
+        errors: If given, a failed sync appends its error here instead of raising,
+            and the messages written before the failure are returned.
+        catalog: An optional catalog, e.g. to select some streams only.
+
+    Returns:
+        The parsed Singer messages, in the order they were written.
+    """
+    import contextlib  # noqa: PLC0415
+    import io  # noqa: PLC0415
+
+    from tap_paylocity.tap import TapPaylocity  # noqa: PLC0415
+
+    tap = TapPaylocity(config=config, state=state, catalog=catalog, setup_mapper=True)
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        try:
+            tap.sync_all()
+        except Exception as ex:
+            if errors is None:
+                raise
+            errors.append(ex)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
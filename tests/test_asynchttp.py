@@ -0,0 +1,128 @@
+"""Tests for the asyncio request engine of the NextGen punch API."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from singer_sdk.exceptions import ConfigValidationError
+
+from tap_paylocity.asynchttp import close_engines, get_engine
+from tap_paylocity.streams import PunchDetails
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import run_tap
+
+pytest.importorskip("httpx")
+
+
+def _punch_records(messages: list[dict]) -> list[dict]:
+    return [
+        m["record"]
+        for m in messages
+        if m["type"] == "RECORD" and m["stream"] == "punch_details"
+    ]
+
+
+def test_async_engine_matches_thread_pool(mock_server):
+    expected = _punch_records(run_tap(mock_server.tap_config(max_concurrency=4)))
+
+    mock_server.reset()
+    config = mock_server.tap_config(max_concurrency=4, http_engine="asyncio")
+    assert _punch_records(run_tap(config)) == expected
+    assert mock_server.request_counts["punch_details"] == len(
+        {record["employeeId"] for record in expected},
+    )
+
+
+def test_async_engine_splits_windows(mock_server):
+    expected = _punch_records(run_tap(mock_server.tap_config()))
+    employees = len({record["employeeId"] for record in expected})
+
+    mock_server.reset()
+    config = mock_server.tap_config(
+        max_concurrency=4,
+        http_engine="asyncio",
+        punch_window_days=7,
+        punch_max_response_bytes=900,
+    )
+    assert _punch_records(run_tap(config)) == expected
+    assert mock_server.request_counts["punch_details"] > 5 * employees
+
+
+def test_async_engine_retries_throttled_requests(mock_server, monkeypatch):
+    config = mock_server.tap_config(max_concurrency=4, http_engine="asyncio")
+    expected = _punch_records(run_tap(config))
+    # The host's bucket is shared by the whole session; restore its rate after.
+    bucket = TapPaylocity(config=config).streams["punch_details"].rate_limiter
+    monkeypatch.setattr(bucket, "rate", bucket.rate)
+    monkeypatch.setattr(mock_server, "throttle_every", 20)
+    mock_server.reset()
+
+    assert _punch_records(run_tap(config)) == expected
+    assert 429 in {status for _, status, _ in mock_server.responses}
+
+
+def test_tokens_are_not_fetched_on_the_event_loop(mock_server, monkeypatch):
+    stream = TapPaylocity(
+        config=mock_server.tap_config(http_engine="asyncio"),
+    ).streams["punch_details"]
+    authenticator = stream.authenticator
+    update = authenticator.update_access_token
+    threads = []
+
+    def update_access_token() -> None:
+        threads.append(threading.current_thread().name)
+        update()
+
+    monkeypatch.setattr(authenticator, "update_access_token", update_access_token)
+    monkeypatch.setattr(authenticator, "last_refreshed", None)
+    context = {"companyId": mock_server.tap_config()["company_id"], "employeeId": "E00001"}
+    request = stream.http_engine.run(stream.prepare_request_async(context, None))
+
+    assert request.headers["Authorization"].startswith("Bearer ")
+    assert threads
+    assert "http-engine" not in threads
+
+
+def test_unknown_engine_is_rejected(mock_server):
+    stream = TapPaylocity(
+        config=mock_server.tap_config(http_engine="trio"),
+        validate_config=False,
+    ).streams["punch_details"]
+
+    with pytest.raises(ConfigValidationError):
+        stream.http_engine  # noqa: B018
+
+
+def test_records_are_parsed_and_post_processed_off_the_loop(mock_server, monkeypatch):
+    threads = set()
+    flatten_punches = PunchDetails.flatten_punches
+    post_process = PunchDetails.post_process
+
+    def flatten(self, records):
+        threads.add(threading.current_thread().name)
+        yield from flatten_punches(self, records)
+
+    def process(self, row, context=None):
+        threads.add(threading.current_thread().name)
+        return post_process(self, row, context)
+
+    monkeypatch.setattr(PunchDetails, "flatten_punches", flatten)
+    monkeypatch.setattr(PunchDetails, "post_process", process)
+    records = _punch_records(
+        run_tap(mock_server.tap_config(max_concurrency=4, http_engine="asyncio")),
+    )
+
+    assert records
+    assert threads
+    assert "http-engine" not in threads
+
+
+def test_engines_are_closed_at_exit():
+    engine = get_engine(http2=False, max_connections=1, max_in_flight=1)
+    close_engines()
+
+    assert not engine._thread.is_alive()  # noqa: SLF001
+    assert engine._loop.is_closed()  # noqa: SLF001
+    assert get_engine(http2=False, max_connections=1, max_in_flight=1) is not engine
+    close_engines()
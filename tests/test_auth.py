@@ -0,0 +1,63 @@
+"""Tests for the OAuth token cache."""
+
+from __future__ import annotations
+
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+
+from tap_paylocity.auth import PaylocityAuthenticator
+from tap_paylocity.tap import TapPaylocity
+
+
+def _authenticator(mock_server, **config) -> PaylocityAuthenticator:
+    # Each subclass is a new singleton, like a new tap process.
+    class Authenticator(PaylocityAuthenticator):
+        pass
+
+    tap = TapPaylocity(config=mock_server.tap_config(**config))
+    return Authenticator.create_for_stream(tap.streams["employees"])
+
+
+def _authorization(authenticator: PaylocityAuthenticator) -> str:
+    request = requests.Request("GET", "http://localhost/").prepare()
+    return authenticator.authenticate_request(request).headers["Authorization"]
+
+
+def test_token_reused_across_runs(mock_server, tmp_path):
+    path = tmp_path / "tokens.db"
+    mock_server.reset()
+
+    first = _authorization(_authenticator(mock_server, token_cache_path=str(path)))
+    second = _authorization(_authenticator(mock_server, token_cache_path=str(path)))
+
+    assert first == second
+    assert mock_server.request_counts["token"] == 1
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_token_refreshed_in_background_before_expiry(mock_server):
+    authenticator = _authenticator(mock_server, token_refresh_margin_seconds=300)
+    mock_server.reset()
+    token = _authorization(authenticator)
+
+    # Near expiry, the current token is used while a new one is requested.
+    authenticator.last_refreshed -= timedelta(seconds=3400)
+    assert _authorization(authenticator) == token
+    authenticator._refresh_thread.join()  # noqa: SLF001
+
+    assert mock_server.request_counts["token"] == 2
+    assert _authorization(authenticator) != token
+
+
+def test_concurrent_requests_share_one_token(mock_server):
+    authenticator = _authenticator(mock_server)
+    mock_server.reset()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        headers = set(executor.map(lambda _: _authorization(authenticator), range(64)))
+
+    assert len(headers) == 1
+    assert mock_server.request_counts["token"] == 1
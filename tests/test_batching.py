@@ -0,0 +1,78 @@
+"""Tests for BATCH message output."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from urllib.parse import urlparse
+
+from tests.mock_server import run_tap
+
+
+def _batch_config(tmp_path, **overrides):
+    return {
+        "encoding": {"format": "jsonl", "compression": "gzip"},
+        "storage": {"root": f"file://{tmp_path}", "prefix": "test-"},
+        **overrides,
+    }
+
+
+def _read_manifest(manifest):
+    records = []
+    for url in manifest:
+        with gzip.open(urlparse(url).path, "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_chosen_streams_are_written_to_batch_files(mock_server, tmp_path):
+    expected = [
+        m["record"]
+        for m in run_tap(mock_server.tap_config())
+        if m["type"] == "RECORD" and m["stream"] == "punch_details"
+    ]
+    # Without checkpoints, child STATE messages end the files of every employee.
+    config = mock_server.tap_config(
+        batch_config=_batch_config(tmp_path, batch_size=500),
+        batch_streams=["punch_details"],
+        checkpoint_interval=100,
+    )
+    messages = run_tap(config)
+
+    batches = [m for m in messages if m["type"] == "BATCH"]
+    assert {m["stream"] for m in batches} == {"punch_details"}
+    assert not [
+        m for m in messages if m["type"] == "RECORD" and m["stream"] == "punch_details"
+    ]
+    assert [m for m in messages if m["type"] == "RECORD" and m["stream"] == "employees"]
+
+    records = []
+    for batch in batches:
+        batch_records = _read_manifest(batch["manifest"])
+        assert 0 < len(batch_records) <= 500
+        records.extend(batch_records)
+    assert records == expected
+
+    # Batch files are completed before each state covering their records.
+    last_batch = max(i for i, m in enumerate(messages) if m["type"] == "BATCH")
+    assert messages[-1]["type"] == "STATE"
+    assert last_batch < len(messages) - 1
+
+
+def test_batch_files_roll_over_by_size(mock_server, tmp_path):
+    def batches(**overrides):
+        config = mock_server.tap_config(
+            batch_config=_batch_config(tmp_path),
+            batch_streams=["employees"],
+            checkpoint_interval=100,
+            **overrides,
+        )
+        return [m for m in run_tap(config) if m["type"] == "BATCH"]
+
+    (whole,) = batches()
+    rolled = batches(batch_max_bytes=2000)
+
+    assert len(rolled) > 1
+    assert [r for m in rolled for r in _read_manifest(m["manifest"])] == _read_manifest(
+        whole["manifest"],
+    )
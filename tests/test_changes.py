@@ -0,0 +1,87 @@
+"""Tests for emitting changed employee details only."""
+
+from __future__ import annotations
+
+from tap_paylocity.changes import fingerprint
+from tap_paylocity.streams import EmployeeDetailsStream
+from tests.mock_server import run_tap
+
+
+def _details(messages: list[dict]) -> list[dict]:
+    return [
+        m["record"]
+        for m in messages
+        if m["type"] == "RECORD" and m["stream"] == "employee_details"
+    ]
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": "x"}) == fingerprint({"b": "x", "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 1.5})
+
+
+def test_only_changed_details_are_emitted(mock_server, monkeypatch, tmp_path):
+    config = mock_server.tap_config(change_data_path=str(tmp_path / "changes.db"))
+    assert len(_details(run_tap(config))) == 60
+
+    assert _details(run_tap(config)) == []
+
+    company = mock_server.companies[config["company_id"]]
+    monkeypatch.setitem(company.changes, "E00007", {"lastName": "Married"})
+    (record,) = _details(run_tap(config))
+    assert record["employeeId"] == "E00007"
+    assert record["lastName"] == "Married"
+
+
+def test_removed_employees_are_tombstoned(mock_server, monkeypatch, tmp_path):
+    config = mock_server.tap_config(
+        change_data_path=str(tmp_path / "changes.db"),
+        change_data_tombstones=True,
+    )
+    messages = run_tap(config)
+    (schema,) = {
+        str(m["schema"]) for m in messages
+        if m["type"] == "SCHEMA" and m["stream"] == "employee_details"
+    }
+    assert "_sdc_deleted_at" in schema
+
+    company = mock_server.companies[config["company_id"]]
+    monkeypatch.setattr(
+        company,
+        "employee_ids",
+        [eid for eid in company.employee_ids if eid != "E00003"],
+    )
+    synced = []
+    sync = EmployeeDetailsStream.sync
+    monkeypatch.setattr(
+        EmployeeDetailsStream,
+        "sync",
+        lambda self, context=None: synced.append(context) or sync(self, context),
+    )
+    (tombstone,) = _details(run_tap(config))
+    # Tombstones are written without syncing their context.
+    assert all(context["employeeId"] != "E00003" for context in synced)
+    assert tombstone["employeeId"] == "E00003"
+    assert tombstone["companyId"] == config["company_id"]
+    assert tombstone["_sdc_deleted_at"]
+    assert "lastName" not in tombstone
+
+    # Tombstones are emitted once.
+    assert _details(run_tap(config)) == []
+
+
+def test_shards_sharing_fingerprints_keep_each_others_keys(mock_server, tmp_path):
+    def config(index: int) -> dict:
+        return mock_server.tap_config(
+            change_data_path=str(tmp_path / "changes.db"),
+            change_data_tombstones=True,
+            shard_index=index,
+            shard_count=2,
+        )
+
+    first = _details(run_tap(config(0)))
+    second = _details(run_tap(config(1)))
+
+    assert len(first) + len(second) == 60
+    assert not any("_sdc_deleted_at" in record for record in second)
+    assert _details(run_tap(config(0))) == []
@@ -0,0 +1,62 @@
+"""Tests for resumable child stream checkpoints."""
+
+from __future__ import annotations
+
+import pytest
+
+from tests.mock_server import run_tap
+
+
+def _last_state(messages: list[dict]) -> dict:
+    return [m for m in messages if m["type"] == "STATE"][-1]["value"]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_interrupted_sync_resumes_from_checkpoint(
+    mock_server,
+    monkeypatch,
+    concurrency,
+):
+    config = mock_server.tap_config(
+        checkpoint_interval=10,
+        max_concurrency=concurrency,
+    )
+    monkeypatch.setitem(mock_server.failures, "employee_details", {"E00035"})
+
+    errors: list[Exception] = []
+    state = _last_state(run_tap(config, errors=errors))
+    assert errors
+    (partition,) = state["bookmarks"]["employees"]["partitions"]
+    assert partition["completed_children"] == [f"E{i:05d}" for i in range(30)]
+
+    monkeypatch.delitem(mock_server.failures, "employee_details")
+    mock_server.reset()
+    messages = run_tap(config, state=state)
+
+    synced = sorted(
+        query["employeeId"]
+        for name, query in mock_server.requests
+        if name == "punch_details"
+    )
+    assert synced == [f"E{i:05d}" for i in range(30, 60)]
+    assert mock_server.request_counts["employee_details"] == 30
+    state = _last_state(messages)
+    assert "completed_children" not in state["bookmarks"]["employees"]["partitions"][0]
+    punches = state["bookmarks"]["punch_details"]["partitions"]
+    assert len(punches) == 60
+    assert all(p["replication_key_value"] == "2025-01-02T10:00:00" for p in punches)
+
+
+def test_child_state_is_written_at_checkpoints(mock_server):
+    every_context = run_tap(mock_server.tap_config())
+    checkpointed = run_tap(mock_server.tap_config(checkpoint_interval=20))
+
+    def states(messages):
+        return [m for m in messages if m["type"] == "STATE"]
+
+    # Checkpoints are opt-in: by default, every child context writes its state.
+    disabled = run_tap(mock_server.tap_config(checkpoint_interval=0))
+    assert len(states(every_context)) == len(states(disabled))
+    assert _last_state(every_context) == _last_state(disabled)
+    assert len(states(checkpointed)) < len(states(every_context)) / 10
+    assert _last_state(checkpointed) == _last_state(every_context)
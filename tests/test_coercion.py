@@ -0,0 +1,131 @@
+"""Tests for compiled record coercion and validation."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+
+import pytest
+from singer_sdk import typing as th
+from singer_sdk.exceptions import InvalidRecord
+
+from tap_paylocity.coercion import RecordCoercer
+from tests.mock_server import run_tap
+
+SCHEMA = th.PropertiesList(
+    th.Property("id", th.StringType),
+    th.Property("count", th.IntegerType),
+    th.Property("rate", th.NumberType),
+    th.Property("active", th.BooleanType),
+    th.Property("hired", th.DateTimeType),
+    th.Property("born", th.DateType),
+).to_dict()
+
+
+def test_values_are_coerced_to_the_schema():
+    coerce = RecordCoercer(SCHEMA)
+
+    assert coerce(
+        {
+            "id": "E1",
+            "count": "3",
+            "rate": "20.01",
+            "active": 1,
+            "hired": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+            "born": datetime.date(1990, 5, 17),
+            "extra": True,
+        },
+    ) == {
+        "id": "E1",
+        "count": 3,
+        "rate": decimal.Decimal("20.01"),
+        "active": True,
+        "hired": "2020-01-01T00:00:00+00:00",
+        "born": "1990-05-17",
+    }
+    assert coerce.unmapped == {"extra"}
+    assert coerce({"id": None, "rate": None}) == {"id": None, "rate": None}
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"id": 1},
+        {"count": "three"},
+        {"count": True},
+        {"rate": "n/a"},
+        {"hired": "yesterday"},
+        {"born": 19900517},
+    ],
+)
+def test_invalid_values_are_rejected(record):
+    with pytest.raises(InvalidRecord):
+        RecordCoercer(SCHEMA)(record)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2020-01-01T08:30:00Z", "2020-01-01T08:30:00+00:00"),
+        ("2020-01-01t08:30:00.125z", "2020-01-01T08:30:00.125+00:00"),
+        ("2020-01-01T08:30:00-05:00", "2020-01-01T08:30:00-05:00"),
+        ("2020-01-01T08:30:00.5+05:30", "2020-01-01T08:30:00.5+05:30"),
+        ("2020-01-01T08:30:00", "2020-01-01T08:30:00"),
+        ("2016-12-31T23:59:60Z", "2016-12-31T23:59:60+00:00"),
+        ("2020-01-01", None),
+        ("2020-01-01 08:30:00", None),
+        ("20200101T083000Z", None),
+        ("2020-02-30T08:30:00Z", None),
+        ("2020-01-01T24:00:00", None),
+        ("2020-01-01T08:30:00+24:00", None),
+    ],
+)
+def test_date_times_are_rfc_3339(value, expected):
+    coerce = RecordCoercer(SCHEMA)
+    if expected:
+        assert coerce({"hired": value}) == {"hired": expected}
+    else:
+        with pytest.raises(InvalidRecord):
+            coerce({"hired": value})
+
+
+@pytest.mark.parametrize(
+    ("value", "valid"),
+    [
+        ("1990-05-17", True),
+        ("1990-05-17T00:00:00Z", False),
+        ("19900517", False),
+        ("1990-W20", False),
+        ("1990-02-30", False),
+    ],
+)
+def test_dates_are_rfc_3339(value, valid):
+    coerce = RecordCoercer(SCHEMA)
+    if valid:
+        assert coerce({"born": value}) == {"born": value}
+    else:
+        with pytest.raises(InvalidRecord):
+            coerce({"born": value})
+
+
+def test_coerce_only_does_not_validate():
+    coerce = RecordCoercer(SCHEMA, validate=False, selected=["id", "hired"])
+
+    assert coerce({"id": 1, "hired": "yesterday", "count": 3}) == {
+        "id": 1,
+        "hired": "yesterday",
+    }
+
+
+@pytest.mark.parametrize("mode", ["compiled", "coerce_only"])
+def test_compiled_records_match_sdk_records(mock_server, mode):
+    def records(record_validation):
+        config = mock_server.tap_config(record_validation=record_validation)
+        return [
+            (m["stream"], m["record"]) for m in run_tap(config) if m["type"] == "RECORD"
+        ]
+
+    expected = records("sdk")
+
+    assert expected
+    assert records(mode) == expected
@@ -0,0 +1,82 @@
+"""Tests for concurrent child stream fan-out."""
+
+from __future__ import annotations
+
+from tests.mock_server import run_tap
+
+
+def _records(messages: list[dict]) -> list[tuple[str, dict]]:
+    return [(m["stream"], m["record"]) for m in messages if m["type"] == "RECORD"]
+
+
+def test_fan_out_matches_sequential_sync(mock_server):
+    sequential = run_tap(mock_server.tap_config(max_concurrency=1))
+    concurrent = run_tap(mock_server.tap_config(max_concurrency=8))
+
+    assert _records(concurrent) == _records(sequential)
+    assert [m for m in concurrent if m["type"] == "STATE"][-1] == [
+        m for m in sequential if m["type"] == "STATE"
+    ][-1]
+
+
+def test_fan_out_keeps_roster_order(mock_server):
+    records = _records(run_tap(mock_server.tap_config(max_concurrency=8)))
+
+    roster = [r["employeeId"] for s, r in records if s == "employees"]
+    details = [r["employeeId"] for s, r in records if s == "employee_details"]
+    assert details == roster
+
+
+def test_companies_are_separate_partitions(mock_server):
+    config = mock_server.tap_config(company_ids=["149471", "200001"])
+    sequential = run_tap(config)
+    concurrent = run_tap({**config, "max_concurrency": 8})
+
+    assert _records(concurrent) == _records(sequential)
+    employees = [r for s, r in _records(concurrent) if s == "employees"]
+    assert len(employees) == 75
+    assert [r["companyId"] for r in employees] == ["149471"] * 60 + ["200001"] * 15
+
+    state = [m for m in concurrent if m["type"] == "STATE"][-1]["value"]
+    contexts = [
+        p["context"] for p in state["bookmarks"]["punch_details"]["partitions"]
+    ]
+    assert {c["companyId"] for c in contexts} == {"149471", "200001"}
+    assert len(contexts) == 75
+
+
+def test_parallel_pages_keep_roster_order(mock_server):
+    sequential = run_tap(mock_server.tap_config(employees_page_size=7))
+    mock_server.reset()
+    parallel = run_tap(
+        mock_server.tap_config(
+            employees_page_size=7,
+            employees_parallel_pages=True,
+            max_concurrency=4,
+        ),
+    )
+
+    assert _records(parallel) == _records(sequential)
+    pages = [q for name, q in mock_server.requests if name == "employees"]
+    # ceil(60 / 7) pages, without the trailing empty page of sequential syncs.
+    assert sorted(int(q.get("pagenumber", 0)) for q in pages) == list(range(9))
+    assert [q.get("includetotalcount") for q in pages].count("true") == 1
+
+
+def test_child_requests_start_before_roster_is_listed(mock_server):
+    mock_server.reset()
+    records = _records(
+        run_tap(
+            mock_server.tap_config(
+                employees_page_size=7,
+                max_concurrency=4,
+                pipeline_queue_size=5,
+            ),
+        ),
+    )
+
+    names = [name for name, _ in mock_server.requests]
+    last_page = len(names) - names[::-1].index("employees") - 1
+    assert names.index("employee_details") < last_page
+    roster = [r["employeeId"] for s, r in records if s == "employees"]
+    assert roster == [f"E{i:05d}" for i in range(60)]
@@ -7,6 +7,7 @@ import os
 from singer_sdk.testing import get_tap_test_class
 
 from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import get_shared_server
 
 SAMPLE_CONFIG: dict[str, Any] = {
     "start_date": "2025-01-01",
@@ -18,6 +19,10 @@ SAMPLE_CONFIG: dict[str, Any] = {
     "company_id": os.getenv("TAP_PAYLOCITY_COMPANY_ID"),
 }
 
+# Without live credentials, run the tests offline against the mock server.
+if not SAMPLE_CONFIG["client_id"]:
+    SAMPLE_CONFIG = get_shared_server().tap_config()
+
 
 # Run standard built-in tap tests from the SDK:
 TestTapPaylocity = get_tap_test_class(
@@ -0,0 +1,73 @@
+"""Tests for skipping the child streams of inactive employees."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import run_tap
+
+# Terminated employees of the 60-employee company: every 10th, half of them long ago.
+TERMINATED = {f"E{i:05d}" for i in range(9, 60, 10)}
+LONG_TERMINATED = {"E00019", "E00039", "E00059"}
+
+
+def _synced(mock_server, name: str) -> set[str]:
+    return {query["employeeId"] for n, query in mock_server.requests if n == name}
+
+
+def test_child_streams_filtered_by_status(mock_server):
+    mock_server.reset()
+    run_tap(mock_server.tap_config(child_stream_status_codes=["A"]))
+
+    assert mock_server.request_counts["employee_details"] == 54
+    assert not _synced(mock_server, "punch_details") & TERMINATED
+
+
+def test_frozen_employees_skipped_until_rehired(mock_server, monkeypatch, tmp_path):
+    config = mock_server.tap_config(frozen_employees_path=str(tmp_path / "frozen.db"))
+
+    mock_server.reset()
+    run_tap(config)
+    assert mock_server.request_counts["employee_details"] == 60
+
+    mock_server.reset()
+    run_tap(config)
+    assert mock_server.request_counts["employee_details"] == 57
+    assert not _synced(mock_server, "punch_details") & LONG_TERMINATED
+
+    company = mock_server.companies[config["company_id"]]
+    monkeypatch.setitem(company.statuses, "E00039", "A")
+    mock_server.reset()
+    run_tap(config)
+    assert "E00039" in _synced(mock_server, "employee_details")
+    assert mock_server.request_counts["employee_details"] == 58
+
+    # Once synced as active again, the employee is no longer frozen.
+    monkeypatch.setitem(company.statuses, "E00039", "T")
+    mock_server.reset()
+    run_tap(config)
+    assert mock_server.request_counts["employee_details"] == 58
+
+
+def test_recently_terminated_employees_synced_in_grace_period(mock_server, tmp_path):
+    config = mock_server.tap_config(
+        frozen_employees_path=str(tmp_path / "frozen.db"),
+        terminated_grace_days=10000,
+    )
+    run_tap(config)
+    mock_server.reset()
+    run_tap(config)
+
+    assert mock_server.request_counts["employee_details"] == 60
+
+
+def test_termination_dates_with_time_zones(mock_server):
+    stream = TapPaylocity(config=mock_server.tap_config()).streams["employee_details"]
+
+    def terminated_on(termination_date: str) -> dict:
+        return {"status": {"employeeStatus": "T", "terminationDate": termination_date}}
+
+    assert stream.is_frozen(terminated_on("2020-06-30T00:00:00Z"))
+    assert stream.is_frozen(terminated_on("2020-06-30T00:00:00-05:00"))
+    assert not stream.is_frozen(terminated_on(f"{date.today()}T00:00:00Z"))
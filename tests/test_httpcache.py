@@ -0,0 +1,96 @@
+"""Tests for the persistent HTTP cache."""
+
+from __future__ import annotations
+
+import stat
+import time
+
+from tap_paylocity.httpcache import HTTPCache
+from tests.mock_server import run_tap
+
+
+def _details(messages: list[dict]) -> list[dict]:
+    return [
+        m["record"]
+        for m in messages
+        if m["type"] == "RECORD" and m["stream"] == "employee_details"
+    ]
+
+
+def _statuses(mock_server) -> list[int]:
+    return [
+        status
+        for name, status, _ in mock_server.responses
+        if name == "employee_details"
+    ]
+
+
+def test_unchanged_details_are_revalidated(mock_server, tmp_path, monkeypatch):
+    config = mock_server.tap_config(http_cache_path=str(tmp_path / "cache.db"))
+    expected = _details(run_tap(config))
+
+    company = mock_server.companies["149471"]
+    monkeypatch.setitem(company.changes, "E00003", {"firstName": "Renamed"})
+    mock_server.reset()
+    records = _details(run_tap(config))
+
+    statuses = _statuses(mock_server)
+    assert statuses.count(200) == 1
+    assert statuses.count(304) == len(statuses) - 1
+    assert [r for r in records if r["firstName"] != "Renamed"] == [
+        r for r in expected if r["employeeId"] != "E00003"
+    ]
+
+
+def test_equal_bodies_update_validators_only(tmp_path):
+    cache = HTTPCache(tmp_path / "cache.db")
+    cache.put("https://example.com/a", b'{"a": 1}')
+    cache.put("https://example.com/a", b'{"a": 1}', etag='"v2"')
+    assert cache.get("https://example.com/a").etag == '"v2"'
+    cache.put("https://example.com/a", b'{"a": 2}')
+    assert cache.get("https://example.com/a").body == b'{"a": 2}'
+
+
+def test_cache_file_is_private(tmp_path):
+    path = tmp_path / "cache.db"
+    HTTPCache(path)
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_eviction_by_ttl_and_lru(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = HTTPCache(path, max_entries=2)
+    for url in ("a", "b", "c"):
+        cache.put(url, url.encode())
+        time.sleep(0.01)
+    cache.touch("a")
+
+    cache = HTTPCache(path, max_entries=2)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+
+    cache = HTTPCache(path, ttl_days=0)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_not_modified_after_eviction_is_fetched_again(mock_server, tmp_path, monkeypatch):
+    config = mock_server.tap_config(http_cache_path=str(tmp_path / "cache.db"))
+    expected = _details(run_tap(config))
+
+    get = HTTPCache.get
+
+    def evicted_before_response(self, url, *, include_expired=False):
+        # Evict each entry after its request was made conditional.
+        if include_expired:
+            self.execute("DELETE FROM responses WHERE url = ?", (url,))
+        return get(self, url, include_expired=include_expired)
+
+    monkeypatch.setattr(HTTPCache, "get", evicted_before_response)
+    mock_server.reset()
+    records = _details(run_tap(config))
+
+    statuses = _statuses(mock_server)
+    assert records == expected
+    assert statuses.count(304) == statuses.count(200) == len(expected)
@@ -0,0 +1,117 @@
+"""Tests for the performance metrics of syncs."""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+
+import pytest
+
+from tap_paylocity.instrumentation import Histogram, get_performance_metrics
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import run_tap
+
+
+def test_histogram_quantiles_and_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1.0) == float("inf")
+    assert histogram.cumulative_counts() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.summary()["sum"] == 2.6
+
+
+def test_json_summary_covers_each_endpoint(mock_server, monkeypatch, tmp_path):
+    bucket = TapPaylocity(config=mock_server.tap_config()).streams["employees"].rate_limiter
+    monkeypatch.setattr(bucket, "rate", bucket.rate)
+    monkeypatch.setattr(mock_server, "throttle_every", 40)
+    mock_server.reset()
+    path = tmp_path / "metrics.json"
+    messages = run_tap(mock_server.tap_config(metrics_path=str(path)))
+
+    summary = json.loads(path.read_text())
+    endpoints = {e["stream"]: e for e in summary["endpoints"] if e["stream"] != "auth"}
+    assert set(endpoints) == {"employees", "employee_details", "punch_details"}
+    for name, endpoint in endpoints.items():
+        requests = sum(endpoint["requests"].values())
+        assert requests == mock_server.request_counts[name]
+        assert endpoint["latency"]["count"] == requests
+        assert endpoint["retries"] == endpoint["requests"].get("429", 0)
+        assert endpoint["bytes_received"] > 0
+    assert sum(e["retries"] for e in endpoints.values()) > 0
+
+    records = [m["stream"] for m in messages if m["type"] == "RECORD"]
+    for name, stream in summary["streams"].items():
+        assert stream["records"] == records.count(name)
+        assert stream["records_per_second"] > 0
+
+
+def test_prometheus_textfile(mock_server, tmp_path):
+    path = tmp_path / "tap.prom"
+    run_tap(mock_server.tap_config(metrics_path=str(path), metrics_format="prometheus"))
+
+    lines = path.read_text().splitlines()
+    assert "# TYPE tap_paylocity_http_request_duration_seconds histogram" in lines
+    labels = 'stream="employees",endpoint="/v2/companies/{companyId}/employees"'
+    (count,) = [
+        line for line in lines
+        if line.startswith(f"tap_paylocity_http_request_duration_seconds_count{{{labels}}}")
+    ]
+    (infinite,) = [line for line in lines if f'{{{labels},le="+Inf"}}' in line]
+    assert count.split()[-1] == infinite.split()[-1] == "4"
+    assert f'tap_paylocity_http_requests_total{{{labels},status="200"}} 4' in lines
+
+
+def _endpoints(path) -> dict[str, dict]:
+    summary = json.loads(path.read_text())
+    return {e["stream"]: e for e in summary["endpoints"]}
+
+
+def test_tolerated_not_found_responses_are_counted(mock_server, monkeypatch, tmp_path):
+    monkeypatch.setitem(mock_server.missing, "punch_details", {"E00001", "E00002"})
+    path = tmp_path / "metrics.json"
+    run_tap(mock_server.tap_config(metrics_path=str(path)))
+
+    assert _endpoints(path)["punch_details"]["requests"]["404"] == 2
+
+
+def test_bulk_punch_pages_report_parse_time(mock_server, tmp_path):
+    path = tmp_path / "metrics.json"
+    run_tap(mock_server.tap_config(metrics_path=str(path), punch_details_bulk=True))
+
+    assert _endpoints(path)["punch_details"]["parse_seconds"] > 0
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{}, {"shard_index": 1, "shard_count": 2}, {"http_engine": "asyncio"}],
+)
+def test_post_processing_is_observed_per_context(
+    mock_server,
+    monkeypatch,
+    tmp_path,
+    overrides,
+):
+    if overrides.get("http_engine") == "asyncio":
+        pytest.importorskip("httpx")
+    observations = []
+    metrics = get_performance_metrics()
+    observe = metrics.observe_post_process
+    monkeypatch.setattr(
+        metrics,
+        "observe_post_process",
+        lambda *args: observations.append(args) or observe(*args),
+    )
+    config = mock_server.tap_config(metrics_path=str(tmp_path / "m.json"), **overrides)
+    messages = run_tap(config)
+
+    records = Counter(m["stream"] for m in messages if m["type"] == "RECORD")
+    kept = Counter()
+    for name, _, count in observations:
+        kept[name] += count
+    # Kept records account for mixins ahead of the stream classes, e.g. sharding.
+    assert kept == records
+    assert len(observations) < sum(records.values())
@@ -0,0 +1,101 @@
+"""Tests for incremental JSON parsing."""
+
+from __future__ import annotations
+
+import decimal
+import json
+
+import pytest
+
+from tap_paylocity.parsing import RecordDecoder, iter_json_array, money_fields
+from tap_paylocity.streams import EmployeeDetailsStream, PunchDetails
+from tests.mock_server import run_tap
+
+DOCUMENT = json.dumps(
+    [
+        {"employeeId": "E1", "baseRate": 21.125, "name": "Zoë", "tags": [1, 2]},
+        12345,
+        "a, string ] with delimiters",
+        True,
+        None,
+        {"nested": {"annualSalary": 98765.43}},
+    ],
+    ensure_ascii=False,
+).encode()
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_elements_match_full_parse_for_any_chunking(size):
+    expected = json.loads(DOCUMENT, parse_float=decimal.Decimal)
+    assert list(iter_json_array(_chunks(DOCUMENT, size))) == expected
+
+
+def test_floats_are_decimals():
+    (record,) = iter_json_array([b'[{"baseRate": 0.1000000000000000055}]'])
+    assert record["baseRate"] == decimal.Decimal("0.1000000000000000055")
+
+
+def test_elements_are_yielded_before_the_body_is_read():
+    consumed = []
+
+    def chunks():
+        for chunk in (b'[{"a": 1},', b' {"a": 2}', b"]"):
+            consumed.append(chunk)
+            yield chunk
+
+    records = iter_json_array(chunks())
+    assert next(records) == {"a": 1}
+    assert len(consumed) == 1
+
+
+@pytest.mark.parametrize(
+    ("body", "expected"),
+    [(b"", []), (b" [ ] ", []), (b'{"employeeId": "E1"}', [{"employeeId": "E1"}])],
+)
+def test_empty_and_non_array_documents(body, expected):
+    assert list(iter_json_array([body])) == expected
+
+
+@pytest.mark.parametrize("body", [b"[1, 2", b"[1 2]", b"[1, 2] 3", b'[{"a": }]'])
+def test_invalid_documents_raise(body):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(_chunks(body, 2)))
+
+
+def test_money_fields_are_the_schema_number_properties():
+    assert money_fields(EmployeeDetailsStream.schema) == {"annualSalary", "baseRate"}
+    assert money_fields(PunchDetails.schema) == {"earnings"}
+
+
+BODY = b'[{"rate": {"baseRate": 20.01, "hours": 7.5}, "earnings": [1.5]}]'
+
+
+@pytest.mark.parametrize("backend", RecordDecoder.backends)
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    [
+        ("all", {"baseRate": decimal.Decimal("20.01"), "hours": decimal.Decimal("7.5")}),
+        ("schema", {"baseRate": decimal.Decimal("20.01"), "hours": 7.5}),
+        ("none", {"baseRate": 20.01, "hours": 7.5}),
+    ],
+)
+def test_decimal_policies(backend, policy, expected):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    decoder = RecordDecoder(backend, policy, fields={"baseRate"})
+    (record,) = decoder.decode(_chunks(BODY, 5))
+    assert record["rate"] == expected
+    assert all(type(a) is type(b) for a, b in zip(record["rate"].values(), expected.values()))
+
+
+def test_orjson_backend_matches_stdlib(mock_server):
+    pytest.importorskip("orjson")
+    expected = run_tap(mock_server.tap_config())
+    messages = run_tap(mock_server.tap_config(json_backend="orjson"))
+    assert [m["record"] for m in messages if m["type"] == "RECORD"] == [
+        m["record"] for m in expected if m["type"] == "RECORD"
+    ]
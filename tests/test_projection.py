@@ -0,0 +1,72 @@
+"""Tests for compiled record projections."""
+
+from __future__ import annotations
+
+from tap_paylocity.projection import Projection
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import MockCompany, run_tap
+
+
+def test_projection_flattens_nested_paths():
+    project = Projection(
+        {"id": "id", "rate": "pay.rate", "city": ("address", "home", "city")},
+        defaults={"city": ""},
+    )
+
+    assert project({"id": 1, "pay": {"rate": 2}, "address": {"home": {"city": "X"}}}) == {
+        "id": 1,
+        "rate": 2,
+        "city": "X",
+    }
+    assert project({"pay": None, "extra": True}) == {"id": None, "rate": None, "city": ""}
+
+
+def test_projection_keeps_selected_columns_only():
+    project = Projection({"a": "x.a", "b": "x.b"}, selected=["b", "c"])
+
+    assert project({"x": {"a": 1, "b": 2}}) == {"b": 2}
+
+
+def test_employee_details_are_flattened(mock_server):
+    records = [
+        m["record"]
+        for m in run_tap(mock_server.tap_config())
+        if m["type"] == "RECORD" and m["stream"] == "employee_details"
+    ]
+
+    assert records[0] == {
+        "companyId": "149471",
+        "employeeId": "E00000",
+        "firstName": "First0",
+        "lastName": "Last0",
+        "employeeStatus": "A",
+        "hireDate": "2020-01-01T00:00:00",
+        "payType": "Hourly",
+        "annualSalary": 41600.25,
+        "baseRate": 20.01,
+        "ratePer": "Hour",
+        "payFrequency": "B",
+        "jobTitle": "Associate",
+        "positionCode": "ASSOC",
+        "supervisorEmployeeId": "E00000",
+    }
+
+
+def test_deselected_properties_are_not_extracted(mock_server):
+    tap = TapPaylocity(config=mock_server.tap_config())
+    catalog = tap.catalog_dict
+    (entry,) = [s for s in catalog["streams"] if s["tap_stream_id"] == "employee_details"]
+    for metadata in entry["metadata"]:
+        if metadata["breadcrumb"] in (["properties", "annualSalary"], ["properties", "baseRate"]):
+            metadata["metadata"]["selected"] = False
+
+    stream = TapPaylocity(config=mock_server.tap_config(), catalog=catalog).streams[
+        "employee_details"
+    ]
+    payload = MockCompany().employee_details("E00001")
+    record = stream.post_process(payload, {"companyId": "149471", "employeeId": "E00001"})
+
+    assert "annualSalary" not in record
+    assert "baseRate" not in record
+    assert "homeAddress" not in record
+    assert record["ratePer"] == "Hour"
@@ -0,0 +1,59 @@
+"""Tests for the adaptive rate limiter."""
+
+from __future__ import annotations
+
+import time
+
+import requests
+
+from tap_paylocity.ratelimit import TokenBucket, parse_retry_after
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import run_tap
+
+
+def _response(**headers: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    response.headers.update(headers)
+    return response
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(_response(**{"Retry-After": "3"})) == 3.0
+    assert parse_retry_after(_response(**{"Retry-After": "soon"})) is None
+    assert parse_retry_after(_response()) is None
+    past = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert parse_retry_after(_response(**{"Retry-After": past})) == 0.0
+
+
+def test_throttling_halves_rate_and_honors_retry_after():
+    bucket = TokenBucket(rate=100)
+    started = time.monotonic()
+    bucket.on_throttled(retry_after=0.2)
+    assert bucket.rate == 50
+
+    assert bucket.acquire() > 0
+    assert time.monotonic() - started >= 0.2
+
+
+def test_rate_recovers_up_to_maximum():
+    bucket = TokenBucket(rate=4)
+    bucket.on_throttled(retry_after=None)
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == 4
+
+
+def test_throttled_requests_are_retried(mock_server, monkeypatch):
+    def records():
+        return [m["record"] for m in run_tap(mock_server.tap_config()) if m["type"] == "RECORD"]
+
+    expected = records()
+    # The host's bucket is shared by the whole session; restore its rate after.
+    bucket = TapPaylocity(config=mock_server.tap_config()).streams["employees"].rate_limiter
+    monkeypatch.setattr(bucket, "rate", bucket.rate)
+    monkeypatch.setattr(mock_server, "throttle_every", 50)
+    mock_server.reset()
+
+    assert records() == expected
+    assert 429 in {status for _, status, _ in mock_server.responses}
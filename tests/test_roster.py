@@ -0,0 +1,83 @@
+"""Tests for the roster snapshots used by child-only syncs."""
+
+from __future__ import annotations
+
+import time
+
+from tap_paylocity.roster import get_roster_snapshots
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import run_tap
+
+
+def _punches_only(config: dict) -> dict:
+    catalog = TapPaylocity(config=config).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if metadata["breadcrumb"] == []:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] == "punch_details"
+    return catalog
+
+
+def _punches(mock_server, config: dict) -> list[dict]:
+    mock_server.reset()
+    messages = run_tap(config, catalog=_punches_only(config))
+    return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+
+def _age(config: dict, company_id: str, seconds: float) -> None:
+    snapshots = get_roster_snapshots(config)
+    employees, _ = snapshots.get(company_id)
+    snapshots.put(company_id, employees, fetched_at=time.time() - seconds)
+
+
+def test_child_sync_uses_fresh_snapshot(mock_server, tmp_path):
+    config = mock_server.tap_config(roster_snapshot_path=str(tmp_path / "roster.db"))
+
+    expected = _punches(mock_server, config)
+    assert mock_server.request_counts["employees"] > 0
+    records = _punches(mock_server, config)
+
+    assert "employees" not in mock_server.request_counts
+    assert records == expected
+
+
+def test_selected_roster_is_always_fetched(mock_server, tmp_path):
+    config = mock_server.tap_config(roster_snapshot_path=str(tmp_path / "roster.db"))
+    run_tap(config)
+
+    mock_server.reset()
+    run_tap(config)
+
+    assert mock_server.request_counts["employees"] > 0
+
+
+def test_stale_snapshot_is_refetched(mock_server, tmp_path):
+    config = mock_server.tap_config(
+        roster_snapshot_path=str(tmp_path / "roster.db"),
+        roster_snapshot_ttl_minutes=60,
+    )
+    _punches(mock_server, config)
+    fetches = mock_server.request_counts["employees"]
+    _age(config, "149471", 2 * 3600)
+
+    _punches(mock_server, config)
+
+    assert mock_server.request_counts["employees"] == fetches
+    _, fetched_at = get_roster_snapshots(config).get("149471")
+    assert time.time() - fetched_at < 60
+
+
+def test_aging_snapshot_is_refreshed_in_background(mock_server, tmp_path):
+    config = mock_server.tap_config(
+        roster_snapshot_path=str(tmp_path / "roster.db"),
+        roster_snapshot_ttl_minutes=60,
+    )
+    expected = _punches(mock_server, config)
+    _age(config, "149471", 45 * 60)
+
+    records = _punches(mock_server, config)
+
+    assert records == expected
+    assert mock_server.request_counts["employees"] > 0
+    _, fetched_at = get_roster_snapshots(config).get("149471")
+    assert time.time() - fetched_at < 60
@@ -0,0 +1,94 @@
+"""Tests for the shared HTTP session layer."""
+
+from __future__ import annotations
+
+import logging
+
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import run_tap
+
+
+def _records(messages: list[dict]) -> list[tuple[str, dict]]:
+    return [(m["stream"], m["record"]) for m in messages if m["type"] == "RECORD"]
+
+
+class _DiscardedConnections(logging.Handler):
+    """Count the connections urllib3 discards because the pool is full."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += record.getMessage().startswith("Connection pool is full")
+
+
+def test_streams_share_kept_alive_connections(mock_server, monkeypatch):
+    config = mock_server.tap_config(max_concurrency=8, http_pool_size=8)
+    tap = TapPaylocity(config=config)
+    employees = tap.streams["employees"].requests_session
+    punches = tap.streams["punch_details"].requests_session
+    assert employees is not punches
+    assert employees.get_adapter(mock_server.url) is punches.get_adapter(mock_server.url)
+
+    # The tap's logging setup replaces the root handlers, so count on urllib3's.
+    discarded = _DiscardedConnections()
+    pool_logger = logging.getLogger("urllib3.connectionpool")
+    monkeypatch.setattr(pool_logger, "handlers", [*pool_logger.handlers, discarded])
+    mock_server.reset()
+    run_tap(config)
+    requests = sum(mock_server.request_counts.values())
+    # The pool, the token requests sent outside of it, and the connections
+    # opened while every pooled one was busy, discarded once done as the pool
+    # does not block.
+    token_requests = mock_server.request_counts.get("token", 0)
+    assert mock_server.connections <= 8 + token_requests + discarded.count
+    assert requests > 10 * (mock_server.connections - discarded.count)
+
+
+def test_error_responses_release_their_connections(mock_server, monkeypatch):
+    company = mock_server.companies["149471"]
+    monkeypatch.setitem(mock_server.missing, "punch_details", set(company.employee_ids))
+    config = mock_server.tap_config(max_concurrency=8, http_pool_size=8)
+
+    discarded = _DiscardedConnections()
+    pool_logger = logging.getLogger("urllib3.connectionpool")
+    monkeypatch.setattr(pool_logger, "handlers", [*pool_logger.handlers, discarded])
+    mock_server.reset()
+    run_tap(config)
+
+    assert mock_server.request_counts["punch_details"] == len(company.employee_ids)
+    # Unread error responses would each keep a connection checked out.
+    token_requests = mock_server.request_counts.get("token", 0)
+    assert mock_server.connections <= 8 + token_requests + discarded.count
+
+
+def test_compressed_responses(mock_server, monkeypatch):
+    mock_server.reset()
+    plain = run_tap(mock_server.tap_config())
+    plain_sizes = sum(size for _, _, size in mock_server.responses)
+
+    monkeypatch.setattr(mock_server, "compression", True)
+    mock_server.reset()
+    compressed = run_tap(mock_server.tap_config())
+    compressed_sizes = sum(size for _, _, size in mock_server.responses)
+
+    assert _records(compressed) == _records(plain)
+    assert compressed_sizes < plain_sizes / 2
+
+    mock_server.reset()
+    run_tap(mock_server.tap_config(http_compression=False))
+    assert sum(size for _, _, size in mock_server.responses) == plain_sizes
+
+
+def test_timeouts_by_host(mock_server):
+    tap = TapPaylocity(
+        config=mock_server.tap_config(
+            api_url="http://weblink.test",
+            http_read_timeout=120,
+            http_timeouts={"weblink.test": 30},
+        ),
+    )
+
+    assert tap.streams["employees"].timeout == (10, 30)
+    assert tap.streams["punch_details"].timeout == (10, 120)
@@ -0,0 +1,76 @@
+"""Tests for sharding the roster across tap instances."""
+
+from __future__ import annotations
+
+import pytest
+from singer_sdk.exceptions import ConfigValidationError
+
+from tap_paylocity.sharding import merge_states, shard_of
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import run_tap
+
+SHARDS = 3
+
+
+def _sync(config: dict) -> tuple[dict[str, list], dict]:
+    messages = run_tap(config)
+    records: dict[str, list] = {}
+    for message in messages:
+        if message["type"] == "RECORD":
+            records.setdefault(message["stream"], []).append(message["record"])
+    (state, *_) = [m["value"] for m in reversed(messages) if m["type"] == "STATE"]
+    return records, state
+
+
+def _partitions(state: dict, stream: str) -> list:
+    return sorted(
+        state["bookmarks"][stream].get("partitions", []),
+        key=lambda partition: sorted(partition["context"].items()),
+    )
+
+
+def test_shard_of_is_stable():
+    assert shard_of("E00042", 4) == shard_of("E00042", 4)
+    assert {shard_of(f"E{idx:05d}", 4) for idx in range(100)} == {0, 1, 2, 3}
+
+
+def test_shards_split_records_and_merge_states(mock_server):
+    expected, full_state = _sync(mock_server.tap_config())
+    shards = [
+        _sync(mock_server.tap_config(shard_index=index, shard_count=SHARDS))
+        for index in range(SHARDS)
+    ]
+
+    for stream, records in expected.items():
+        shard_records = [records for shard, _ in shards for records in shard[stream]]
+        key = lambda record: sorted((k, str(v)) for k, v in record.items())  # noqa: E731
+        assert sorted(shard_records, key=key) == sorted(records, key=key)
+    for index, (shard, _) in enumerate(shards):
+        assert {shard_of(r["employeeId"], SHARDS) for r in shard["punch_details"]} == {index}
+
+    merged = merge_states(state for _, state in shards)
+    for stream in ("employees", "employee_details", "punch_details"):
+        assert _partitions(merged, stream) == _partitions(full_state, stream)
+
+
+def test_merge_keeps_earliest_shared_bookmark():
+    context = {"companyId": "1"}
+    states = [
+        {"bookmarks": {"s": {"partitions": [{"context": context, "replication_key_value": "2025-02"}]}}},
+        {"bookmarks": {"s": {"partitions": [{"context": context, "replication_key_value": "2025-01"}]}}},
+    ]
+
+    merged = merge_states(states)
+
+    assert merged["bookmarks"]["s"]["partitions"] == [
+        {"context": context, "replication_key_value": "2025-01"},
+    ]
+
+
+def test_invalid_shard_index_is_rejected(mock_server):
+    stream = TapPaylocity(
+        config=mock_server.tap_config(shard_index=3, shard_count=3),
+    ).streams["employees"]
+
+    with pytest.raises(ConfigValidationError):
+        stream.shard  # noqa: B018
@@ -0,0 +1,171 @@
+"""Tests for stream-specific behavior, run against the local mock server."""
+
+from __future__ import annotations
+
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from tap_paylocity.streams import PunchDetails, _PunchWindowTooLargeError
+from tap_paylocity.tap import TapPaylocity
+from tests.mock_server import MockCompany, run_tap
+
+
+def _punch_starts(mock_server) -> dict[str, str]:
+    return {
+        query["employeeId"]: query["relativeStart"]
+        for name, query in mock_server.requests
+        if name == "punch_details"
+    }
+
+
+def test_punch_details_resume_from_bookmark_minus_lookback(mock_server):
+    config = mock_server.tap_config(punch_lookback_hours=2)
+    mock_server.reset()
+    messages = run_tap(config)
+    assert set(_punch_starts(mock_server).values()) == {"2025-01-01T00:00:00"}
+
+    state = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    partitions = state["bookmarks"]["punch_details"]["partitions"]
+    assert partitions[0]["context"] == {"companyId": "149471", "employeeId": "E00000"}
+    assert partitions[0]["replication_key_value"] == "2025-01-02T10:00:00"
+
+    mock_server.reset()
+    run_tap(config, state=state)
+    assert set(_punch_starts(mock_server).values()) == {"2025-01-02T08:00:00"}
+
+
+def _punch_records(messages: list[dict]) -> list[dict]:
+    return [
+        m["record"]
+        for m in messages
+        if m["type"] == "RECORD" and m["stream"] == "punch_details"
+    ]
+
+
+def test_punch_details_windows_match_single_range(mock_server):
+    expected = _punch_records(run_tap(mock_server.tap_config()))
+    employees = len({record["employeeId"] for record in expected})
+
+    # January in 7-day windows is 5 requests per employee.
+    mock_server.reset()
+    config = mock_server.tap_config(punch_window_days=7, max_concurrency=4)
+    assert _punch_records(run_tap(config)) == expected
+    assert mock_server.request_counts["punch_details"] == 5 * employees
+
+    mock_server.reset()
+    config = mock_server.tap_config(punch_window_days=7, punch_max_response_bytes=900)
+    assert _punch_records(run_tap(config)) == expected
+    assert mock_server.request_counts["punch_details"] > 5 * employees
+
+
+def test_punch_window_size_is_decompressed_size(mock_server, monkeypatch):
+    expected = _punch_records(run_tap(mock_server.tap_config()))
+    employees = len({record["employeeId"] for record in expected})
+
+    # Gzipped, each 7-day window is smaller than the limit; decompressed, larger.
+    monkeypatch.setattr(mock_server, "compression", True)
+    mock_server.reset()
+    config = mock_server.tap_config(punch_window_days=7, punch_max_response_bytes=900)
+    assert _punch_records(run_tap(config)) == expected
+    assert mock_server.request_counts["punch_details"] > 5 * employees
+
+
+def test_punch_windows_share_the_concurrency_limit(mock_server, monkeypatch):
+    expected = _punch_records(run_tap(mock_server.tap_config()))
+
+    monkeypatch.setattr(mock_server, "latency", 0.01)
+    mock_server.reset()
+    config = mock_server.tap_config(punch_window_days=7, max_concurrency=3)
+    assert _punch_records(run_tap(config)) == expected
+    assert mock_server.peak_requests["punch_details"] <= 3
+
+
+@pytest.mark.parametrize("http_engine", ["requests", "asyncio"])
+def test_split_window_emits_punches_spanning_the_middle_once(
+    mock_server,
+    monkeypatch,
+    http_engine,
+):
+    if http_engine == "asyncio":
+        pytest.importorskip("httpx")
+    # The 08:00-17:00 punch of January 1st spans the middle of the window.
+    window = {"start_date": "2025-01-01T00:00:00", "end_date": "2025-01-01T23:00:00"}
+    expected = _punch_records(run_tap(mock_server.tap_config(**window)))
+    check_window_size = PunchDetails._check_window_size
+
+    def reject_whole_window(self, response):
+        query = parse_qs(urlsplit(response.url).query)
+        if query["relativeStart"] == ["2025-01-01T00:00:00"] and query[
+            "relativeEnd"
+        ] == ["2025-01-01T23:00:00"]:
+            msg = "window too large"
+            raise _PunchWindowTooLargeError(msg)
+        check_window_size(self, response)
+
+    monkeypatch.setattr(PunchDetails, "_check_window_size", reject_whole_window)
+    mock_server.reset()
+    config = mock_server.tap_config(**window, http_engine=http_engine, max_concurrency=4)
+
+    assert _punch_records(run_tap(config)) == expected
+    employees = len({record["employeeId"] for record in expected})
+    assert mock_server.request_counts["punch_details"] == 3 * employees
+
+
+def test_bulk_punch_details_match_per_employee_requests(mock_server):
+    expected = _punch_records(run_tap(mock_server.tap_config()))
+
+    mock_server.reset()
+    config = mock_server.tap_config(
+        punch_details_bulk=True,
+        punch_details_bulk_page_size=50,
+    )
+    messages = run_tap(config)
+
+    assert _punch_records(messages) == expected
+    assert "punch_details" not in mock_server.request_counts
+    # 60 employees with 2 punches each, in pages of 50 punches.
+    assert mock_server.request_counts["company_punch_details"] == 3
+    state = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    partitions = state["bookmarks"]["punch_details"]["partitions"]
+    assert partitions == [
+        {
+            "context": {"companyId": "149471"},
+            "replication_key": "relativeEnd",
+            "replication_key_value": "2025-01-02T10:00:00",
+        },
+    ]
+
+
+def test_punch_segments_flattened_with_selected_fields(mock_server):
+    stream = TapPaylocity(config=mock_server.tap_config()).streams["punch_details"]
+    stream.mask[("properties", "badgeNumber")] = False
+    stream.mask[("properties", "origin")] = False
+    punches = MockCompany(segments_per_punch=3).punch_details("E00001")
+
+    records = list(stream.flatten_punches(punches))
+
+    assert len(records) == 3 * len(punches)
+    assert records[0] == {
+        "employeeId": "E00001",
+        "relativeStart": "2025-01-01T08:00:00",
+        "relativeEnd": "2025-01-01T09:00:00",
+        "punchID": "E00001-0-0",
+        "date": "2025-01-01",
+        "punchType": "work",
+        "durationSeconds": 3600,
+        "earnings": 20.01,
+    }
+
+
+def test_missing_punch_details_are_tolerated(mock_server, monkeypatch):
+    monkeypatch.setitem(mock_server.missing, "punch_details", {"E00003"})
+    records = [
+        m["record"]
+        for m in run_tap(mock_server.tap_config())
+        if m["type"] == "RECORD" and m["stream"] == "punch_details"
+    ]
+
+    employees = {record["employeeId"] for record in records}
+    assert "E00003" not in employees
+    assert len(employees) == 59